@@ -2,8 +2,9 @@
 Main AI Coding Assistant - Core class that orchestrates all operations
 """
 import json
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Generator, Tuple
 from openai import OpenAI
 from rich.console import Console
 from rich.markdown import Markdown
@@ -19,7 +20,7 @@ from tools.error_parser import ErrorParser
 from tools.multi_agent import MultiAgentSystem
 from tools.logger import get_logger
 from tools.retry import retry_api_call
-from tools.llm_provider import get_provider, LLMProvider
+from tools.llm_provider import get_provider, get_http_client, LLMProvider, LLMResponse
 from tools.task_classifier import TaskClassifier
 from tools.context_manager import ContextManager
 from tools.code_completion import CodeCompletionEngine
@@ -59,6 +60,9 @@ class CodingAssistant:
         # Initialize session ID (will be set by WebSocket handler)
         self._session_id = None
         
+        # Outcome of the last turn on each thread (see last_turn_cacheable)
+        self._turn_state = threading.local()
+        
         # Task classifier for routing
         self.task_classifier = TaskClassifier()
         
@@ -71,7 +75,7 @@ class CodingAssistant:
         )
         
         # Keep OpenAI client for backward compatibility (RAG embeddings)
-        self.client = OpenAI(api_key=api_key or Config.OPENAI_API_KEY)
+        self.client = OpenAI(api_key=api_key or Config.OPENAI_API_KEY, http_client=get_http_client())
         
         # Initialize tools
         self.file_ops = FileOperations(workspace_path)
@@ -242,28 +246,80 @@ Always be helpful, accurate, and follow best practices. Take immediate action on
         Returns:
             Assistant's response
         """
-        # Check if user message contains an error
-        error_context = ""
-        if self.error_parser.is_python_error(user_message) and self.error_debugger:
-            try:
-                error_context = self.error_debugger.get_fix_context(user_message)
-            except Exception as e:
-                print(f"⚠️  Error debugging failed: {e}")
+        self._reset_turn_state()
+        provider, provider_name, model_name, messages = self._prepare_request(
+            user_message, conversation_history, model_override
+        )
         
-        # Retrieve relevant code context using RAG (with hybrid search)
-        rag_context = ""
-        if self.rag_system and self.rag_system.is_indexed:
-            try:
-                # Use error context to enhance query if available
-                if error_context and error_context.strip():
-                    error_lines = error_context.split('\n')
-                    query = error_lines[0].strip() if error_lines and error_lines[0].strip() else user_message
-                else:
-                    query = user_message
-                rag_context = self.rag_system.get_context_for_query(query, use_hybrid=True)
-            except Exception as e:
-                print(f"[WARN] RAG retrieval error: {e}")
+        try:
+            start_time = time.time()
+            response = provider.chat_completion(
+                messages=messages,
+                model=model_name,
+                temperature=Config.OPENAI_TEMPERATURE,
+                max_tokens=Config.MAX_TOKENS
+            )
+            duration = time.time() - start_time
+            return self._finish_response(
+                user_message, conversation_history, response, duration, provider_name, model_name
+            )
+        
+        except Exception as e:
+            self.logger.exception("Error processing message")
+            return f"I encountered an error: {str(e)}"
+    
+    def stream_message(
+        self,
+        user_message: str,
+        conversation_history: Optional[List[Dict]] = None,
+        model_override: Optional[str] = None
+    ) -> Generator[str, None, str]:
+        """
+        Like process_message, but yields response text as the model generates it.
+        
+        Args:
+            user_message: The user's message
+            conversation_history: Optional conversation history
+            model_override: Optional model ID to override automatic selection
+            
+        Returns:
+            (as the generator's return value) the final response, after diffs
+            and tool calls are applied - this can differ from the streamed text
+        """
+        self._reset_turn_state()
+        provider, provider_name, model_name, messages = self._prepare_request(
+            user_message, conversation_history, model_override
+        )
+        
+        try:
+            start_time = time.time()
+            response = yield from provider.stream_chat_completion(
+                messages=messages,
+                model=model_name,
+                temperature=Config.OPENAI_TEMPERATURE,
+                max_tokens=Config.MAX_TOKENS
+            )
+            duration = time.time() - start_time
+            return self._finish_response(
+                user_message, conversation_history, response, duration, provider_name, model_name
+            )
         
+        except Exception as e:
+            self.logger.exception("Error processing message")
+            return f"I encountered an error: {str(e)}"
+    
+    def _select_provider(
+        self,
+        user_message: str,
+        conversation_history: Optional[List[Dict]],
+        model_override: Optional[str]
+    ) -> Tuple[LLMProvider, str, str]:
+        """
+        Pick the provider and model for a message (override, hybrid classification or default).
+        
+        Returns:
+            (provider, provider_name, model_name)
+        """
         # Classify task to determine which model to use (if hybrid enabled)
         # Determine which model/provider to use
         provider_name = None
@@ -342,6 +398,60 @@ Always be helpful, accurate, and follow best practices. Take immediate action on
             model_name = Config.OPENAI_MODEL
             self.logger.warning("model_name was None, using default OpenAI model")
         
+        return provider, provider_name, model_name
+    
+    def effective_model(
+        self,
+        user_message: str,
+        conversation_history: Optional[List[Dict]] = None,
+        model_override: Optional[str] = None
+    ) -> str:
+        """
+        Model a message would be answered by, without gathering context or calling it.
+        
+        Raises:
+            RuntimeError: If no provider is configured
+        """
+        return self._select_provider(user_message, conversation_history, model_override)[2]
+    
+    def _prepare_request(
+        self,
+        user_message: str,
+        conversation_history: Optional[List[Dict]],
+        model_override: Optional[str]
+    ) -> Tuple[LLMProvider, str, str, List[Dict]]:
+        """
+        Gather context, pick the provider/model and assemble the LLM messages.
+        
+        Returns:
+            (provider, provider_name, model_name, messages)
+        """
+        # Check if user message contains an error
+        error_context = ""
+        if self.error_parser.is_python_error(user_message) and self.error_debugger:
+            try:
+                error_context = self.error_debugger.get_fix_context(user_message)
+            except Exception as e:
+                print(f"⚠️  Error debugging failed: {e}")
+        
+        # Retrieve relevant code context using RAG (with hybrid search)
+        rag_context = ""
+        if self.rag_system and self.rag_system.is_indexed:
+            try:
+                # Use error context to enhance query if available
+                if error_context and error_context.strip():
+                    error_lines = error_context.split('\n')
+                    query = error_lines[0].strip() if error_lines and error_lines[0].strip() else user_message
+                else:
+                    query = user_message
+                rag_context = self.rag_system.get_context_for_query(query, use_hybrid=True)
+            except Exception as e:
+                print(f"[WARN] RAG retrieval error: {e}")
+        
+        provider, provider_name, model_name = self._select_provider(
+            user_message, conversation_history, model_override
+        )
+        
         # Build base system prompt
         system_content = self.system_prompt
         if error_context:
@@ -368,97 +478,120 @@ Always be helpful, accurate, and follow best practices. Take immediate action on
             "content": f"\n\nAvailable tools:\n{tools_description}\n\nWhen you need to use a tool, respond with a JSON object containing the tool name and parameters."
         })
         
-        try:
-            start_time = time.time()
-            response = provider.chat_completion(
-                messages=messages,
+        return provider, provider_name, model_name, messages
+    
+    def _finish_response(
+        self,
+        user_message: str,
+        conversation_history: Optional[List[Dict]],
+        response: LLMResponse,
+        duration: float,
+        provider_name: Optional[str],
+        model_name: str
+    ) -> str:
+        """Record usage, update memory, then apply any diffs/tool calls in the response"""
+        session_id = getattr(self, '_session_id', None)
+        self.logger.performance("llm_call", duration, model=model_name)
+        
+        # Track usage for cost monitoring
+        cost = self.cost_tracker.record_usage(
+            response.input_tokens,
+            response.output_tokens,
+            model=model_name
+        )
+        
+        # Record performance metrics
+        if self.performance_monitor:
+            final_provider = provider_name if provider_name else "openai"
+            self.performance_monitor.record_response_time(
+                duration,
+                metadata={"model": model_name, "provider": final_provider}
+            )
+            self.performance_monitor.record_api_call(
+                provider=final_provider,
                 model=model_name,
-                temperature=Config.OPENAI_TEMPERATURE,
-                max_tokens=Config.MAX_TOKENS
+                tokens_used=response.input_tokens + response.output_tokens,
+                cost=cost,
+                duration=duration
             )
-            duration = time.time() - start_time
-            self.logger.performance("llm_call", duration, model=model_name)
-            
-            # Track usage for cost monitoring
-            cost = self.cost_tracker.record_usage(
-                response.input_tokens,
-                response.output_tokens,
-                model=model_name
+        
+        # Validate response content
+        if not response or not hasattr(response, 'content') or response.content is None:
+            raise RuntimeError("LLM response is empty or invalid. Please try again.")
+        
+        assistant_message = response.content
+        
+        # Update memory if session_id available
+        if session_id and Config.ENABLE_MEMORY_DB:
+            updated_history = (conversation_history or []) + [
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": assistant_message}
+            ]
+            self.context_manager.update_memory(
+                session_id=session_id,
+                user_message=user_message,
+                assistant_response=assistant_message,
+                conversation_history=updated_history
             )
-            
-            # Record performance metrics
-            if self.performance_monitor:
-                final_provider = provider_name if provider_name else "openai"
-                self.performance_monitor.record_response_time(
-                    duration,
-                    metadata={"model": model_name, "provider": final_provider}
-                )
-                self.performance_monitor.record_api_call(
-                    provider=final_provider,
-                    model=model_name,
-                    tokens_used=response.input_tokens + response.output_tokens,
-                    cost=cost,
-                    duration=duration
-                )
-            
-            # Validate response content
-            if not response or not hasattr(response, 'content') or response.content is None:
-                raise RuntimeError("LLM response is empty or invalid. Please try again.")
-            
-            assistant_message = response.content
-            
-            # Update memory if session_id available
-            if session_id and Config.ENABLE_MEMORY_DB:
-                updated_history = (conversation_history or []) + [
-                    {"role": "user", "content": user_message},
-                    {"role": "assistant", "content": assistant_message}
-                ]
-                self.context_manager.update_memory(
-                    session_id=session_id,
-                    user_message=user_message,
-                    assistant_response=assistant_message,
-                    conversation_history=updated_history
-                )
-            
-            # Auto-extract and apply diffs if present
-            try:
-                diffs = self.diff_extractor.extract_diffs(assistant_message)
-            except Exception as e:
-                diffs = []
-            
-            if diffs:
-                # Clean and apply diffs
-                applied_diffs = []
-                for i, diff in enumerate(diffs):
-                    try:
-                        cleaned_diff = self.diff_extractor.clean_diff(diff)
-                        result = self._apply_diff_tool(cleaned_diff, dry_run=False)
-                        if result.get("success"):
-                            applied_diffs.append(result)
-                    except Exception as e:
-                        pass
-                
-                if applied_diffs:
-                    # Remove diffs from response text
-                    text_without_diffs, _ = self.diff_extractor.split_text_and_diffs(assistant_message)
-                    return f"{text_without_diffs}\n\n✅ Applied {len(applied_diffs)} diff(s) successfully."
-            
-            # Check if the response contains tool calls (JSON format)
-            tool_calls = self._extract_tool_calls(assistant_message)
-            
-            if tool_calls:
-                # Execute tool calls and generate final response
-                results = self._execute_tool_calls(tool_calls)
-                final_response = self._generate_final_response(
-                    user_message, assistant_message, results
-                )
-                return final_response
-            
-            return assistant_message
         
+        # Auto-extract and apply diffs if present
+        try:
+            diffs = self.diff_extractor.extract_diffs(assistant_message)
         except Exception as e:
-            self.logger.exception("Error processing message")
-            return f"I encountered an error: {str(e)}"
+            diffs = []
+        
+        if diffs:
+            # Clean and apply diffs
+            applied_diffs = []
+            for i, diff in enumerate(diffs):
+                try:
+                    cleaned_diff = self.diff_extractor.clean_diff(diff)
+                    result = self._apply_diff_tool(cleaned_diff, dry_run=False)
+                    if result.get("success"):
+                        applied_diffs.append(result)
+                except Exception as e:
+                    pass
+            
+            if applied_diffs:
+                self._turn_state.side_effects = True
+                # Remove diffs from response text
+                text_without_diffs, _ = self.diff_extractor.split_text_and_diffs(assistant_message)
+                return f"{text_without_diffs}\n\n✅ Applied {len(applied_diffs)} diff(s) successfully."
+        
+        # Check if the response contains tool calls (JSON format)
+        tool_calls = self._extract_tool_calls(assistant_message)
+        
+        if tool_calls:
+            # Execute tool calls and generate final response
+            self._turn_state.side_effects = True
+            results = self._execute_tool_calls(tool_calls)
+            final_response = self._generate_final_response(
+                user_message, assistant_message, results
+            )
+            return final_response
+        
+        if not diffs:
+            # Plain answer: replaying it later loses nothing this turn did
+            self._turn_state.cacheable = True
+        return assistant_message
+    
+    def _reset_turn_state(self):
+        """Start a turn: not cacheable and nothing changed until _finish_response says otherwise"""
+        self._turn_state.cacheable = False
+        self._turn_state.side_effects = False
+    
+    @property
+    def last_turn_cacheable(self) -> bool:
+        """
+        Whether the last process_message/stream_message on this thread returned
+        a plain answer (no diffs, tool calls or errors) that is safe to replay
+        """
+        return getattr(self._turn_state, "cacheable", False)
+    
+    @property
+    def last_turn_side_effects(self) -> bool:
+        """Whether the last turn on this thread applied diffs or ran tool calls"""
+        return getattr(self._turn_state, "side_effects", False)
     
     def set_session_id(self, session_id: str):
         """Set session ID for memory management"""
@@ -58,6 +58,12 @@ class Config:
     ENABLE_LOGGING = os.getenv("ENABLE_LOGGING", "true").lower() == "true"
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
     
+    # Response Cache Settings (serve repeated/near-duplicate chat and composer queries)
+    ENABLE_RESPONSE_CACHE = os.getenv("ENABLE_RESPONSE_CACHE", "true").lower() == "true"
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))  # 1 hour
+    RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.97"))  # Cosine similarity
+    
     # Context Management Settings
     MAX_CONTEXT_TOKENS = int(os.getenv("MAX_CONTEXT_TOKENS", "10000"))  # For DeepSeek (16K limit)
     MAX_CONTEXT_TOKENS_CLAUDE = int(os.getenv("MAX_CONTEXT_TOKENS_CLAUDE", "150000"))  # For Claude (200K limit)
@@ -0,0 +1,82 @@
+"""
+Tests for incremental file_content patches on /ws/completion
+"""
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "web" / "backend"))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app as backend
+from app import ContentPatch, apply_content_patch
+
+
+def patch(*ops):
+    return [ContentPatch(start=start, end=end, text=text) for start, end, text in ops]
+
+
+def test_apply_insert_delete_replace():
+    """Patches apply in order, each against the buffer the previous one left"""
+    content = "import os\nos"
+    assert apply_content_patch(content, patch((12, 12, "."))) == "import os\nos."
+    assert apply_content_patch(content, patch((0, 7, ""))) == "os\nos"
+    assert apply_content_patch(content, patch((7, 9, "sys"), (11, 13, "sys"))) == "import sys\nsys"
+
+
+def test_apply_uses_utf16_offsets():
+    """Offsets count UTF-16 code units, so an emoji before the edit takes two"""
+    content = "x = '\U0001F600'\ny"
+    # "x = '" (5) + emoji (2) + "'\n" (2) -> "y" starts at unit 9
+    assert apply_content_patch(content, patch((9, 10, "z"))) == "x = '\U0001F600'\nz"
+    # An inserted emoji shifts later offsets by two units
+    result = apply_content_patch("ab", patch((1, 1, "\U0001F600"), (3, 4, "c")))
+    assert result == "a\U0001F600c"
+
+
+def test_apply_rejects_bad_ranges():
+    with pytest.raises(ValueError):
+        apply_content_patch("abc", patch((2, 10, "")))
+    with pytest.raises(ValueError):
+        apply_content_patch("abc", patch((2, 1, "")))
+    with pytest.raises(ValueError):
+        # Splits the surrogate pair of the emoji
+        apply_content_patch("\U0001F600", patch((1, 1, "x")))
+
+
+def test_resync_when_base_version_does_not_match():
+    """The server asks for the full content whenever it can't apply a patch"""
+    backend.completion_engine = None
+    client = TestClient(backend.app)
+    with client.websocket_connect("/ws/completion") as ws:
+        # Nothing to patch yet
+        ws.send_text(json.dumps({"base_version": 0, "version": 1, "patch": []}))
+        assert json.loads(ws.receive_text())["type"] == "resync"
+
+        # Full content is accepted (no engine here, so the reply is an error)
+        ws.send_text(json.dumps({"file_content": "abc", "version": 1}))
+        assert json.loads(ws.receive_text())["type"] == "error"
+
+        # Stale base version
+        ws.send_text(json.dumps({"base_version": 0, "version": 2, "patch": []}))
+        assert json.loads(ws.receive_text())["type"] == "resync"
+
+        # Matching base version applies
+        ws.send_text(json.dumps({
+            "base_version": 1, "version": 2,
+            "patch": [{"start": 3, "end": 3, "text": "d"}]
+        }))
+        assert json.loads(ws.receive_text())["type"] == "error"
+
+        # A patch that doesn't fit drops the buffer, so the next patch resyncs too
+        ws.send_text(json.dumps({
+            "base_version": 2, "version": 3,
+            "patch": [{"start": 0, "end": 99, "text": ""}]
+        }))
+        assert json.loads(ws.receive_text())["type"] == "resync"
+        ws.send_text(json.dumps({"base_version": 2, "version": 3, "patch": []}))
+        assert json.loads(ws.receive_text())["type"] == "resync"
@@ -0,0 +1,68 @@
+"""
+Tests for condense_history (heuristic chat history condensing)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.conversation_summarizer import condense_history, SUMMARY_PREFIX
+
+
+def turns(count: int, size: int, start: int = 0):
+    """count user/assistant pairs, each message size characters with a numbered first line"""
+    messages = []
+    for i in range(start, start + count):
+        for role in ("user", "assistant"):
+            first_line = f"{role} message {i}\n"
+            messages.append({"role": role, "content": first_line + "x" * (size - len(first_line))})
+    return messages
+
+
+def test_under_budget_is_unchanged():
+    messages = turns(10, 1000)  # 20,000 characters
+    assert condense_history(messages) is messages
+
+
+def test_exactly_at_budget_is_unchanged():
+    messages = turns(12, 1000)  # 24,000 characters
+    assert condense_history(messages) is messages
+
+
+def test_over_budget_keeps_last_four_turns_verbatim():
+    messages = turns(13, 1000)  # 26,000 characters
+    condensed = condense_history(messages)
+    assert len(condensed) == 1 + 8
+    assert condensed[1:] == messages[-8:]
+    summary = condensed[0]
+    assert summary["role"] == "system"
+    assert summary["content"].startswith(SUMMARY_PREFIX)
+    # One first line per folded message, oldest first
+    lines = summary["content"][len(SUMMARY_PREFIX):].splitlines()
+    assert lines[0] == "USER: user message 0"
+    assert lines[-1] == "ASSISTANT: assistant message 8"
+    assert len(lines) == len(messages) - 8
+
+
+def test_summary_is_capped_dropping_oldest_lines():
+    messages = turns(200, 200)  # 400 folded first lines, far over 2,000 characters
+    condensed = condense_history(messages)
+    body = condensed[0]["content"][len(SUMMARY_PREFIX):]
+    assert len(body) <= 2000
+    lines = body.splitlines()
+    # No line is cut off, and the newest folded message survives
+    assert all(line.startswith(("USER: ", "ASSISTANT: ")) for line in lines)
+    assert lines[-1] == "ASSISTANT: assistant message 195"
+    assert "USER: user message 0" not in lines
+
+
+def test_earlier_summary_is_carried_forward():
+    condensed = condense_history(turns(13, 1000))
+    first_summary_lines = condensed[0]["content"][len(SUMMARY_PREFIX):].splitlines()
+
+    condensed = condense_history(condensed + turns(13, 1000, start=13))
+    lines = condensed[0]["content"][len(SUMMARY_PREFIX):].splitlines()
+    assert lines[:len(first_summary_lines)] == first_summary_lines
+    assert "USER: user message 13" in lines
+    # Still a single summary message
+    assert sum(message["content"].startswith(SUMMARY_PREFIX) for message in condensed) == 1
@@ -0,0 +1,56 @@
+"""
+Tests for the batched DebugLogger: writes happen off the event loop and stop() flushes everything
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "web" / "backend"))
+
+from app import DebugLogger
+
+
+class SlowDebugLogger(DebugLogger):
+    """Each write takes 0.2s and records the thread it ran on"""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.write_threads = []
+
+    def _write(self, entries):
+        self.write_threads.append(threading.get_ident())
+        time.sleep(0.2)
+        super()._write(entries)
+
+
+def test_slow_writes_do_not_block_the_loop_and_stop_flushes(tmp_path):
+    path = tmp_path / "debug.log"
+
+    async def scenario():
+        logger = SlowDebugLogger(path)
+        logger.start()
+        logger.log({"n": 0})
+        # Let the writer pick up the first batch and start its slow write
+        await asyncio.sleep(DebugLogger.FLUSH_INTERVAL * 2)
+
+        # The loop keeps ticking while the write is in progress
+        start = time.perf_counter()
+        for _ in range(10):
+            await asyncio.sleep(0.001)
+        responsive = time.perf_counter() - start < 0.15
+
+        for n in range(1, 5):
+            logger.log({"n": n})
+        await logger.stop()
+        return logger, responsive
+
+    logger, responsive = asyncio.run(scenario())
+    assert responsive
+    assert threading.get_ident() not in logger.write_threads
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sorted(entry["n"] for entry in entries) == [0, 1, 2, 3, 4]
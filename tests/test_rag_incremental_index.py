@@ -0,0 +1,97 @@
+"""
+Tests for incremental RAG indexing: the file manifest, stale chunk removal and retries
+"""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.rag_system import RAGSystem
+
+
+class FakeEmbeddings:
+    """Stands in for client.embeddings; records every text it embeds"""
+
+    def __init__(self):
+        self.texts = []
+
+    def create(self, model, input):
+        self.texts.extend(input)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[1.0, float(len(text)), 0.5]) for text in input])
+
+
+def make_rag(workspace: Path) -> RAGSystem:
+    """A RAGSystem over workspace whose embeddings never leave the process"""
+    rag = RAGSystem(workspace_path=str(workspace), api_key="sk-test")
+    rag.client = SimpleNamespace(embeddings=FakeEmbeddings())
+    return rag
+
+
+def stored_files(rag: RAGSystem) -> set:
+    return {metadata["file_path"] for metadata in rag.collection.get()["metadatas"]}
+
+
+def write_workspace(workspace: Path):
+    (workspace / "a.py").write_text("def alpha():\n    return 1\n")
+    (workspace / "b.py").write_text("def beta():\n    return 2\n")
+
+
+def test_unchanged_files_are_skipped(tmp_path):
+    write_workspace(tmp_path)
+    rag = make_rag(tmp_path)
+    rag.index_codebase()
+    assert rag.client.embeddings.texts
+    count = rag.collection.count()
+
+    # A fresh instance reads the saved manifest: nothing to embed
+    rag = make_rag(tmp_path)
+    rag.index_codebase()
+    assert rag.client.embeddings.texts == []
+    assert rag.collection.count() == count
+    assert rag.is_indexed
+
+
+def test_changed_and_deleted_files_drop_stale_chunks(tmp_path):
+    write_workspace(tmp_path)
+    make_rag(tmp_path).index_codebase()
+
+    (tmp_path / "a.py").write_text("def alpha_renamed():\n    return 3\n")
+    (tmp_path / "b.py").unlink()
+    rag = make_rag(tmp_path)
+    rag.index_codebase()
+
+    # Only the changed file is re-embedded; b.py's chunks and a.py's old ones are gone
+    assert all("a.py" in text for text in rag.client.embeddings.texts)
+    assert stored_files(rag) == {"a.py"}
+    documents = rag.collection.get()["documents"]
+    assert any("alpha_renamed" in document for document in documents)
+    assert not any("def alpha()" in document for document in documents)
+    assert set(rag.file_manifest) == {"a.py"}
+
+
+def test_failed_files_keep_old_chunks_and_are_retried(tmp_path):
+    write_workspace(tmp_path)
+    make_rag(tmp_path).index_codebase()
+
+    (tmp_path / "a.py").write_text("def alpha_v2():\n    return 3\n")
+    rag = make_rag(tmp_path)
+    chunk_file = rag._chunk_file
+
+    def failing_chunk_file(file_path):
+        if file_path.name == "a.py":
+            raise OSError("unreadable")
+        return chunk_file(file_path)
+
+    rag._chunk_file = failing_chunk_file
+    rag.index_codebase()
+    # The old chunks survive the failed run
+    assert "a.py" in stored_files(rag)
+
+    # The next run sees a.py as changed and indexes the new content
+    rag = make_rag(tmp_path)
+    rag.index_codebase()
+    assert rag.client.embeddings.texts
+    documents = rag.collection.get()["documents"]
+    assert any("alpha_v2" in document for document in documents)
+    assert not any("def alpha()" in document for document in documents)
@@ -0,0 +1,66 @@
+"""
+Tests that cached chat answers are only reused for the same model and context
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "web" / "backend"))
+
+from fastapi.testclient import TestClient
+
+import app as backend
+from app import response_cache_partition
+from tools.response_cache import SemanticResponseCache
+
+
+class FakeAssistant:
+    """Answers with a counter so a cache hit is visible; the model is settable"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.calls = 0
+        self._session_id = "s1"
+        self.last_turn_cacheable = True
+        self.last_turn_side_effects = False
+
+    def effective_model(self, user_message, conversation_history=None, model_override=None):
+        return self.model
+
+    def process_message(self, user_message):
+        self.calls += 1
+        return f"answer {self.calls} from {self.model}"
+
+
+def test_partition_separates_models_sessions_and_mentions():
+    base = response_cache_partition("chat", "gpt-4", "explain @a.py", "s1")
+    assert base == response_cache_partition("chat", "gpt-4", "Explain  @a.py please", "s1")
+    assert base != response_cache_partition("chat", "deepseek-coder", "explain @a.py", "s1")
+    assert base != response_cache_partition("chat", "gpt-4", "explain @a.py", "s2")
+    assert base != response_cache_partition("chat", "gpt-4", "explain @b.py", "s1")
+    assert base != response_cache_partition("composer", "gpt-4", "explain @a.py", "s1")
+
+
+def test_chat_hit_requires_same_effective_model_and_session():
+    fake = FakeAssistant("gpt-4")
+    backend.assistant = fake
+    backend.response_cache = SemanticResponseCache()
+    try:
+        client = TestClient(backend.app)
+        ask = lambda: client.post("/api/chat", json={"message": "what does main do?"}).json()
+
+        assert ask()["response"] == "answer 1 from gpt-4"
+        second = ask()
+        assert second["cached"] and second["response"] == "answer 1 from gpt-4"
+
+        # A different model would answer: no reuse
+        fake.model = "deepseek-coder"
+        assert ask()["response"] == "answer 2 from deepseek-coder"
+
+        # Another session's memory shapes the prompt: no reuse either
+        fake._session_id = "s2"
+        assert ask()["response"] == "answer 3 from deepseek-coder"
+    finally:
+        backend.assistant = None
+        backend.response_cache = None
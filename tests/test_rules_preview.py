@@ -0,0 +1,35 @@
+"""
+Tests for the cached /api/rules/preview body
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "web" / "backend"))
+
+from fastapi.testclient import TestClient
+
+import app as backend
+
+
+class FakeAssistant:
+    system_prompt = "prompt one"
+
+
+def test_preview_follows_prompt_content(monkeypatch):
+    monkeypatch.setattr(backend, "assistant", FakeAssistant())
+    monkeypatch.setitem(backend.assistant_caps, "get_system_prompt", False)
+    monkeypatch.setitem(backend.assistant_caps, "rules_engine", False)
+    monkeypatch.setattr(backend, "rules_preview_cache", None)
+    client = TestClient(backend.app)
+
+    first = client.get("/api/rules/preview")
+    assert first.json()["base_prompt"] == "prompt one"
+    # Unchanged prompt: same body and ETag
+    assert client.get("/api/rules/preview").headers["ETag"] == first.headers["ETag"]
+
+    backend.assistant.system_prompt = "prompt two"
+    second = client.get("/api/rules/preview")
+    assert second.json()["base_prompt"] == "prompt two"
+    assert second.headers["ETag"] != first.headers["ETag"]
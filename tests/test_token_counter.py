@@ -0,0 +1,50 @@
+"""
+Tests for TokenCounter's cached and batched token counts
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+import tiktoken
+
+from tools import token_counter
+from tools.token_counter import TokenCounter
+
+
+@pytest.fixture
+def byte_encoding(monkeypatch):
+    """A byte-level encoding with <|endoftext|>, so no vocab download is needed"""
+    encoding = tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([b]): b for b in range(256)},
+        special_tokens={"<|endoftext|>": 256}
+    )
+    monkeypatch.setattr(token_counter, "_get_encoding", lambda name: encoding)
+    monkeypatch.setattr(token_counter, "_model_encodings", {})
+    token_counter._count_cache.clear()
+    yield encoding
+    token_counter._count_cache.clear()
+
+
+@pytest.mark.parametrize("length", [10, 200])
+def test_special_token_text_is_counted_as_plain_text(byte_encoding, length):
+    """Short (uncached) and long (cached) texts both treat special tokens as text"""
+    text = ("a" * length) + "<|endoftext|>"
+    counter = TokenCounter()
+    assert counter.count_tokens(text) == len(text)
+    # The batch path agrees
+    assert token_counter._token_lengths(byte_encoding, [text]) == [len(text)]
+
+
+def test_batch_counts_match_single_counts_and_fill_cache(byte_encoding):
+    texts = [f"line {i} " + "x" * (i * 10) for i in range(20)]
+    lengths = token_counter._token_lengths(byte_encoding, texts)
+    assert lengths == [len(text) for text in texts]
+    cached = len(token_counter._count_cache)
+    assert cached == sum(len(text) > token_counter._COUNT_CACHE_MIN_LENGTH for text in texts)
+    # Served from the cache the second time
+    assert token_counter._token_lengths(byte_encoding, texts) == lengths
+    assert len(token_counter._count_cache) == cached
@@ -0,0 +1,78 @@
+"""
+Tests for ValidationService: validity, syntax checks and async tool runs
+"""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.validation_service import ValidationService, ValidationIssue, ValidationSeverity
+
+
+def issue(severity: ValidationSeverity) -> ValidationIssue:
+    return ValidationIssue(severity=severity, file_path="m.py", line_number=1, column=1, message=severity.value)
+
+
+def service_reporting(tmp_path, issues_by_tool):
+    """A service whose type checker and linter report fixed issues instead of running"""
+    service = ValidationService(workspace_path=str(tmp_path))
+
+    def run_tool(tool, targets, content=None):
+        issues = issues_by_tool.get(tool, [])
+        return {key: (not issues, issues) for key in targets}
+
+    service._run_tool = run_tool
+    return service
+
+
+def test_clean_file_is_valid(tmp_path):
+    result = service_reporting(tmp_path, {}).validate_file("m.py", "x = 1\n")
+    assert result.valid
+    assert result.issues == []
+
+
+def test_warnings_only_file_is_valid(tmp_path):
+    service = service_reporting(tmp_path, {
+        "python_lint": [issue(ValidationSeverity.WARNING), issue(ValidationSeverity.INFO)]
+    })
+    result = service.validate_file("m.py", "x = 1\n")
+    assert result.valid
+    assert len(result.issues) == 2
+
+
+def test_error_with_warnings_is_invalid(tmp_path):
+    service = service_reporting(tmp_path, {
+        "python_types": [issue(ValidationSeverity.ERROR)],
+        "python_lint": [issue(ValidationSeverity.WARNING)]
+    })
+    result = service.validate_file("m.py", "x = 1\n")
+    assert not result.valid
+
+
+def test_syntax_error_is_invalid(tmp_path):
+    result = service_reporting(tmp_path, {}).validate_file("m.py", "def broken(:\n")
+    assert not result.valid
+    assert not result.syntax_valid
+
+
+def test_syntax_warnings_are_not_reported_or_emitted(tmp_path, recwarn):
+    content = 'pattern = "\\d+"\nif pattern is "x":\n    pass\n'
+    result = service_reporting(tmp_path, {}).validate_file("warn_only.py", content)
+    assert result.syntax_valid
+    assert not [w for w in recwarn if issubclass(w.category, SyntaxWarning)]
+
+
+def test_tool_run_is_built_off_the_event_loop(tmp_path):
+    service = ValidationService(workspace_path=str(tmp_path))
+    built_on = []
+
+    def tool_run(tool, targets, content):
+        built_on.append(threading.get_ident())
+        return None  # tool not installed
+
+    service._tool_run = tool_run
+    results = asyncio.run(service._run_tool_async("python_lint", {"m.py": tmp_path / "m.py"}))
+    assert results == {"m.py": (None, [])}
+    assert built_on and built_on[0] != threading.get_ident()
@@ -0,0 +1,48 @@
+"""
+Tests for bounded outgoing queues on /ws/chat sockets
+"""
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "web" / "backend"))
+
+import app as backend
+
+
+class FakeSocket:
+    """Just enough of a WebSocket for broadcast(): state and close()"""
+
+    def __init__(self, maxsize: int):
+        self.state = SimpleNamespace(
+            outgoing=asyncio.Queue(maxsize=maxsize),
+            frame_format="json",
+            encode_frame=backend.ws_dumps
+        )
+        self.close_codes = []
+
+    async def close(self, code: int = 1000):
+        self.close_codes.append(code)
+
+
+def test_broadcast_drops_client_with_full_queue():
+    async def scenario():
+        reader, stalled = FakeSocket(maxsize=4), FakeSocket(maxsize=1)
+        backend.active_connections.update({reader, stalled})
+        try:
+            await backend.broadcast({"type": "notice", "n": 1})
+            await backend.broadcast({"type": "notice", "n": 2})
+            await asyncio.sleep(0)
+            return reader, stalled
+        finally:
+            backend.active_connections.difference_update({reader, stalled})
+
+    reader, stalled = asyncio.run(scenario())
+    assert reader.state.outgoing.qsize() == 2
+    assert reader.close_codes == []
+    # The stalled client got the first frame, then was closed instead of buffered
+    assert stalled.state.outgoing.qsize() == 1
+    assert stalled.close_codes == [1013]
@@ -6,6 +6,55 @@ from typing import List, Dict, Optional
 from tools.llm_provider import LLMProvider, get_provider
 from config import Config
 
+SUMMARY_PREFIX = "[Previous conversation summary]: "
+
+
+def condense_history(
+    messages: List[Dict[str, str]],
+    char_budget: int = 24000,
+    preserve_recent_turns: int = 4,
+    max_summary_chars: int = 2000
+) -> List[Dict[str, str]]:
+    """
+    Cap a running conversation without an LLM call.
+    
+    Once the history exceeds char_budget (~3 chars per token), everything but
+    the last preserve_recent_turns user/assistant pairs is folded into one
+    summary message holding the first line of each older message.
+    
+    Args:
+        messages: Conversation history (oldest first)
+        char_budget: Total content characters allowed before condensing
+        preserve_recent_turns: Turns kept verbatim
+        max_summary_chars: Cap on the summary; the oldest lines drop first
+        
+    Returns:
+        The history unchanged, or [summary] + recent messages
+    """
+    if sum(len(msg.get("content", "")) for msg in messages) <= char_budget:
+        return messages
+    
+    keep = preserve_recent_turns * 2
+    if len(messages) <= keep:
+        return messages
+    old_messages, recent_messages = messages[:-keep], messages[-keep:]
+    
+    lines = []
+    for msg in old_messages:
+        content = msg.get("content", "")
+        if content.startswith(SUMMARY_PREFIX):
+            # Earlier summary: carry its lines forward
+            lines.extend(content[len(SUMMARY_PREFIX):].splitlines())
+            continue
+        first_line = content.strip().split("\n", 1)[0][:160]
+        if first_line:
+            lines.append(f"{msg.get('role', 'user').upper()}: {first_line}")
+    
+    summary = "\n".join(lines)
+    if len(summary) > max_summary_chars:
+        summary = summary[-max_summary_chars:].split("\n", 1)[-1]  # Drop the cut-off line
+    return [{"role": "system", "content": SUMMARY_PREFIX + summary}] + recent_messages
+
 
 class ConversationSummarizer:
     """Summarizes conversation history to save tokens"""
@@ -114,7 +163,7 @@ class ConversationSummarizer:
             # Create summary message
             summary_message = {
                 "role": "system",
-                "content": f"[Previous conversation summary]: {summary_text}"
+                "content": f"{SUMMARY_PREFIX}{summary_text}"
             }
             
             return {
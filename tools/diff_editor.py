@@ -8,6 +8,15 @@ from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import pygit2  # libgit2's C patch parser
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+    pygit2 = None
+
+HUNK_HEADER_RE = re.compile(r'@@\s+-(\d+)(?:,(\d+))?\s+\+(\d+)(?:,(\d+))?\s+@@')
+
 
 class DiffOperation(Enum):
     """Types of diff operations"""
@@ -16,6 +25,15 @@ class DiffOperation(Enum):
     KEEP = " "
 
 
+# Diff line prefix -> operation (also libgit2's line origins; other origins
+# only mark a missing newline at end of file)
+LINE_OPERATIONS = {
+    '+': DiffOperation.ADD,
+    '-': DiffOperation.REMOVE,
+    ' ': DiffOperation.KEEP,
+}
+
+
 @dataclass
 class DiffHunk:
     """Represents a hunk (block) of changes in a diff"""
@@ -61,6 +79,14 @@ class DiffEditor:
         Returns:
             List of FileDiff objects
         """
+        if PYGIT2_AVAILABLE:
+            try:
+                return self._parse_diff_libgit2(diff_text)
+            except Exception:
+                # libgit2 rejects malformed patches (e.g. wrong hunk counts, common
+                # in LLM output); the lenient Python parser handles those
+                pass
+        
         file_diffs = []
         current_file = None
         current_hunks = []
@@ -108,12 +134,8 @@ class DiffEditor:
                         current_hunks.append(current_hunk)
             
             # Diff line: +, -, or space
-            elif line.startswith(('+', '-', ' ')) and current_hunk:
-                operation = DiffOperation.ADD if line.startswith('+') else \
-                           DiffOperation.REMOVE if line.startswith('-') else \
-                           DiffOperation.KEEP
-                content = line[1:] if line.startswith(('+', '-', ' ')) else line
-                current_hunk.lines.append((operation, content))
+            elif current_hunk and line[:1] in LINE_OPERATIONS:
+                current_hunk.lines.append((LINE_OPERATIONS[line[0]], line[1:]))
             
             i += 1
         
@@ -124,6 +146,35 @@ class DiffEditor:
         
         return file_diffs
     
+    def _parse_diff_libgit2(self, diff_text: str) -> List[FileDiff]:
+        """Parse a unified diff with libgit2 (git_diff_from_buffer) into FileDiff objects"""
+        file_diffs = []
+        for patch in pygit2.Diff.parse_diff(diff_text):
+            delta = patch.delta
+            hunks = []
+            for hunk in patch.hunks:
+                hunks.append(DiffHunk(
+                    old_start=hunk.old_start,
+                    old_count=hunk.old_lines,
+                    new_start=hunk.new_start,
+                    new_count=hunk.new_lines,
+                    lines=[
+                        (LINE_OPERATIONS[line.origin], line.content.rstrip('\n'))
+                        for line in hunk.lines
+                        if line.origin in LINE_OPERATIONS
+                    ]
+                ))
+            file_diffs.append(FileDiff(
+                # New files have no old path, so apply_diff may create them
+                old_path="" if delta.status == pygit2.GIT_DELTA_ADDED else delta.old_file.path,
+                new_path=delta.new_file.path,
+                hunks=hunks
+            ))
+        
+        if not file_diffs:
+            raise ValueError("No file diffs found")
+        return file_diffs
+    
     def apply_diff(self, file_diff: FileDiff, dry_run: bool = False) -> Dict[str, Any]:
         """
         Apply a FileDiff to the actual file.
@@ -436,8 +487,7 @@ class DiffEditor:
     
     def _parse_hunk_header(self, header: str) -> Optional[Dict[str, int]]:
         """Parse a hunk header: @@ -old_start,old_count +new_start,new_count @@"""
-        pattern = r'@@\s+-(\d+)(?:,(\d+))?\s+\+(\d+)(?:,(\d+))?\s+@@'
-        match = re.match(pattern, header)
+        match = HUNK_HEADER_RE.match(header)
         
         if match:
             return {
@@ -17,6 +17,28 @@ except ImportError:
     Repo = None
     InvalidGitRepositoryError = Exception
 
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+    pygit2 = None
+
+# pygit2 status flag -> change type, for index (staged) and working tree (unstaged)
+_INDEX_FLAGS = (
+    ("GIT_STATUS_INDEX_NEW", "A"),
+    ("GIT_STATUS_INDEX_MODIFIED", "M"),
+    ("GIT_STATUS_INDEX_DELETED", "D"),
+    ("GIT_STATUS_INDEX_RENAMED", "R"),
+    ("GIT_STATUS_INDEX_TYPECHANGE", "T"),
+)
+_WORKTREE_FLAGS = (
+    ("GIT_STATUS_WT_MODIFIED", "M"),
+    ("GIT_STATUS_WT_DELETED", "D"),
+    ("GIT_STATUS_WT_RENAMED", "R"),
+    ("GIT_STATUS_WT_TYPECHANGE", "T"),
+)
+
 
 class GitService:
     """Service for git operations"""
@@ -25,10 +47,12 @@ class GitService:
         self.workspace_path = Path(workspace_path).resolve()
         self.repo = None
         self.is_repo = False
+        self._git2 = None  # pygit2 handle, used for status when available
         
         # Caching for git status (5-10 second TTL)
         self._status_cache: Optional[Dict[str, Any]] = None
         self._status_cache_time: float = 0.0
+        self._status_cache_head: Optional[str] = None
         self._status_cache_ttl: float = 8.0  # 8 seconds
         
         if not GIT_AVAILABLE:
@@ -42,6 +66,76 @@ class GitService:
             self.is_repo = False
         except Exception:
             self.is_repo = False
+        
+        # libgit2 computes status in-process instead of shelling out to git, so
+        # it is cheap enough to only absorb burst polling (cache keyed on HEAD)
+        if PYGIT2_AVAILABLE and self.is_repo:
+            try:
+                self._git2 = pygit2.Repository(str(self.workspace_path))
+                self._status_cache_ttl = 0.25
+            except Exception:
+                self._git2 = None
+    
+    def _head_oid(self) -> Optional[str]:
+        """HEAD commit id via pygit2 (None when unavailable or unborn)"""
+        if self._git2 is None:
+            return None
+        try:
+            return str(self._git2.head.target)
+        except Exception:
+            return None
+    
+    def get_head_oid(self) -> Optional[str]:
+        """Current HEAD commit id (None outside a repo or on an unborn branch)"""
+        if self._git2 is not None:
+            return self._head_oid()
+        if not self.is_repo or not self.repo:
+            return None
+        try:
+            return self.repo.head.commit.hexsha
+        except Exception:
+            return None
+    
+    def _status_libgit2(self) -> Tuple[str, List[Dict], List[Dict], List[Dict]]:
+        """
+        Branch and staged/unstaged/untracked entries from a single pygit2 status call
+        
+        Returns:
+            (branch, staged, unstaged, untracked), each list limited to 100 items
+        """
+        repo = self._git2
+        if repo.head_is_detached:
+            branch = "detached"
+        elif repo.head_is_unborn:
+            branch = repo.references["HEAD"].target.replace("refs/heads/", "", 1)
+        else:
+            branch = repo.head.shorthand
+        
+        staged: List[Dict] = []
+        unstaged: List[Dict] = []
+        untracked: List[Dict] = []
+        
+        for path, flags in repo.status().items():
+            if flags & pygit2.GIT_STATUS_IGNORED:
+                continue
+            if flags & pygit2.GIT_STATUS_WT_NEW:
+                if len(untracked) < 100:
+                    untracked.append({"path": path, "status": "U"})
+                continue
+            for entries, flag_map in ((staged, _INDEX_FLAGS), (unstaged, _WORKTREE_FLAGS)):
+                if len(entries) >= 100:
+                    continue
+                for flag_name, change_type in flag_map:
+                    if flags & getattr(pygit2, flag_name):
+                        entries.append({
+                            "path": path,
+                            "status": change_type,
+                            "old_path": path,
+                            "new_path": path
+                        })
+                        break
+        
+        return branch, staged, unstaged, untracked
     
     def get_status(self) -> Dict[str, Any]:
         """
@@ -63,64 +157,18 @@ class GitService:
         
         # Check cache first
         current_time = time.time()
+        head = self._head_oid()
         if (self._status_cache is not None and 
+            self._status_cache_head == head and
             current_time - self._status_cache_time < self._status_cache_ttl):
             return self._status_cache
         
         # Cache miss or expired, compute status
         try:
-            # Get current branch
-            try:
-                branch = self.repo.active_branch.name
-            except Exception:
-                branch = "detached"
-            
-            # Get status
-            staged = []
-            unstaged = []
-            untracked = []
-            
-            # Get staged changes (index vs HEAD) - limit to prevent timeout
-            try:
-                diff_head = self.repo.index.diff("HEAD")
-                for item in list(diff_head)[:100]:  # Limit to 100 items
-                    path = item.a_path if hasattr(item, 'a_path') and item.a_path else item.b_path
-                    staged.append({
-                        "path": path,
-                        "status": item.change_type,
-                        "old_path": getattr(item, 'a_path', None),
-                        "new_path": getattr(item, 'b_path', None)
-                    })
-            except Exception as e:
-                # If diff fails, continue with empty staged
-                pass
-            
-            # Get unstaged changes (working tree vs index) - limit to prevent timeout
-            try:
-                diff_none = self.repo.index.diff(None)
-                for item in list(diff_none)[:100]:  # Limit to 100 items
-                    path = item.a_path if hasattr(item, 'a_path') and item.a_path else item.b_path
-                    unstaged.append({
-                        "path": path,
-                        "status": item.change_type,
-                        "old_path": getattr(item, 'a_path', None),
-                        "new_path": getattr(item, 'b_path', None)
-                    })
-            except Exception as e:
-                # If diff fails, continue with empty unstaged
-                pass
-            
-            # Get untracked files - limit to prevent timeout
-            try:
-                untracked_paths = self.repo.untracked_files[:100]  # Limit to 100 items
-                for path in untracked_paths:
-                    untracked.append({
-                        "path": path,
-                        "status": "U"
-                    })
-            except Exception as e:
-                # If untracked files fails, continue with empty untracked
-                pass
+            if self._git2 is not None:
+                branch, staged, unstaged, untracked = self._status_libgit2()
+            else:
+                branch, staged, unstaged, untracked = self._status_gitpython()
             
             has_changes = len(staged) > 0 or len(unstaged) > 0 or len(untracked) > 0
             
@@ -136,6 +184,7 @@ class GitService:
             # Update cache
             self._status_cache = status
             self._status_cache_time = current_time
+            self._status_cache_head = head
             
             return status
         except Exception as e:
@@ -151,8 +200,71 @@ class GitService:
             # Cache error result too (shorter TTL for errors)
             self._status_cache = status
             self._status_cache_time = current_time
+            self._status_cache_head = head
             return status
     
+    def _status_gitpython(self) -> Tuple[str, List[Dict], List[Dict], List[Dict]]:
+        """
+        Branch and staged/unstaged/untracked entries via GitPython
+        
+        Returns:
+            (branch, staged, unstaged, untracked), each list limited to 100 items
+        """
+        # Get current branch
+        try:
+            branch = self.repo.active_branch.name
+        except Exception:
+            branch = "detached"
+        
+        # Get status
+        staged = []
+        unstaged = []
+        untracked = []
+        
+        # Get staged changes (index vs HEAD) - limit to prevent timeout
+        try:
+            diff_head = self.repo.index.diff("HEAD")
+            for item in list(diff_head)[:100]:  # Limit to 100 items
+                path = item.a_path if hasattr(item, 'a_path') and item.a_path else item.b_path
+                staged.append({
+                    "path": path,
+                    "status": item.change_type,
+                    "old_path": getattr(item, 'a_path', None),
+                    "new_path": getattr(item, 'b_path', None)
+                })
+        except Exception as e:
+            # If diff fails, continue with empty staged
+            pass
+        
+        # Get unstaged changes (working tree vs index) - limit to prevent timeout
+        try:
+            diff_none = self.repo.index.diff(None)
+            for item in list(diff_none)[:100]:  # Limit to 100 items
+                path = item.a_path if hasattr(item, 'a_path') and item.a_path else item.b_path
+                unstaged.append({
+                    "path": path,
+                    "status": item.change_type,
+                    "old_path": getattr(item, 'a_path', None),
+                    "new_path": getattr(item, 'b_path', None)
+                })
+        except Exception as e:
+            # If diff fails, continue with empty unstaged
+            pass
+        
+        # Get untracked files - limit to prevent timeout
+        try:
+            untracked_paths = self.repo.untracked_files[:100]  # Limit to 100 items
+            for path in untracked_paths:
+                untracked.append({
+                    "path": path,
+                    "status": "U"
+                })
+        except Exception as e:
+            # If untracked files fails, continue with empty untracked
+            pass
+        
+        return branch, staged, unstaged, untracked
+    
     def invalidate_status_cache(self):
         """Invalidate the status cache (call after git operations)"""
         self._status_cache = None
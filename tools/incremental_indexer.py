@@ -115,7 +115,8 @@ class IncrementalIndexer:
                 self.rag_system.remove_file_from_index(file_path)
                 return
             
-            result = self.rag_system.index_file(file_path, force_reindex=True)
+            # Saves that leave the content unchanged are skipped by hash
+            result = self.rag_system.index_file(file_path)
             if result.get("status") == "success":
                 print(f"✅ Incrementally indexed: {file_path.name} ({result.get('chunks_created', 0)} chunks)")
             elif result.get("status") == "error":
@@ -3,8 +3,46 @@ LLM Provider Abstraction Layer
 Supports multiple LLM providers (OpenAI, Anthropic, DeepSeek) with unified interface
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Generator, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Process-wide pooled HTTP client shared by every provider SDK client.
+    
+    All LLM and embedding calls reuse its keep-alive connections (and TLS
+    sessions) instead of each SDK client opening its own pool. Idle
+    connections are kept for 30s so gaps between chat turns don't force a
+    fresh handshake.
+    """
+    return httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        follow_redirects=True,
+        timeout=httpx.Timeout(600.0, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=30.0
+        )
+    )
+
+
+def close_http_client():
+    """Close the shared HTTP client; the next get_http_client() call opens a new one"""
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+    get_http_client.cache_clear()
 
 
 @dataclass
@@ -31,18 +69,64 @@ class LLMProvider(ABC):
         """Generate chat completion"""
         pass
     
+    def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Generator[str, None, LLMResponse]:
+        """
+        Stream chat completion text as it is generated.
+        
+        Yields content deltas; the generator's return value is the full LLMResponse.
+        Providers without a streaming API yield the whole completion as one delta.
+        """
+        response = self.chat_completion(messages, model, temperature, max_tokens)
+        if response.content:
+            yield response.content
+        return response
+    
     @abstractmethod
     def create_embedding(self, text: str, model: str) -> List[float]:
         """Create embedding for text"""
         pass
 
 
+def _stream_openai_chunks(stream, model: str) -> Generator[str, None, LLMResponse]:
+    """Yield content deltas from an OpenAI-compatible stream and return the assembled response"""
+    parts = []
+    finish_reason = None
+    usage = None
+    
+    for chunk in stream:
+        # With include_usage, the last chunk carries usage and no choices
+        if getattr(chunk, "usage", None):
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            finish_reason = choice.finish_reason
+        if choice.delta and choice.delta.content:
+            parts.append(choice.delta.content)
+            yield choice.delta.content
+    
+    return LLMResponse(
+        content="".join(parts),
+        model=model,
+        input_tokens=usage.prompt_tokens if usage else 0,
+        output_tokens=usage.completion_tokens if usage else 0,
+        finish_reason=finish_reason or "stop"
+    )
+
+
 class OpenAIProvider(LLMProvider):
     """OpenAI implementation"""
     
     def __init__(self, api_key: str):
         from openai import OpenAI
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, http_client=get_http_client())
     
     def chat_completion(
         self,
@@ -66,6 +150,23 @@ class OpenAIProvider(LLMProvider):
             finish_reason=response.choices[0].finish_reason
         )
     
+    def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Generator[str, None, LLMResponse]:
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        return (yield from _stream_openai_chunks(stream, model))
+    
     def create_embedding(self, text: str, model: str = "text-embedding-3-small") -> List[float]:
         response = self.client.embeddings.create(
             model=model,
@@ -82,7 +183,8 @@ class DeepSeekProvider(LLMProvider):
         # DeepSeek uses OpenAI-compatible API
         self.client = OpenAI(
             api_key=api_key,
-            base_url="https://api.deepseek.com"
+            base_url="https://api.deepseek.com",
+            http_client=get_http_client()
         )
     
     def chat_completion(
@@ -116,6 +218,27 @@ class DeepSeekProvider(LLMProvider):
             finish_reason=response.choices[0].finish_reason
         )
     
+    def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "deepseek-coder",
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Generator[str, None, LLMResponse]:
+        """Stream chat completion using DeepSeek"""
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        response = yield from _stream_openai_chunks(stream, model)
+        if not response.content:
+            raise RuntimeError("Empty response from DeepSeek API")
+        return response
+    
     def create_embedding(self, text: str, model: str = None) -> List[float]:
         # DeepSeek doesn't have embeddings API - use OpenAI
         raise NotImplementedError("DeepSeek doesn't support embeddings. Use OpenAI for embeddings.")
@@ -127,24 +250,26 @@ class AnthropicProvider(LLMProvider):
     def __init__(self, api_key: str):
         try:
             import anthropic
-            self.client = anthropic.Anthropic(api_key=api_key)
         except ImportError:
             raise ImportError("anthropic package required. Install with: pip install anthropic")
+        
+        try:
+            self.client = anthropic.Anthropic(api_key=api_key, http_client=get_http_client())
+        except TypeError:
+            # Newer SDKs build on their own HTTP stack and reject an httpx client;
+            # they still keep one pooled client per provider instance
+            self.client = anthropic.Anthropic(api_key=api_key)
     
-    def chat_completion(
-        self,
-        messages: List[Dict[str, str]],
-        model: str = "claude-3-5-sonnet-20241022",
-        temperature: float = 0.7,
-        max_tokens: int = 2000
-    ) -> LLMResponse:
-        # Convert OpenAI format to Anthropic format
-        system_message = None
+    @staticmethod
+    def _convert_messages(messages: List[Dict[str, str]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """Convert OpenAI-format messages to Anthropic (system blocks, conversation)"""
+        system_blocks = []
         conversation = []
         
         for msg in messages:
             if msg["role"] == "system":
-                system_message = msg["content"]
+                if msg["content"]:
+                    system_blocks.append({"type": "text", "text": msg["content"]})
             else:
                 # Anthropic uses "user" and "assistant" roles
                 role = msg["role"]
@@ -155,9 +280,26 @@ class AnthropicProvider(LLMProvider):
                     "content": msg["content"]
                 })
         
+        # The first system message is the static prompt: mark it for prompt caching so
+        # repeat requests reuse its prefill (prompts under the provider's minimum
+        # cacheable length are simply not cached)
+        if system_blocks:
+            system_blocks[0]["cache_control"] = {"type": "ephemeral"}
+        
+        return system_blocks, conversation
+    
+    def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "claude-3-5-sonnet-20241022",
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> LLMResponse:
+        system_blocks, conversation = self._convert_messages(messages)
+        
         response = self.client.messages.create(
             model=model,
-            system=system_message or "",
+            system=system_blocks or "",
             messages=conversation,
             temperature=temperature,
             max_tokens=max_tokens
@@ -179,6 +321,38 @@ class AnthropicProvider(LLMProvider):
             finish_reason=response.stop_reason
         )
     
+    def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "claude-3-5-sonnet-20241022",
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Generator[str, None, LLMResponse]:
+        system_blocks, conversation = self._convert_messages(messages)
+        
+        with self.client.messages.stream(
+            model=model,
+            system=system_blocks or "",
+            messages=conversation,
+            temperature=temperature,
+            max_tokens=max_tokens
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
+            response = stream.get_final_message()
+        
+        message_text = "".join(block.text for block in response.content if block.type == "text")
+        if not message_text:
+            raise RuntimeError("Empty response from Anthropic API")
+        
+        return LLMResponse(
+            content=message_text,
+            model=model,
+            input_tokens=response.usage.input_tokens,
+            output_tokens=response.usage.output_tokens,
+            finish_reason=response.stop_reason
+        )
+    
     def create_embedding(self, text: str, model: str = None) -> List[float]:
         # Anthropic doesn't have embeddings API yet
         raise NotImplementedError("Anthropic doesn't support embeddings. Use OpenAI for embeddings.")
@@ -421,6 +421,18 @@ class PerformanceMonitor:
             
             return model_stats
     
+    def cached_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached summary if it is still fresh, without computing or locking.
+        
+        Returns:
+            Summary dictionary, or None if get_summary() would have to recompute
+        """
+        if (self._summary_cache is not None and
+            time.time() - self._summary_cache_time < self._summary_cache_ttl):
+            return self._summary_cache
+        return None
+    
     def get_summary(self) -> Dict[str, Any]:
         """
         Get a summary of all performance metrics.
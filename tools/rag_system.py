@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass
 import json
+from collections import Counter, defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
 
@@ -19,6 +20,11 @@ try:
 except ImportError:
     CHROMADB_AVAILABLE = False
 
+try:
+    from blake3 import blake3  # SIMD-accelerated; blake2b is used without it
+except ImportError:
+    blake3 = None
+
 from openai import OpenAI
 
 from config import Config
@@ -26,6 +32,14 @@ from .ast_analyzer import ASTAnalyzer
 from .code_graph import CodeGraphBuilder
 from .cache import Cache
 from .retry import retry_api_call
+from .llm_provider import get_http_client
+
+
+def _hash_content(data: bytes) -> str:
+    """Content hash used to detect changed files between index runs"""
+    if blake3 is not None:
+        return blake3(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 @dataclass
@@ -51,7 +65,7 @@ class RAGSystem:
     def __init__(self, workspace_path: str = ".", api_key: Optional[str] = None,
                  performance_monitor=None):
         self.workspace_path = Path(workspace_path).resolve()
-        self.client = OpenAI(api_key=api_key or Config.OPENAI_API_KEY)
+        self.client = OpenAI(api_key=api_key or Config.OPENAI_API_KEY, http_client=get_http_client())
         self.ast_analyzer = ASTAnalyzer(workspace_path)
         self.code_graph = None  # Lazy-loaded code graph
         self.performance_monitor = performance_monitor  # Optional performance monitor
@@ -80,13 +94,49 @@ class RAGSystem:
         self.is_indexed = False
         self.file_index_map = {}  # Track indexed files
         self._index_lock = Lock()  # Thread-safe indexing
+        
+        # rel_path -> {"hash", "chunk_ids"} for what is stored in the collection, so
+        # unchanged files are not re-embedded
+        self.manifest_path = self.db_path / "file_hashes.json"
+        self._manifest_lock = Lock()
+        self.file_manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
+    
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Load the file hash manifest saved by the last index run"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_manifest(self):
+        """Persist the file hash manifest (caller holds _manifest_lock)"""
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.file_manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def _hash_file(self, file_path: Path) -> Optional[str]:
+        """Content hash of a file, or None if it can't be read"""
+        try:
+            return _hash_content(file_path.read_bytes())
+        except OSError:
+            return None
+    
+    def _delete_chunk_ids(self, chunk_ids: List[str]):
+        """Delete chunks by id from the collection"""
+        for start in range(0, len(chunk_ids), 1000):
+            self.collection.delete(ids=chunk_ids[start:start + 1000])
     
     def index_codebase(self, force_reindex: bool = False) -> Dict[str, Any]:
         """
         Index the entire codebase into the vector store.
         
+        Files whose content hash matches the last run keep their stored
+        embeddings; only new and changed files are embedded.
+        
         Args:
-            force_reindex: If True, reindex even if already indexed
+            force_reindex: If True, reindex everything even if already indexed
             
         Returns:
             dict with indexing statistics
@@ -99,15 +149,37 @@ class RAGSystem:
             self.performance_monitor.start_indexing()
         
         print("[INFO] Scanning codebase...")
-        files = self._get_code_files()
-        print(f"[INFO] Found {len(files)} code files")
+        all_files = self._get_code_files()
+        print(f"[INFO] Found {len(all_files)} code files")
+        
+        with self._manifest_lock:
+            # A collection without a manifest predates hash tracking: rebuild it once
+            if not self.file_manifest and self.collection.count() > 0:
+                force_reindex = True
+            if force_reindex:
+                self.file_manifest = {}
+            previous = dict(self.file_manifest)
+        
+        # Only files whose content changed since the last run are re-chunked and re-embedded
+        file_hashes = {}
+        files = []
+        for file_path in all_files:
+            rel_path = str(file_path.relative_to(self.workspace_path))
+            file_hashes[rel_path] = self._hash_file(file_path)
+            if file_hashes[rel_path] is None or previous.get(rel_path, {}).get("hash") != file_hashes[rel_path]:
+                files.append(file_path)
+        stale_files = [rel_path for rel_path in previous if rel_path not in file_hashes]
+        unchanged_files = len(all_files) - len(files)
+        if unchanged_files:
+            print(f"[INFO] Skipping {unchanged_files} unchanged files")
         
         all_chunks = []
         indexed_files = 0
+        failed_files = set()  # Relative paths that couldn't be chunked this run
         start_time = time.time()
         
         # Parallel file processing for better performance
-        max_workers = min(8, len(files))  # Use up to 8 threads
+        max_workers = max(1, min(8, len(files)))  # Use up to 8 threads
         chunks_lock = Lock()
         
         # Use progress indicator for better UX
@@ -144,6 +216,7 @@ class RAGSystem:
                     if result["success"]:
                         indexed_files += 1
                     else:
+                        failed_files.add(str(result["file"].relative_to(self.workspace_path)))
                         print(f"   [WARN] Error indexing {result['file']}: {result.get('error', 'Unknown error')}")
                     progress.update(task, advance=1)
         
@@ -160,6 +233,7 @@ class RAGSystem:
         texts = []
         metadatas = []
         ids = []
+        file_chunk_ids: Dict[str, List[str]] = defaultdict(list)
         
         # First pass: split any chunks that exceed token limit
         processed_chunks = []
@@ -178,6 +252,7 @@ class RAGSystem:
         
         # Update all_chunks with processed chunks
         all_chunks = processed_chunks
+        expected_chunks = Counter(chunk.file_path for chunk in all_chunks)
         print(f"[INFO] Processed {len(all_chunks)} chunks (after splitting large chunks)")
         
         for i in range(0, len(all_chunks), batch_size):
@@ -271,6 +346,7 @@ class RAGSystem:
                     for chunk, global_idx in sub_batch_chunks:
                         chunk_id = self._generate_chunk_id(chunk, global_idx)
                         ids.append(chunk_id)
+                        file_chunk_ids[chunk.file_path].append(chunk_id)
                         metadatas.append({
                             "file_path": str(chunk.file_path),
                             "language": chunk.language,
@@ -297,6 +373,17 @@ class RAGSystem:
                 name="codebase",
                 metadata={"hnsw:space": "cosine"}
             )
+        else:
+            # Drop chunks of changed and deleted files before adding the new ones;
+            # files that failed to chunk keep their old chunks until a run succeeds
+            stale_ids = [
+                chunk_id
+                for rel_path in stale_files + [str(f.relative_to(self.workspace_path)) for f in files]
+                if rel_path not in failed_files
+                for chunk_id in previous.get(rel_path, {}).get("chunk_ids", [])
+            ]
+            if stale_ids:
+                self._delete_chunk_ids(stale_ids)
         
         # Add to vector store in batches if large
         if len(embeddings) > 0:
@@ -318,12 +405,37 @@ class RAGSystem:
                         ids=ids[batch_start:batch_end]
                     )
                 
-                self.is_indexed = True
                 print(f"[OK] Stored {len(embeddings)} chunks in vector database")
             except Exception as e:
                 print(f"[ERROR] Failed to store in vector database: {e}")
                 raise
         
+        with self._manifest_lock:
+            for rel_path in stale_files:
+                self.file_manifest.pop(rel_path, None)
+            for file_path in files:
+                rel_path = str(file_path.relative_to(self.workspace_path))
+                if rel_path in failed_files:
+                    # Keep the previous entry (and its chunks); its hash no longer
+                    # matches the file, so the next run retries it
+                    continue
+                chunk_ids = file_chunk_ids.get(rel_path, [])
+                # Partially embedded files keep no hash so the next run retries them
+                complete = len(chunk_ids) == expected_chunks.get(rel_path, 0)
+                self.file_manifest[rel_path] = {
+                    "hash": file_hashes[rel_path] if complete else None,
+                    "chunk_ids": chunk_ids
+                }
+            self._save_manifest()
+            self.file_index_map = {
+                rel_path: len(entry["chunk_ids"])
+                for rel_path, entry in self.file_manifest.items()
+                if entry["chunk_ids"]
+            }
+        
+        if self.file_index_map:
+            self.is_indexed = True
+        
         # Record indexing completion
         if self.performance_monitor:
             indexing_stats = self.performance_monitor.end_indexing(
@@ -335,7 +447,9 @@ class RAGSystem:
         return {
             "status": "success",
             "files_indexed": indexed_files,
-            "total_files": len(files),
+            "files_unchanged": unchanged_files,
+            "files_removed": len(stale_files),
+            "total_files": len(all_files),
             "chunks_created": len(all_chunks),
             "embeddings_generated": len(embeddings),
             "duration_seconds": elapsed,
@@ -858,6 +972,10 @@ class RAGSystem:
                 metadata={"hnsw:space": "cosine"}
             )
             self.is_indexed = False
+            with self._manifest_lock:
+                self.file_manifest = {}
+                self.file_index_map = {}
+                self._save_manifest()
         except Exception as e:
             print(f"Error clearing index: {e}")
     
@@ -873,14 +991,16 @@ class RAGSystem:
             dict with indexing results
         """
         file_str = str(file_path.relative_to(self.workspace_path))
+        content_hash = self._hash_file(file_path)
         
-        # Check if already indexed
-        if file_str in self.file_index_map and not force_reindex:
+        # Check if already indexed with the same content
+        entry = self.file_manifest.get(file_str)
+        if entry and content_hash is not None and entry["hash"] == content_hash and not force_reindex:
             return {"status": "already_indexed", "file": file_str}
         
         try:
             # Remove old chunks for this file if reindexing
-            if force_reindex or file_str in self.file_index_map:
+            if force_reindex or file_str in self.file_manifest:
                 self._remove_file_chunks(file_str)
             
             # Chunk the file
@@ -921,7 +1041,10 @@ class RAGSystem:
             )
             
             # Update index map
-            self.file_index_map[file_str] = len(chunks)
+            with self._manifest_lock:
+                self.file_index_map[file_str] = len(chunks)
+                self.file_manifest[file_str] = {"hash": content_hash, "chunk_ids": ids}
+                self._save_manifest()
             
             return {
                 "status": "success",
@@ -959,8 +1082,10 @@ class RAGSystem:
             
             if results['ids']:
                 self.collection.delete(ids=results['ids'])
-                if file_path in self.file_index_map:
-                    del self.file_index_map[file_path]
+                with self._manifest_lock:
+                    self.file_index_map.pop(file_path, None)
+                    if self.file_manifest.pop(file_path, None) is not None:
+                        self._save_manifest()
                 return {
                     "status": "removed",
                     "file": file_path,
@@ -0,0 +1,231 @@
+"""
+Semantic Response Cache
+Serves stored LLM responses for repeated or near-duplicate queries
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def _quantize(vector: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Symmetric int8 quantization with a per-vector scale: vector ~= q * scale"""
+    peak = float(np.abs(vector).max())
+    if peak == 0.0:
+        return np.zeros(vector.shape, dtype=np.int8), 0.0
+    scale = peak / 127.0
+    return np.round(vector / scale).astype(np.int8), scale
+
+
+class SemanticResponseCache:
+    """
+    Two-tier cache for LLM responses.
+    
+    - Exact tier: sha256 of (generation, model, normalized query)
+    - Semantic tier: random-projection LSH over query embeddings; a stored
+      response in the same bucket is returned when cosine similarity is
+      at or above the threshold. Embeddings are kept as int8 with a
+      per-vector scale (4x smaller than float32) and scored with integer
+      dot products
+    
+    The generation counter is part of every key, so bumping it (e.g. after
+    re-indexing) invalidates all entries without walking them.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: int = 3600,
+        similarity_threshold: float = 0.97,
+        num_planes: int = 16,
+        embed_fn: Optional[Callable[[str], List[float]]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.num_planes = num_planes
+        self.embed_fn = embed_fn  # Without one, only exact matches are served
+        
+        self.generation = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, str, int], List[str]] = {}
+        self._planes: Optional[np.ndarray] = None  # Created once the embedding size is known
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Normalize a query so trivial whitespace/case changes share a key"""
+        return " ".join(query.lower().split())
+    
+    def _exact_key(self, query: str, model: str, generation: int) -> str:
+        raw = f"{generation}|{model}|{self.normalize(query)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def _embed(self, query: str) -> Optional[np.ndarray]:
+        """Unit-length query embedding, or None if embeddings are unavailable"""
+        if self.embed_fn is None:
+            return None
+        try:
+            vector = np.asarray(self.embed_fn(self.normalize(query)), dtype=np.float32)
+        except Exception:
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    
+    def _signature(self, vector: np.ndarray) -> int:
+        """LSH bucket: which side of each random hyperplane the vector falls on"""
+        if self._planes is None or self._planes.shape[1] != vector.shape[0]:
+            rng = np.random.default_rng(0)
+            self._planes = rng.standard_normal((self.num_planes, vector.shape[0])).astype(np.float32)
+        bits = (self._planes @ vector) > 0
+        return int(sum(1 << i for i, bit in enumerate(bits) if bit))
+    
+    def get(self, query: str, model: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+        
+        Args:
+            query: User query
+            model: Model the response must have come from
+        
+        Returns:
+            Cached payload, or None on a miss
+        """
+        return self.lookup(query, model)[0]
+    
+    def lookup(self, query: str, model: str) -> Tuple[Optional[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Look up a cached response, also returning the query embedding.
+        
+        On a miss, pass the embedding to set() so the query isn't embedded twice.
+        
+        Args:
+            query: User query
+            model: Model the response must have come from
+        
+        Returns:
+            (cached payload or None, query embedding or None)
+        """
+        generation = self.generation
+        key = self._exact_key(query, model, generation)
+        now = time.time()
+        
+        with self._lock:
+            entry = self._lookup(key, now)
+            if entry is not None:
+                self.hits += 1
+                return entry["payload"], None
+        
+        vector = self._embed(query)
+        if vector is not None:
+            # Quantize the query once; int32 accumulation avoids int8 overflow
+            query_q, query_scale = _quantize(vector)
+            query_q = query_q.astype(np.int32)
+            with self._lock:
+                bucket = self._buckets.get((generation, model, self._signature(vector)), [])
+                best_entry, best_score = None, self.similarity_threshold
+                for candidate_key in list(bucket):
+                    candidate = self._lookup(candidate_key, now)
+                    if candidate is None:
+                        continue
+                    dot = int(np.dot(candidate["vector"].astype(np.int32), query_q))
+                    score = dot * candidate["scale"] * query_scale
+                    if score >= best_score:
+                        best_entry, best_score = candidate, score
+                if best_entry is not None:
+                    self.hits += 1
+                    self.semantic_hits += 1
+                    return best_entry["payload"], vector
+        
+        with self._lock:
+            self.misses += 1
+        return None, vector
+    
+    def set(self, query: str, model: str, payload: Dict[str, Any], vector: Optional[np.ndarray] = None):
+        """
+        Store a response.
+        
+        Args:
+            query: User query
+            model: Model that produced the response
+            payload: JSON-serializable response payload
+            vector: Query embedding from lookup() (embedded here if omitted)
+        """
+        generation = self.generation
+        key = self._exact_key(query, model, generation)
+        if vector is None:
+            vector = self._embed(query)
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            bucket_key = None
+            vector_q, scale = None, 0.0
+            if vector is not None:
+                bucket_key = (generation, model, self._signature(vector))
+                self._buckets.setdefault(bucket_key, []).append(key)
+                vector_q, scale = _quantize(vector)
+            
+            self._entries[key] = {
+                "payload": payload,
+                "vector": vector_q,
+                "scale": scale,
+                "bucket": bucket_key,
+                "timestamp": time.time(),
+                "hit_count": 0
+            }
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+    
+    def invalidate(self):
+        """Drop all entries (e.g. after the codebase is re-indexed)"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._buckets.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "generation": self.generation
+            }
+    
+    def _lookup(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        """Live entry for key (caller holds the lock); expired entries are dropped"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now - entry["timestamp"] > self.ttl_seconds:
+            self._remove(key)
+            return None
+        entry["hit_count"] += 1
+        self._entries.move_to_end(key)
+        return entry
+    
+    def _remove(self, key: str):
+        """Remove an entry and its bucket reference (caller holds the lock)"""
+        entry = self._entries.pop(key, None)
+        if entry and entry["bucket"] is not None:
+            bucket = self._buckets.get(entry["bucket"])
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[entry["bucket"]]
@@ -2,7 +2,9 @@
 Runtime Debugger - Executes code and collects runtime data
 Similar to Cursor AI's runtime debugging
 """
+import asyncio
 import subprocess
+import sys
 import re
 import json
 from pathlib import Path
@@ -11,6 +13,26 @@ from .terminal import Terminal
 from .code_instrumentation import CodeInstrumentation
 from .error_parser import ErrorParser
 
+# Format: [__debug_instrumentation__] TYPE context
+# Matched once over the whole output; group(0) spans the full log line.
+_INST_RE = re.compile(
+    r'^[^\n]*?\[__debug_instrumentation__\][ \t]+(\w+)[ \t]+([^\n]+)',
+    re.MULTILINE
+)
+
+# Trace entry types/actions are drawn from a tiny fixed set, so share one
+# interned object per value across every trace entry.
+_ENTER = sys.intern("enter")
+_EXIT = sys.intern("exit")
+_VAR = sys.intern("var")
+_COND = sys.intern("cond")
+_TRACE_TYPES = {t: t for t in (_ENTER, _EXIT, _VAR, _COND)}
+
+
+def _intern_trace_type(trace_type: str) -> str:
+    """Return the shared interned string for known trace types"""
+    return _TRACE_TYPES.get(trace_type, trace_type)
+
 
 class RuntimeDebugger:
     """
@@ -54,6 +76,79 @@ class RuntimeDebugger:
         
         result = self.terminal.execute(cmd, is_background=False)
         
+        return self._build_execution_result(file_path, result, timeout)
+    
+    async def debug_execution_async(
+        self,
+        file_path: str,
+        arguments: Optional[List[str]] = None,
+        timeout: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Async variant of debug_execution using asyncio subprocess pipes,
+        so many executions can be multiplexed on a single event loop
+        
+        Args:
+            file_path: Path to file to execute
+            arguments: Command line arguments
+            timeout: Execution timeout in seconds
+            
+        Returns:
+            Dict with execution trace, variable states, and errors
+        """
+        full_path = self.workspace_path / file_path
+        
+        if not full_path.exists():
+            return {"error": f"File not found: {file_path}"}
+        
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable,
+                str(full_path),
+                *(arguments or []),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(self.workspace_path)
+            )
+        except Exception as e:
+            result = {
+                "success": False,
+                "stdout": "",
+                "stderr": "",
+                "returncode": -1,
+                "error": str(e)
+            }
+            return self._build_execution_result(file_path, result, timeout)
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            result = {
+                "success": proc.returncode == 0,
+                "stdout": stdout.decode("utf-8", errors="replace"),
+                "stderr": stderr.decode("utf-8", errors="replace"),
+                "returncode": proc.returncode,
+                "error": None
+            }
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            result = {
+                "success": False,
+                "stdout": "",
+                "stderr": "",
+                "returncode": -1,
+                "error": f"Command timed out after {timeout} seconds"
+            }
+        
+        return self._build_execution_result(file_path, result, timeout)
+    
+    def _build_execution_result(
+        self,
+        file_path: str,
+        result: Dict[str, Any],
+        timeout: int
+    ) -> Dict[str, Any]:
+        """Build the debug result dict from a raw execution result"""
         # Parse output for instrumentation data
         trace_data = self._parse_instrumentation_output(result.get("stdout", ""))
         error_data = None
@@ -148,27 +243,94 @@ class RuntimeDebugger:
                 self.instrumentation.restore_file(file_path)
             return {"error": str(e)}
     
+    async def debug_with_instrumentation_async(
+        self,
+        file_path: str,
+        instrument_config: Optional[Dict[str, Any]] = None,
+        arguments: Optional[List[str]] = None,
+        restore_after: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Async variant of debug_with_instrumentation
+        
+        Args:
+            file_path: Path to file
+            instrument_config: Instrumentation configuration
+            arguments: Command line arguments
+            restore_after: Restore original file after execution
+            
+        Returns:
+            Dict with instrumentation results and execution data
+        """
+        inst_config = instrument_config or {
+            "instrument_functions": True,
+            "instrument_variables": True,
+            "instrument_conditions": True
+        }
+        
+        inst_result = self.instrumentation.instrument_file(file_path, **inst_config)
+        
+        if "error" in inst_result:
+            return {"error": inst_result["error"]}
+        
+        try:
+            exec_result = await self.debug_execution_async(file_path, arguments)
+            
+            result = {
+                "instrumentation": inst_result,
+                "execution": exec_result,
+                "runtime_data": self._extract_runtime_data(exec_result.get("execution_trace", []))
+            }
+            
+            if restore_after:
+                restore_result = self.instrumentation.restore_file(file_path)
+                result["restored"] = restore_result.get("success", False)
+            
+            return result
+        
+        except Exception as e:
+            if restore_after:
+                self.instrumentation.restore_file(file_path)
+            return {"error": str(e)}
+    
+    async def debug_many(
+        self,
+        file_paths: List[str],
+        instrument_config: Optional[Dict[str, Any]] = None,
+        arguments: Optional[List[str]] = None,
+        restore_after: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Instrument and execute several files concurrently
+        
+        Args:
+            file_paths: Paths to files to debug
+            instrument_config: Instrumentation configuration
+            arguments: Command line arguments passed to every file
+            restore_after: Restore original files after execution
+            
+        Returns:
+            Dict mapping each file path to its debug_with_instrumentation result
+        """
+        unique_paths = list(dict.fromkeys(file_paths))
+        results = await asyncio.gather(*(
+            self.debug_with_instrumentation_async(
+                path, instrument_config, arguments, restore_after
+            )
+            for path in unique_paths
+        ))
+        return dict(zip(unique_paths, results))
+    
     def _parse_instrumentation_output(self, output: str) -> List[Dict[str, Any]]:
         """Parse instrumentation logs from output"""
-        trace = []
-        lines = output.split('\n')
-        
-        for line in lines:
-            if self.instrumentation_id in line:
-                # Parse instrumentation log
-                # Format: [__debug_instrumentation__] TYPE context
-                match = re.search(rf'\[{self.instrumentation_id}\]\s+(\w+)\s+(.+)', line)
-                if match:
-                    trace_type = match.group(1)
-                    context = match.group(2)
-                    
-                    trace.append({
-                        "type": trace_type.lower(),
-                        "context": context,
-                        "raw": line
-                    })
-        
-        return trace
+        return [
+            {
+                "type": _intern_trace_type(match.group(1).lower()),
+                "context": match.group(2),
+                "raw": match.group(0)
+            }
+            for match in _INST_RE.finditer(output)
+        ]
     
     def _extract_runtime_data(self, trace: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Extract meaningful runtime data from trace"""
@@ -183,25 +345,25 @@ class RuntimeDebugger:
             entry_type = entry.get("type", "")
             context = entry.get("context", "")
             
-            if entry_type == "enter":
+            if entry_type == _ENTER:
                 # Function entry
                 func_name = context.replace("()", "")
                 data["function_calls"].append({
                     "function": func_name,
-                    "action": "enter"
+                    "action": _ENTER
                 })
                 data["execution_flow"].append(f"Enter {func_name}()")
             
-            elif entry_type == "exit":
+            elif entry_type == _EXIT:
                 # Function exit
                 func_name = context.replace("()", "")
                 data["function_calls"].append({
                     "function": func_name,
-                    "action": "exit"
+                    "action": _EXIT
                 })
                 data["execution_flow"].append(f"Exit {func_name}()")
             
-            elif entry_type == "var":
+            elif entry_type == _VAR:
                 # Variable assignment
                 # Format: VAR name = {value}
                 var_match = re.search(r'VAR\s+(\w+)\s*=\s*(.+)', context)
@@ -211,7 +373,7 @@ class RuntimeDebugger:
                     data["variable_states"][var_name] = var_value
                     data["execution_flow"].append(f"Set {var_name} = {var_value}")
             
-            elif entry_type == "cond":
+            elif entry_type == _COND:
                 # Condition check
                 data["condition_results"].append({
                     "condition": context,
@@ -253,9 +415,10 @@ class RuntimeDebugger:
         exited_functions = set()
         
         for call in function_calls:
-            if call.get("action") == "enter":
+            action = call.get("action")
+            if action == _ENTER:
                 entered_functions.add(call.get("function"))
-            elif call.get("action") == "exit":
+            elif action == _EXIT:
                 exited_functions.add(call.get("function"))
         
         never_exited = entered_functions - exited_functions
@@ -4,18 +4,27 @@ Input validation, sanitization, and security helpers
 """
 import os
 import re
+import secrets
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List
 from urllib.parse import quote, unquote
 
 
+@lru_cache(maxsize=32)
+def _resolve_root(workspace_root: str) -> Path:
+    """Resolve an absolute workspace root once (resolve() hits the filesystem)"""
+    return Path(workspace_root).resolve()
+
+
 def sanitize_file_path(file_path: str, workspace_root: str = ".") -> str:
     """
     Sanitize file path to prevent directory traversal attacks
     Returns: Sanitized absolute path within workspace
     Raises: ValueError if path is outside workspace
     """
-    workspace_root = Path(workspace_root).resolve()
+    # Key the cache on the absolute path so a relative root still follows cwd
+    workspace_root = _resolve_root(os.path.abspath(workspace_root))
     file_path = Path(file_path).resolve()
     
     # Check if path is within workspace
@@ -117,7 +126,6 @@ def escape_html(text: str) -> str:
 
 def generate_secure_token(length: int = 32) -> str:
     """Generate a secure random token"""
-    import secrets
     return secrets.token_urlsafe(length)
 
 
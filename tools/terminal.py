@@ -1,19 +1,34 @@
 """
 Terminal operations module - executes shell commands
 """
+import codecs
 import subprocess
 import os
+import signal
 import sys
-from typing import Optional, Dict
+import threading
+from typing import Optional, Dict, Generator
 from config import Config
 
 
+def _kill_process_tree(process: subprocess.Popen):
+    """Kill a shell=True command and whatever it spawned (its children keep the output pipe open)"""
+    if sys.platform == "win32":
+        process.kill()
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        process.kill()
+
+
 class Terminal:
     """Handles terminal command execution"""
     
     def __init__(self, workspace_path: str = "."):
         self.workspace_path = os.path.abspath(workspace_path)
         self.shell = Config.DEFAULT_SHELL
+        self._process: Optional[subprocess.Popen] = None  # Command running under stream()
     
     def execute(self, command: str, is_background: bool = False) -> dict:
         """
@@ -27,64 +42,61 @@ class Terminal:
             dict with 'success', 'stdout', 'stderr', 'returncode', 'error' keys
         """
         try:
-            # Change to workspace directory
-            original_cwd = os.getcwd()
-            os.chdir(self.workspace_path)
-            
-            try:
-                if is_background:
-                    # Run in background (non-blocking)
-                    if sys.platform == "win32":
-                        # Windows background execution
-                        process = subprocess.Popen(
-                            command,
-                            shell=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                            creationflags=subprocess.CREATE_NEW_CONSOLE
-                        )
-                    else:
-                        # Unix background execution
-                        process = subprocess.Popen(
-                            command,
-                            shell=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                            start_new_session=True
-                        )
-                    
-                    return {
-                        "success": True,
-                        "stdout": "",
-                        "stderr": "",
-                        "returncode": 0,
-                        "pid": process.pid,
-                        "error": None,
-                        "background": True
-                    }
+            # Commands run in the workspace via cwd= (not os.chdir, which would move
+            # every thread in the process)
+            if is_background:
+                # Run in background (non-blocking)
+                if sys.platform == "win32":
+                    # Windows background execution
+                    process = subprocess.Popen(
+                        command,
+                        shell=True,
+                        cwd=self.workspace_path,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        text=True,
+                        creationflags=subprocess.CREATE_NEW_CONSOLE
+                    )
                 else:
-                    # Run in foreground (blocking)
-                    result = subprocess.run(
+                    # Unix background execution
+                    process = subprocess.Popen(
                         command,
                         shell=True,
-                        capture_output=True,
+                        cwd=self.workspace_path,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
                         text=True,
-                        timeout=300  # 5 minute timeout
+                        start_new_session=True
                     )
-                    
-                    return {
-                        "success": result.returncode == 0,
-                        "stdout": result.stdout,
-                        "stderr": result.stderr,
-                        "returncode": result.returncode,
-                        "error": None,
-                        "background": False
-                    }
-            
-            finally:
-                os.chdir(original_cwd)
+                
+                return {
+                    "success": True,
+                    "stdout": "",
+                    "stderr": "",
+                    "returncode": 0,
+                    "pid": process.pid,
+                    "error": None,
+                    "background": True
+                }
+            else:
+                # Run in foreground (blocking)
+                result = subprocess.run(
+                    command,
+                    shell=True,
+                    cwd=self.workspace_path,
+                    capture_output=True,
+                    text=True,
+                    timeout=300  # 5 minute timeout
+                )
+                
+                return {
+                    "success": result.returncode == 0,
+                    "stdout": result.stdout,
+                    "stderr": result.stderr,
+                    "returncode": result.returncode,
+                    "error": None,
+                    "background": False
+                }
         
         except subprocess.TimeoutExpired:
             return {
@@ -102,4 +114,74 @@ class Terminal:
                 "returncode": -1,
                 "error": str(e)
             }
-
+    
+    def stream(self, command: str, timeout: int = 300) -> Generator[str, None, int]:
+        """
+        Execute a command, yielding its output as it is produced.
+        
+        stdout and stderr are merged in the order the command writes them.
+        
+        Args:
+            command: Command to execute
+            timeout: Seconds before the command is killed
+            
+        Returns:
+            The exit code (generator return value); -1 if the command timed out
+        """
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            cwd=self.workspace_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            # Own process group, so a kill reaches the commands the shell started
+            start_new_session=sys.platform != "win32"
+        )
+        self._process = process
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            _kill_process_tree(process)
+        
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        
+        try:
+            while True:
+                # read1 returns as soon as any output is available
+                data = process.stdout.read1(4096)
+                if not data:
+                    break
+                text = decoder.decode(data)
+                if text:
+                    yield text
+            
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield text
+            returncode = process.wait()
+            if timed_out.is_set():
+                yield f"\nCommand timed out after {timeout} seconds\n"
+                return -1
+            return returncode
+        finally:
+            timer.cancel()
+            self._process = None
+            if process.poll() is None:
+                # Closed early (e.g. the client went away)
+                _kill_process_tree(process)
+                process.wait()
+            process.stdout.close()
+    
+    def kill(self):
+        """
+        Kill the command running under stream(), if any.
+        
+        Safe to call from another thread: a stream() blocked waiting for output
+        then sees EOF and finishes.
+        """
+        process = self._process
+        if process is not None and process.poll() is None:
+            _kill_process_tree(process)
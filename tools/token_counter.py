@@ -2,8 +2,121 @@
 Token Counter Utility
 Counts tokens for multiple LLM models using tiktoken
 """
+import threading
 import tiktoken
-from typing import List, Dict, Optional
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+DEFAULT_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    """Load an encoding once per process; all TokenCounter instances share it"""
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception:
+        if encoding_name == DEFAULT_ENCODING:
+            raise
+        # Fallback to cl100k_base
+        return _get_encoding(DEFAULT_ENCODING)
+
+
+# Known model -> its Encoding, resolved on first use so importing never waits on
+# a tiktoken vocab download
+_model_encodings: Dict[str, tiktoken.Encoding] = {}
+
+# encode_ordinary_batch spins up a thread pool per call; below this many texts a
+# plain loop is cheaper than the pool setup.
+_BATCH_THRESHOLD = 8
+
+
+# Repeated prompts (system prompt, prior turns) are counted over and over, so
+# memoize counts by content hash. Short strings are cheaper to encode than hash.
+_COUNT_CACHE_MAX_SIZE = 4096
+_COUNT_CACHE_MIN_LENGTH = 64
+_count_cache: "OrderedDict[Tuple[str, int, int], int]" = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def _text_hash(text: str) -> int:
+    """Fast content hash for the token count cache"""
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(text)
+    return hash(text)
+
+
+def _cached_token_count(encoding: tiktoken.Encoding, text: str) -> int:
+    """Token count for text, served from the LRU cache when seen before"""
+    if len(text) <= _COUNT_CACHE_MIN_LENGTH:
+        return len(encoding.encode_ordinary(text))
+    
+    # len(text) guards against hash collisions
+    key = (encoding.name, _text_hash(text), len(text))
+    with _count_cache_lock:
+        count = _count_cache.get(key)
+        if count is not None:
+            _count_cache.move_to_end(key)
+            return count
+    
+    count = len(encoding.encode_ordinary(text))
+    with _count_cache_lock:
+        _count_cache[key] = count
+        if len(_count_cache) > _COUNT_CACHE_MAX_SIZE:
+            _count_cache.popitem(last=False)
+    return count
+
+
+def _token_lengths(encoding: tiktoken.Encoding, texts: List[str]) -> List[int]:
+    """Token count for each text, using the count cache and batching the misses"""
+    lengths: List[Optional[int]] = [None] * len(texts)
+    # Hash outside the lock; only the cache itself needs it
+    keys: Dict[int, Tuple[str, int, int]] = {
+        i: (encoding.name, _text_hash(text), len(text))
+        for i, text in enumerate(texts)
+        if len(text) > _COUNT_CACHE_MIN_LENGTH
+    }
+    
+    with _count_cache_lock:
+        for i, key in list(keys.items()):
+            count = _count_cache.get(key)
+            if count is not None:
+                _count_cache.move_to_end(key)
+                lengths[i] = count
+                del keys[i]
+    
+    misses = [i for i, length in enumerate(lengths) if length is None]
+    miss_texts = [texts[i] for i in misses]
+    if len(miss_texts) < _BATCH_THRESHOLD:
+        counts = [len(encoding.encode_ordinary(text)) for text in miss_texts]
+    else:
+        counts = [len(tokens) for tokens in encoding.encode_ordinary_batch(miss_texts)]
+    
+    with _count_cache_lock:
+        for i, count in zip(misses, counts):
+            lengths[i] = count
+            if i in keys:
+                _count_cache[keys[i]] = count
+        while len(_count_cache) > _COUNT_CACHE_MAX_SIZE:
+            _count_cache.popitem(last=False)
+    
+    return lengths
+
+
+@lru_cache(maxsize=8)
+def _role_token_counts(encoding_name: str) -> Dict[str, int]:
+    """Token counts for the standard chat roles, computed once per encoding"""
+    encoding = _get_encoding(encoding_name)
+    return {
+        role: len(encoding.encode_ordinary(role))
+        for role in ("system", "user", "assistant", "tool", "function", "")
+    }
 
 
 class TokenCounter:
@@ -20,61 +133,60 @@ class TokenCounter:
         "claude-3-sonnet": "cl100k_base",
     }
     
-    def __init__(self):
-        self._encodings = {}
-    
     def _get_encoding(self, model: str) -> tiktoken.Encoding:
-        """Get or create encoding for model"""
-        encoding_name = self.ENCODING_MAP.get(model, "cl100k_base")
-        
-        if encoding_name not in self._encodings:
-            try:
-                self._encodings[encoding_name] = tiktoken.get_encoding(encoding_name)
-            except Exception:
-                # Fallback to cl100k_base
-                self._encodings[encoding_name] = tiktoken.get_encoding("cl100k_base")
-        
-        return self._encodings[encoding_name]
+        """Get the shared encoding for model"""
+        encoding = _model_encodings.get(model)
+        if encoding is None:
+            encoding = _get_encoding(self.ENCODING_MAP.get(model, DEFAULT_ENCODING))
+            if model in self.ENCODING_MAP:
+                _model_encodings[model] = encoding
+        return encoding
     
     def count_tokens(self, text: str, model: str = "gpt-3.5-turbo") -> int:
         """Count tokens in text for given model"""
         encoding = self._get_encoding(model)
-        return len(encoding.encode(text))
+        return _cached_token_count(encoding, text)
     
-    def count_messages(self, messages: List[Dict[str, str]], model: str = "gpt-3.5-turbo") -> int:
-        """Count total tokens in message list"""
+    def _tokenize_messages(
+        self,
+        messages: List[Dict[str, str]],
+        model: str
+    ) -> Tuple[Dict[str, int], int]:
+        """
+        Tokenize a message list in a single pass
+        
+        Returns:
+            (per-role content tokens including message overhead, total role-name tokens)
+        """
         encoding = self._get_encoding(model)
-        total = 0
+        role_tokens = _role_token_counts(encoding.name)
+        content_lengths = _token_lengths(
+            encoding, [msg.get("content", "") for msg in messages]
+        )
         
-        for msg in messages:
-            # Count role
-            total += len(encoding.encode(msg.get("role", "")))
-            # Count content
-            total += len(encoding.encode(msg.get("content", "")))
-            # Add overhead for message structure (approximately 4 tokens per message)
-            total += 4
+        breakdown: Dict[str, int] = defaultdict(int)
+        role_total = 0
         
-        return total
+        for msg, content_tokens in zip(messages, content_lengths):
+            role = msg.get("role", "")
+            count = role_tokens.get(role)
+            role_total += count if count is not None else len(encoding.encode_ordinary(role))
+            # +4 for message overhead
+            breakdown[role] += content_tokens + 4
+        
+        return breakdown, role_total
+    
+    def count_messages(self, messages: List[Dict[str, str]], model: str = "gpt-3.5-turbo") -> int:
+        """Count total tokens in message list"""
+        breakdown, role_total = self._tokenize_messages(messages, model)
+        return sum(breakdown.values()) + role_total
     
     def estimate_context_size(self, messages: List[Dict[str, str]], model: str = "gpt-3.5-turbo") -> Dict[str, int]:
         """Estimate context size breakdown"""
-        encoding = self._get_encoding(model)
-        
-        system_tokens = 0
-        user_tokens = 0
-        assistant_tokens = 0
-        
-        for msg in messages:
-            role = msg.get("role", "")
-            content = msg.get("content", "")
-            tokens = len(encoding.encode(content)) + 4  # +4 for message overhead
-            
-            if role == "system":
-                system_tokens += tokens
-            elif role == "user":
-                user_tokens += tokens
-            elif role == "assistant":
-                assistant_tokens += tokens
+        breakdown, _ = self._tokenize_messages(messages, model)
+        system_tokens = breakdown["system"]
+        user_tokens = breakdown["user"]
+        assistant_tokens = breakdown["assistant"]
         
         return {
             "total": system_tokens + user_tokens + assistant_tokens,
@@ -83,8 +195,3 @@ class TokenCounter:
             "assistant": assistant_tokens
         }
 
-
-
-
-
-
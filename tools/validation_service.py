@@ -2,33 +2,236 @@
 Validation Service
 Pre-apply validation to catch syntax errors, type errors, and linting issues
 """
-import ast
+import asyncio
+import atexit
+import hashlib
+import re
+import shutil
 import subprocess
 import tempfile
+import threading
 import os
+import warnings
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, NamedTuple
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from enum import Enum
 
+try:
+    import orjson as _json  # Much faster parsing of large linter JSON reports
+except ImportError:
+    import json as _json
 
-class ValidationSeverity(Enum):
-    """Severity levels for validation issues"""
+try:
+    from mypy import api as mypy_api
+except ImportError:
+    mypy_api = None
+
+# mypy.api.run shares process-global state, so only one in-process run at a time
+_mypy_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _tool_path(cmd: str) -> Optional[str]:
+    """Resolve a tool's executable on PATH once per process (None if not installed)"""
+    return shutil.which(cmd)
+
+
+# Checker daemons shared by every ValidationService in the process. They start
+# on first use and one atexit hook stops the ones this process started
+_daemon_lock = threading.Lock()
+# (workspace, mypy args) -> (status file, background 'dmypy start' process)
+_dmypy_daemons: Dict[Tuple[str, Tuple[str, ...]], Tuple[str, subprocess.Popen]] = {}
+_eslint_d_checked = False
+_eslint_d_owned = False  # Started by this process (an already running eslint_d is left alone)
+_daemon_atexit_registered = False
+
+
+def _register_daemon_cleanup():
+    """Register _stop_daemons once (caller holds _daemon_lock)"""
+    global _daemon_atexit_registered
+    if not _daemon_atexit_registered:
+        atexit.register(_stop_daemons)
+        _daemon_atexit_registered = True
+
+
+def _ensure_dmypy(workspace_path: Path, mypy_args: List[str]) -> Optional[Tuple[str, subprocess.Popen]]:
+    """
+    Start a dmypy daemon for this workspace and flag set if none is up yet.
+    
+    Returns:
+        (status file, start process), or None if dmypy isn't available
+    """
+    dmypy_path = _tool_path('dmypy')
+    if dmypy_path is None:
+        return None
+    key = (str(workspace_path), tuple(mypy_args))
+    with _daemon_lock:
+        if key not in _dmypy_daemons:
+            status_file = os.path.join(tempfile.mkdtemp(prefix="dmypy_"), 'dmypy.json')
+            try:
+                start = subprocess.Popen(
+                    [dmypy_path, '--status-file', status_file, 'start', '--', *mypy_args],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    cwd=str(workspace_path)
+                )
+            except OSError:
+                shutil.rmtree(os.path.dirname(status_file), True)
+                return None
+            _dmypy_daemons[key] = (status_file, start)
+            _register_daemon_cleanup()
+        return _dmypy_daemons[key]
+
+
+def _ensure_eslint_d(cwd: str):
+    """Start eslint_d unless it is already running (first call per process only)"""
+    global _eslint_d_checked, _eslint_d_owned
+    with _daemon_lock:
+        if _eslint_d_checked:
+            return
+        _eslint_d_checked = True
+        eslint_d_path = _tool_path('eslint_d')
+        try:
+            status = subprocess.run(
+                [eslint_d_path, 'status'], capture_output=True, text=True, timeout=10, cwd=cwd
+            )
+            if 'not running' not in status.stdout.lower():
+                return  # Someone else's daemon (another process, an editor): don't own it
+            subprocess.run(
+                [eslint_d_path, 'start'], capture_output=True, timeout=30, cwd=cwd
+            )
+            _eslint_d_owned = True
+            _register_daemon_cleanup()
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+
+def _stop_daemons():
+    """Stop the checker daemons this process started (atexit)"""
+    global _eslint_d_owned
+    with _daemon_lock:
+        dmypy_path = _tool_path('dmypy')
+        for (workspace, _), (status_file, start) in _dmypy_daemons.items():
+            try:
+                start.wait(timeout=10)
+                subprocess.run(
+                    [dmypy_path, '--status-file', status_file, 'stop'],
+                    capture_output=True,
+                    timeout=10,
+                    cwd=workspace
+                )
+            except Exception:
+                pass
+            shutil.rmtree(os.path.dirname(status_file), True)
+        _dmypy_daemons.clear()
+        
+        if _eslint_d_owned:
+            try:
+                subprocess.run([_tool_path('eslint_d'), 'stop'], capture_output=True, timeout=10)
+            except Exception:
+                pass
+            _eslint_d_owned = False
+
+
+# Config files mypy discovers from its working directory, in mypy's lookup order
+MYPY_CONFIG_FILES = ('mypy.ini', '.mypy.ini', 'pyproject.toml', 'setup.cfg')
+
+# Linter/type-checker output formats, each matched once over the whole output.
+# Paths are matched lazily so Windows drive letters ("C:\\...") don't break parsing.
+# mypy: path:line[:col]: error: message
+MYPY_ERROR_RE = re.compile(r'^(.+?):(\d+):(?:(\d+):)?\s*error:(.*)$', re.MULTILINE)
+# tsc: path(line,col): error TSxxxx: message
+TSC_ERROR_RE = re.compile(r'^(.+?)\((\d+),(\d+)\):\s*(error TS\d+:.*)$', re.MULTILINE)
+# flake8 --format=default: path:line:col: CODE message
+FLAKE8_LINE_RE = re.compile(r'^(.+?):(\d+):(\d+):\s*(\S+)[ \t]*(.*)$', re.MULTILINE)
+# eslint --format=unix: path:line:col: message
+ESLINT_LINE_RE = re.compile(r'^(.+?):(\d+):(?:(\d+):)?(.*)$', re.MULTILINE)
+
+# Agents re-validate unchanged content often, so memoize syntax check results
+# by content digest: None for valid code, else (line, column, message).
+_SYNTAX_CACHE_MAX_SIZE = 256
+_syntax_cache: "OrderedDict[bytes, Optional[Tuple[int, int, str]]]" = OrderedDict()
+_syntax_cache_lock = threading.Lock()
+
+
+def _python_syntax_error(content: str) -> Optional[Tuple[int, int, str]]:
+    """Compile Python source and return its syntax error, if any"""
+    key = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    with _syntax_cache_lock:
+        if key in _syntax_cache:
+            _syntax_cache.move_to_end(key)
+            return _syntax_cache[key]
+    
+    try:
+        # compile() also reports compile-time errors ast.parse misses
+        # ('return' outside function, etc.) without building Python AST objects.
+        # SyntaxWarnings in user code (invalid escapes, 'is' with a literal) would
+        # otherwise land on the server's stderr on every validation
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            compile(content, '<string>', 'exec', dont_inherit=True, optimize=-1)
+        error = None
+    except SyntaxError as e:
+        error = (e.lineno or 0, e.offset or 0, f"Syntax error: {e.msg}")
+    except Exception as e:
+        # Other parsing errors (e.g. null bytes), assume invalid
+        error = (0, 0, f"Syntax error: {e}")
+    
+    with _syntax_cache_lock:
+        _syntax_cache[key] = error
+        if len(_syntax_cache) > _SYNTAX_CACHE_MAX_SIZE:
+            _syntax_cache.popitem(last=False)
+    return error
+
+
+class ValidationSeverity(str, Enum):
+    """Severity levels for validation issues (str subclass, so it serializes as its value)"""
     ERROR = "error"
     WARNING = "warning"
     INFO = "info"
 
 
-@dataclass
 class ValidationIssue:
     """A single validation issue"""
-    severity: ValidationSeverity
-    file_path: str
-    line_number: int
-    column: Optional[int]
-    message: str
-    rule: Optional[str] = None  # Linter rule name
-    fix_suggestion: Optional[str] = None
+    # Linters can report thousands of issues per run: slots drop the per-instance
+    # __dict__ (dataclass(slots=True) needs Python 3.10)
+    __slots__ = ('severity', 'file_path', 'line_number', 'column', 'message', 'rule', 'fix_suggestion')
+    
+    def __init__(
+        self,
+        severity: ValidationSeverity,
+        file_path: str,
+        line_number: int,
+        column: Optional[int],
+        message: str,
+        rule: Optional[str] = None,  # Linter rule name
+        fix_suggestion: Optional[str] = None
+    ):
+        self.severity = severity
+        self.file_path = file_path
+        self.line_number = line_number
+        self.column = column
+        self.message = message
+        self.rule = rule
+        self.fix_suggestion = fix_suggestion
+    
+    def _astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+    
+    __hash__ = None  # mutable, like the dataclass it replaces
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
 
 
 @dataclass
@@ -42,12 +245,46 @@ class ValidationResult:
     linter_passed: Optional[bool] = None  # None if linter not available
 
 
+# Per-file results of one tool run, keyed by temp file path:
+# (passed, issues) where passed is None if the tool is not available
+ToolResults = Dict[str, Tuple[Optional[bool], List[ValidationIssue]]]
+
+
+class ToolRun(NamedTuple):
+    """How to run one tool over a set of files, shared by the sync and async paths"""
+    args: Optional[List[str]]  # Command line (unused when in_process is set)
+    parse: Callable[[int, str], ToolResults]  # (exit code, stdout) -> per-file results
+    stdin: Optional[str] = None
+    timeout: int = 10
+    prepare: Optional[Callable[[], Any]] = None  # Blocking setup to run first
+    in_process: Optional[Callable[[], Tuple[int, str]]] = None  # Returns (exit code, stdout)
+
+
 class ValidationService:
     """Service for validating code before applying changes"""
     
+    # Shared across instances so validations don't churn threads; type checker
+    # and linter subprocesses are I/O-bound and independent, so run them in parallel
+    _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="validation")
+    
+    # File extension -> tool (see _tool_run); each tool runs once per batch over all its files
+    _TYPE_CHECKERS = {
+        '.py': 'python_types',
+        '.ts': 'typescript_types',
+        '.tsx': 'typescript_types',
+    }
+    _LINTERS = {
+        '.py': 'python_lint',
+        '.js': 'javascript_lint',
+        '.jsx': 'javascript_lint',
+        '.ts': 'javascript_lint',
+        '.tsx': 'javascript_lint',
+    }
+    
     def __init__(self, workspace_path: str = "."):
         self.workspace_path = Path(workspace_path).resolve()
         self.temp_dir = None
+        self._mypy_args: Optional[List[str]] = None
     
     def validate_file(self, file_path: str, content: str) -> ValidationResult:
         """
@@ -60,46 +297,251 @@ class ValidationService:
         Returns:
             ValidationResult with all issues found
         """
-        full_path = self.workspace_path / file_path
-        file_ext = full_path.suffix.lower()
+        return self.validate_files_batch({file_path: content})[0]
+    
+    def validate_files_batch(self, files: Dict[str, str]) -> List[ValidationResult]:
+        """
+        Validate several files, running each type checker and linter once
+        over all the files it applies to.
+        
+        Args:
+            files: Mapping of file path (relative to workspace) to content
+            
+        Returns:
+            ValidationResult per file, in the order given
+        """
+        syntax_results = self._check_syntax(files)
+        temp_paths: Dict[str, str] = {}
+        tool_results: Dict[str, ToolResults] = {}
+        try:
+            tool_targets, stdin_content = self._plan_tools(files, syntax_results, temp_paths)
+            
+            # Type checking and linting (if available) run concurrently
+            futures = {
+                tool: self._executor.submit(self._run_tool, tool, targets, stdin_content.get(tool))
+                for tool, targets in tool_targets.items()
+            }
+            for tool, future in futures.items():
+                tool_results[tool] = future.result()
+        finally:
+            self._remove_temps(temp_paths)
         
-        issues = []
+        return self._collect_results(syntax_results, temp_paths, tool_results)
+    
+    async def validate_file_async(self, file_path: str, content: str) -> ValidationResult:
+        """
+        Validate a file's content without blocking the event loop.
         
-        # Syntax validation
-        syntax_valid = self._validate_syntax(content, file_ext)
-        if not syntax_valid:
-            syntax_issues = self._get_syntax_errors(content, file_ext)
-            issues.extend(syntax_issues)
+        Args:
+            file_path: Path to the file (relative to workspace)
+            content: File content to validate
+            
+        Returns:
+            ValidationResult with all issues found
+        """
+        return (await self.validate_files_batch_async({file_path: content}))[0]
+    
+    async def validate_files_batch_async(self, files: Dict[str, str]) -> List[ValidationResult]:
+        """
+        Async validate_files_batch: tools run as asyncio subprocesses, so a
+        validation doesn't hold a worker thread while they run.
         
-        # Type checking (if available)
-        type_check_passed = None
-        if file_ext == '.py':
-            type_check_passed, type_issues = self._validate_types_python(full_path, content)
-            issues.extend(type_issues)
-        elif file_ext in ['.ts', '.tsx']:
-            type_check_passed, type_issues = self._validate_types_typescript(full_path, content)
-            issues.extend(type_issues)
+        Args:
+            files: Mapping of file path (relative to workspace) to content
+            
+        Returns:
+            ValidationResult per file, in the order given
+        """
+        syntax_results = self._check_syntax(files)
+        temp_paths: Dict[str, str] = {}
+        try:
+            tool_targets, stdin_content = self._plan_tools(files, syntax_results, temp_paths)
+            
+            # Type checking and linting (if available) run concurrently
+            tools = list(tool_targets)
+            outputs = await asyncio.gather(*(
+                self._run_tool_async(tool, tool_targets[tool], stdin_content.get(tool))
+                for tool in tools
+            ))
+            tool_results = dict(zip(tools, outputs))
+        finally:
+            self._remove_temps(temp_paths)
         
-        # Linter validation (if available)
-        linter_passed = None
-        if file_ext == '.py':
-            linter_passed, linter_issues = self._lint_python(full_path, content)
-            issues.extend(linter_issues)
-        elif file_ext in ['.js', '.jsx', '.ts', '.tsx']:
-            linter_passed, linter_issues = self._lint_javascript(full_path, content)
+        return self._collect_results(syntax_results, temp_paths, tool_results)
+    
+    def _check_syntax(self, files: Dict[str, str]) -> Dict[str, Tuple[bool, List[ValidationIssue]]]:
+        """Syntax validation for each file"""
+        return {
+            file_path: self._validate_syntax(content, Path(file_path).suffix.lower())
+            for file_path, content in files.items()
+        }
+    
+    def _plan_tools(
+        self,
+        files: Dict[str, str],
+        syntax_results: Dict[str, Tuple[bool, List[ValidationIssue]]],
+        temp_paths: Dict[str, str]
+    ) -> Tuple[Dict[str, Dict[str, Path]], Dict[str, str]]:
+        """
+        Decide which tools check which files, writing temp files where needed
+        
+        Args:
+            files: Mapping of file path to content
+            syntax_results: Result of _check_syntax for files
+            temp_paths: Filled with file path -> temp file written for it
+            
+        Returns:
+            (tool -> {key: real path}, tool -> content piped over stdin), key
+            being the temp path, or the real path itself when the single file
+            for that tool is piped over stdin
+        """
+        checks: Dict[str, Tuple[Path, List[str]]] = {}
+        tool_counts: Dict[str, int] = defaultdict(int)
+        tool_targets: Dict[str, Dict[str, Path]] = defaultdict(dict)
+        stdin_content: Dict[str, str] = {}
+        
+        for file_path, (syntax_valid, _) in syntax_results.items():
+            # Skip type checking and linting when the file doesn't parse -
+            # they would only add noise
+            if not syntax_valid:
+                continue
+            full_path = self.workspace_path / file_path
+            file_ext = full_path.suffix.lower()
+            tools = [
+                tool for tool in (self._TYPE_CHECKERS.get(file_ext), self._LINTERS.get(file_ext))
+                if tool
+            ]
+            if tools:
+                checks[file_path] = (full_path, tools)
+                for tool in tools:
+                    tool_counts[tool] += 1
+        
+        for file_path, (full_path, tools) in checks.items():
+            # A tool checking just one file reads it from stdin; otherwise write
+            # the content once and share the temp file between tools
+            content = files[file_path]
+            temp_path = None
+            for tool in tools:
+                if tool_counts[tool] == 1 and self._supports_stdin(tool):
+                    tool_targets[tool][str(full_path)] = full_path
+                    stdin_content[tool] = content
+                    continue
+                if temp_path is None:
+                    temp_path = self._write_temp(content, full_path.suffix.lower())
+                    temp_paths[file_path] = temp_path
+                tool_targets[tool][temp_path] = full_path
+        
+        return tool_targets, stdin_content
+    
+    def _remove_temps(self, temp_paths: Dict[str, str]):
+        """Clean up temp files"""
+        for temp_path in temp_paths.values():
+            try:
+                os.unlink(temp_path)
+            except Exception:
+                pass
+    
+    def _collect_results(
+        self,
+        syntax_results: Dict[str, Tuple[bool, List[ValidationIssue]]],
+        temp_paths: Dict[str, str],
+        tool_results: Dict[str, ToolResults]
+    ) -> List[ValidationResult]:
+        """Assemble each file's ValidationResult from the syntax check and tool runs"""
+        results = []
+        for file_path, (syntax_valid, syntax_issues) in syntax_results.items():
+            issues = list(syntax_issues)
+            full_path = self.workspace_path / file_path
+            file_ext = full_path.suffix.lower()
+            keys = (temp_paths.get(file_path), str(full_path))
+            
+            # Type issues always precede linter issues
+            type_check_passed, type_issues = self._file_result(
+                tool_results.get(self._TYPE_CHECKERS.get(file_ext), {}), keys
+            )
+            issues.extend(type_issues)
+            linter_passed, linter_issues = self._file_result(
+                tool_results.get(self._LINTERS.get(file_ext), {}), keys
+            )
             issues.extend(linter_issues)
+            
+            # Determine overall validity (no errors)
+            valid = syntax_valid and not any(issue.severity is ValidationSeverity.ERROR for issue in issues)
+            
+            results.append(ValidationResult(
+                file_path=file_path,
+                valid=valid,
+                issues=issues,
+                syntax_valid=syntax_valid,
+                type_check_passed=type_check_passed,
+                linter_passed=linter_passed
+            ))
         
-        # Determine overall validity (no errors)
-        valid = syntax_valid and all(issue.severity == ValidationSeverity.ERROR for issue in issues) == False
+        return results
+    
+    def _get_temp_dir(self) -> str:
+        """This service's temp directory, created on first use and removed at exit"""
+        if self.temp_dir is None:
+            self.temp_dir = tempfile.mkdtemp(prefix="validation_")
+            atexit.register(shutil.rmtree, self.temp_dir, True)
+        return self.temp_dir
+    
+    def _write_temp(self, content: str, suffix: str) -> str:
+        """Write content to a uniquely named file in this service's temp directory"""
+        with tempfile.NamedTemporaryFile(
+            mode='w', suffix=suffix, dir=self._get_temp_dir(), delete=False
+        ) as f:
+            f.write(content)
+            return f.name
+    
+    def _supports_stdin(self, tool: str) -> bool:
+        """Whether the program behind a tool can read the file from stdin"""
+        if tool == 'python_types':
+            # mypy takes the program via -c; pyright and dmypy need a real file
+            return _tool_path('pyright') is None and _tool_path('dmypy') is None
+        # ruff, flake8 and eslint all accept stdin; tsc needs a real file
+        return tool in ('python_lint', 'javascript_lint')
+    
+    def _file_result(
+        self,
+        results: ToolResults,
+        keys: Tuple[Optional[str], str]
+    ) -> Tuple[Optional[bool], List[ValidationIssue]]:
+        """Find one file's entry in a tool's results (by temp path or real path)"""
+        for key in keys:
+            if key in results:
+                return results[key]
+        return None, []
+    
+    def _tool_results(
+        self,
+        targets: Dict[str, Path],
+        returncode: int,
+        issues_by_name: Dict[str, List[ValidationIssue]]
+    ) -> ToolResults:
+        """
+        Split one tool run's issues back out per file
         
-        return ValidationResult(
-            file_path=file_path,
-            valid=valid,
-            issues=issues,
-            syntax_valid=syntax_valid,
-            type_check_passed=type_check_passed,
-            linter_passed=linter_passed
-        )
+        Args:
+            targets: Temp file path -> real file path for every file the tool checked
+            returncode: Tool exit code
+            issues_by_name: Parsed issues keyed by temp file name
+        """
+        found_issues = any(issues_by_name.values())
+        results = {}
+        for temp_path in targets:
+            file_issues = issues_by_name.get(os.path.basename(temp_path), [])
+            # A non-zero exit with no parsable issues is a tool failure: fail every file
+            passed = returncode == 0 or (found_issues and not file_issues)
+            results[temp_path] = (passed, file_issues)
+        return results
+    
+    def _relative_paths(self, targets: Dict[str, Path]) -> Dict[str, str]:
+        """Temp file name -> workspace-relative path of the file it stands in for"""
+        return {
+            os.path.basename(temp_path): str(full_path.relative_to(self.workspace_path))
+            for temp_path, full_path in targets.items()
+        }
     
     def validate_diff(self, diff_text: str, file_path: str) -> ValidationResult:
         """
@@ -125,325 +567,400 @@ class ValidationService:
         
         return self.validate_file(file_path, original_content)
     
-    def _validate_syntax(self, content: str, file_ext: str) -> bool:
-        """Validate syntax for the given file type"""
+    def _validate_syntax(self, content: str, file_ext: str) -> Tuple[bool, List[ValidationIssue]]:
+        """Validate syntax for the given file type, returning any syntax errors found"""
+        if file_ext == '.py':
+            return self._parse_python(content)
+        
         try:
-            if file_ext == '.py':
-                ast.parse(content)
-                return True
-            elif file_ext in ['.js', '.jsx']:
+            if file_ext in ['.js', '.jsx']:
                 # Try using esprima if available, otherwise skip
                 try:
                     import esprima
                     esprima.parseScript(content)
-                    return True
+                    return True, []
                 except ImportError:
                     # esprima not available, skip syntax check
-                    return True
+                    return True, []
             elif file_ext in ['.ts', '.tsx']:
                 # TypeScript syntax checking requires tsc
-                return True  # Will be checked by type checker
+                return True, []  # Will be checked by type checker
             else:
                 # Unknown file type, assume valid
-                return True
-        except SyntaxError:
-            return False
+                return True, []
         except Exception:
-            # Other parsing errors, assume invalid
-            return False
+            # Parsing errors, assume invalid
+            return False, []
     
-    def _get_syntax_errors(self, content: str, file_ext: str) -> List[ValidationIssue]:
-        """Get detailed syntax error information"""
-        issues = []
+    def _parse_python(self, content: str) -> Tuple[bool, List[ValidationIssue]]:
+        """Check Python syntax once (cached by content hash), capturing error details"""
+        error = _python_syntax_error(content)
+        if error is None:
+            return True, []
         
-        if file_ext == '.py':
-            try:
-                ast.parse(content)
-            except SyntaxError as e:
-                issues.append(ValidationIssue(
-                    severity=ValidationSeverity.ERROR,
-                    file_path="",
-                    line_number=e.lineno or 0,
-                    column=e.offset or 0,
-                    message=f"Syntax error: {e.msg}",
-                    rule="syntax"
-                ))
-        
-        return issues
+        line_number, column, message = error
+        return False, [ValidationIssue(
+            severity=ValidationSeverity.ERROR,
+            file_path="",
+            line_number=line_number,
+            column=column,
+            message=message,
+            rule="syntax"
+        )]
+    
+    def _tool_run(self, tool: str, targets: Dict[str, Path], content: Optional[str]) -> Optional[ToolRun]:
+        """How to run a tool over targets (content: single file via stdin), or None if not installed"""
+        return getattr(self, f'_{tool}_run')(targets, content)
     
-    def _validate_types_python(self, file_path: Path, content: str) -> Tuple[Optional[bool], List[ValidationIssue]]:
-        """Validate Python types using mypy"""
-        issues = []
+    def _run_tool(self, tool: str, targets: Dict[str, Path], content: Optional[str] = None) -> ToolResults:
+        """Run a tool over targets, blocking until it finishes"""
+        run = self._tool_run(tool, targets, content)
+        if run is None:
+            return {temp_path: (None, []) for temp_path in targets}  # tool not available
         
-        # Check if mypy is available
-        try:
+        if run.prepare is not None:
+            run.prepare()
+        if run.in_process is not None:
+            returncode, stdout = run.in_process()
+        else:
             result = subprocess.run(
-                ['mypy', '--version'],
+                run.args,
+                input=run.stdin,
                 capture_output=True,
                 text=True,
-                timeout=5
+                timeout=run.timeout,
+                cwd=str(self.workspace_path)
             )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return None, issues  # mypy not available
+            returncode, stdout = result.returncode, result.stdout
+        return run.parse(returncode, stdout)
+    
+    async def _run_tool_async(self, tool: str, targets: Dict[str, Path], content: Optional[str] = None) -> ToolResults:
+        """Run a tool over targets as an asyncio subprocess, without holding a thread"""
+        # Building the run can stat tool paths and start a dmypy daemon; keep that off the loop
+        run = await asyncio.to_thread(self._tool_run, tool, targets, content)
+        if run is None:
+            return {temp_path: (None, []) for temp_path in targets}  # tool not available
         
-        # Write content to temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(content)
-            temp_path = f.name
+        if run.prepare is not None:
+            await asyncio.to_thread(run.prepare)
+        if run.in_process is not None:
+            returncode, stdout = await asyncio.to_thread(run.in_process)
+            return run.parse(returncode, stdout)
         
+        process = await asyncio.create_subprocess_exec(
+            *run.args,
+            stdin=asyncio.subprocess.PIPE if run.stdin is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=str(self.workspace_path)
+        )
         try:
-            # Run mypy
-            result = subprocess.run(
-                ['mypy', '--no-error-summary', temp_path],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                cwd=str(self.workspace_path)
+            stdout, _ = await asyncio.wait_for(
+                process.communicate(run.stdin.encode() if run.stdin is not None else None),
+                timeout=run.timeout
             )
-            
-            # Parse mypy output
-            if result.returncode != 0:
-                for line in result.stdout.split('\n'):
-                    if ':' in line and 'error:' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 4:
-                            try:
-                                line_num = int(parts[1])
-                                col_num = int(parts[2]) if parts[2].isdigit() else None
-                                msg = ':'.join(parts[3:]).strip()
-                                
-                                issues.append(ValidationIssue(
-                                    severity=ValidationSeverity.ERROR,
-                                    file_path=str(file_path.relative_to(self.workspace_path)),
-                                    line_number=line_num,
-                                    column=col_num,
-                                    message=msg,
-                                    rule="mypy"
-                                ))
-                            except (ValueError, IndexError):
-                                continue
-            
-            passed = result.returncode == 0
-        finally:
-            # Clean up temp file
-            try:
-                os.unlink(temp_path)
-            except Exception:
-                pass
-        
-        return passed, issues
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise subprocess.TimeoutExpired(run.args, run.timeout)
+        return run.parse(process.returncode, stdout.decode('utf-8', 'replace'))
     
-    def _validate_types_typescript(self, file_path: Path, content: str) -> Tuple[Optional[bool], List[ValidationIssue]]:
-        """Validate TypeScript types using tsc"""
-        issues = []
+    def _python_types_run(self, targets: Dict[str, Path], content: Optional[str]) -> Optional[ToolRun]:
+        """Validate Python types using pyright if installed, else mypy"""
+        pyright_path = _tool_path('pyright')
+        if pyright_path is not None:
+            return ToolRun(
+                args=[pyright_path, '--outputjson', *targets],
+                parse=partial(self._parse_pyright, targets)
+            )
         
-        # Check if tsc is available
-        try:
-            result = subprocess.run(
-                ['tsc', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
+        parse = partial(self._parse_mypy, targets, content)
+        # A persistent daemon spares type checks mypy's cold start; it is started
+        # on the first check and shared by every service for this workspace
+        daemon = _ensure_dmypy(self.workspace_path, self._get_mypy_args()) if content is None else None
+        if daemon is not None:
+            status_file, start = daemon
+            return ToolRun(
+                args=[_tool_path('dmypy'), '--status-file', status_file,
+                      'run', '--', *self._get_mypy_args(), *targets],
+                parse=parse,
+                timeout=30,
+                # Wait for the background start so 'run' doesn't race it with a second daemon
+                prepare=partial(start.wait, timeout=30)
             )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return None, issues  # tsc not available
         
-        # Write content to temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.ts', delete=False) as f:
-            f.write(content)
-            temp_path = f.name
+        mypy_targets = list(targets) if content is None else ['-c', content]
+        if mypy_api is not None:
+            return ToolRun(args=None, parse=parse, in_process=partial(self._run_mypy_api, mypy_targets))
         
-        try:
-            # Run tsc --noEmit
-            result = subprocess.run(
-                ['tsc', '--noEmit', temp_path],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                cwd=str(self.workspace_path)
-            )
-            
-            # Parse tsc output
-            if result.returncode != 0:
-                for line in result.stdout.split('\n'):
-                    if 'error TS' in line and ':' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 3:
-                            try:
-                                line_num = int(parts[1])
-                                msg = ':'.join(parts[2:]).strip()
-                                
-                                issues.append(ValidationIssue(
-                                    severity=ValidationSeverity.ERROR,
-                                    file_path=str(file_path.relative_to(self.workspace_path)),
-                                    line_number=line_num,
-                                    column=None,
-                                    message=msg,
-                                    rule="typescript"
-                                ))
-                            except (ValueError, IndexError):
-                                continue
-            
-            passed = result.returncode == 0
-        finally:
-            # Clean up temp file
+        # Fall back to the mypy executable
+        mypy_path = _tool_path('mypy')
+        if mypy_path is None:
+            return None
+        return ToolRun(args=[mypy_path, '--no-error-summary', *mypy_targets], parse=parse)
+    
+    def _get_mypy_args(self) -> List[str]:
+        """mypy flags for this workspace, built once"""
+        if self._mypy_args is None:
+            self._mypy_args = ['--no-error-summary']
+            # The subprocess runs with cwd=workspace; in-process we can't chdir
+            # (other threads), so point mypy at the workspace config explicitly
+            for config_name in MYPY_CONFIG_FILES:
+                config_path = self.workspace_path / config_name
+                if config_path.is_file():
+                    self._mypy_args += ['--config-file', str(config_path)]
+                    break
+        return self._mypy_args
+    
+    def _run_mypy_api(self, mypy_targets: List[str]) -> Tuple[int, str]:
+        """Run mypy in-process, returning (exit code, stdout)"""
+        with _mypy_lock:
+            stdout, _, returncode = mypy_api.run(self._get_mypy_args() + mypy_targets)
+        return returncode, stdout
+    
+    def _parse_mypy(
+        self,
+        targets: Dict[str, Path],
+        content: Optional[str],
+        returncode: int,
+        stdout: str
+    ) -> ToolResults:
+        """Parse mypy output"""
+        issues_by_name: Dict[str, List[ValidationIssue]] = defaultdict(list)
+        if returncode != 0:
+            rel_paths = self._relative_paths(targets)
+            # mypy -c reports the program as "<string>"
+            stdin_name = os.path.basename(next(iter(targets))) if content is not None else None
+            for match in MYPY_ERROR_RE.finditer(stdout):
+                path, line_num, col_num, msg = match.groups()
+                name = stdin_name if path == '<string>' else os.path.basename(path)
+                if name not in rel_paths:
+                    continue
+                issues_by_name[name].append(ValidationIssue(
+                    severity=ValidationSeverity.ERROR,
+                    file_path=rel_paths[name],
+                    line_number=int(line_num),
+                    column=int(col_num) if col_num else None,
+                    message=msg.strip(),
+                    rule="mypy"
+                ))
+        
+        return self._tool_results(targets, returncode, issues_by_name)
+    
+    def _parse_pyright(self, targets: Dict[str, Path], returncode: int, stdout: str) -> ToolResults:
+        """Parse pyright JSON output (ranges are 0-based)"""
+        issues_by_name: Dict[str, List[ValidationIssue]] = defaultdict(list)
+        if returncode != 0:
+            rel_paths = self._relative_paths(targets)
+            severity_map = {
+                'error': ValidationSeverity.ERROR,
+                'warning': ValidationSeverity.WARNING,
+            }
             try:
-                os.unlink(temp_path)
-            except Exception:
-                pass
+                pyright_output = _json.loads(stdout)
+                for diagnostic in pyright_output.get('generalDiagnostics', []):
+                    name = os.path.basename(diagnostic.get('file', ''))
+                    if name not in rel_paths:
+                        continue
+                    start = diagnostic.get('range', {}).get('start', {})
+                    issues_by_name[name].append(ValidationIssue(
+                        severity=severity_map.get(diagnostic.get('severity'), ValidationSeverity.INFO),
+                        file_path=rel_paths[name],
+                        line_number=start.get('line', 0) + 1,
+                        column=start.get('character', 0) + 1,
+                        message=diagnostic.get('message', ''),
+                        rule=diagnostic.get('rule') or "pyright"
+                    ))
+            except (ValueError, AttributeError):
+                issues_by_name.clear()
         
-        return passed, issues
+        return self._tool_results(targets, returncode, issues_by_name)
     
-    def _lint_python(self, file_path: Path, content: str) -> Tuple[Optional[bool], List[ValidationIssue]]:
-        """Lint Python code using flake8"""
-        issues = []
+    def _typescript_types_run(self, targets: Dict[str, Path], content: Optional[str]) -> Optional[ToolRun]:
+        """Validate TypeScript types using tsc --noEmit (needs real files, so content is never set)"""
+        # Check if tsc is available (probe is cached per process)
+        tsc_path = _tool_path('tsc')
+        if tsc_path is None:
+            return None
+        return ToolRun(args=[tsc_path, '--noEmit', *targets], parse=partial(self._parse_tsc, targets))
+    
+    def _parse_tsc(self, targets: Dict[str, Path], returncode: int, stdout: str) -> ToolResults:
+        """Parse tsc output"""
+        issues_by_name: Dict[str, List[ValidationIssue]] = defaultdict(list)
+        if returncode != 0:
+            rel_paths = self._relative_paths(targets)
+            for match in TSC_ERROR_RE.finditer(stdout):
+                path, line_num, col_num, msg = match.groups()
+                name = os.path.basename(path)
+                if name not in rel_paths:
+                    continue
+                issues_by_name[name].append(ValidationIssue(
+                    severity=ValidationSeverity.ERROR,
+                    file_path=rel_paths[name],
+                    line_number=int(line_num),
+                    column=int(col_num),
+                    message=msg.strip(),
+                    rule="typescript"
+                ))
         
-        # Check if flake8 is available
-        try:
-            result = subprocess.run(
-                ['flake8', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
+        return self._tool_results(targets, returncode, issues_by_name)
+    
+    def _python_lint_run(self, targets: Dict[str, Path], content: Optional[str]) -> Optional[ToolRun]:
+        """Lint Python code using ruff if installed, else flake8"""
+        ruff_path = _tool_path('ruff')
+        if ruff_path is not None:
+            if content is None:
+                args = list(targets)
+            else:
+                args = ['--stdin-filename', next(iter(targets)), '-']
+            # Temp file names are unique per call, so ruff's cache would never hit
+            return ToolRun(
+                args=[ruff_path, 'check', '--output-format=json', '--no-cache', *args],
+                parse=partial(self._parse_ruff, targets),
+                stdin=content
             )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return None, issues  # flake8 not available
         
-        # Write content to temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(content)
-            temp_path = f.name
+        # Check if flake8 is available (probe is cached per process)
+        flake8_path = _tool_path('flake8')
+        if flake8_path is None:
+            return None
         
-        try:
-            # Run flake8
-            result = subprocess.run(
-                ['flake8', '--format=default', temp_path],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                cwd=str(self.workspace_path)
-            )
-            
-            # Parse flake8 output
-            if result.returncode != 0:
-                for line in result.stdout.split('\n'):
-                    if ':' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 4:
-                            try:
-                                line_num = int(parts[1])
-                                col_num = int(parts[2]) if parts[2].isdigit() else None
-                                code_and_msg = parts[3].strip().split(' ', 1)
-                                rule = code_and_msg[0] if code_and_msg else None
-                                msg = code_and_msg[1] if len(code_and_msg) > 1 else parts[3].strip()
-                                
-                                # Determine severity based on error code
-                                severity = ValidationSeverity.ERROR
-                                if rule and rule.startswith('W'):
-                                    severity = ValidationSeverity.WARNING
-                                elif rule and rule.startswith('E'):
-                                    severity = ValidationSeverity.ERROR
-                                else:
-                                    severity = ValidationSeverity.WARNING
-                                
-                                issues.append(ValidationIssue(
-                                    severity=severity,
-                                    file_path=str(file_path.relative_to(self.workspace_path)),
-                                    line_number=line_num,
-                                    column=col_num,
-                                    message=msg,
-                                    rule=rule
-                                ))
-                            except (ValueError, IndexError):
-                                continue
-            
-            passed = result.returncode == 0
-        finally:
-            # Clean up temp file
+        if content is None:
+            args = list(targets)
+        else:
+            args = ['--stdin-display-name', next(iter(targets)), '-']
+        return ToolRun(
+            args=[flake8_path, '--format=default', *args],
+            parse=partial(self._parse_flake8, targets),
+            stdin=content
+        )
+    
+    def _parse_flake8(self, targets: Dict[str, Path], returncode: int, stdout: str) -> ToolResults:
+        """Parse flake8 output"""
+        issues_by_name: Dict[str, List[ValidationIssue]] = defaultdict(list)
+        if returncode != 0:
+            rel_paths = self._relative_paths(targets)
+            for match in FLAKE8_LINE_RE.finditer(stdout):
+                path, line_num, col_num, rule, msg = match.groups()
+                name = os.path.basename(path)
+                if name not in rel_paths:
+                    continue
+                
+                # Determine severity based on error code
+                if rule.startswith('E'):
+                    severity = ValidationSeverity.ERROR
+                else:
+                    severity = ValidationSeverity.WARNING
+                
+                issues_by_name[name].append(ValidationIssue(
+                    severity=severity,
+                    file_path=rel_paths[name],
+                    line_number=int(line_num),
+                    column=int(col_num),
+                    message=msg.strip() or rule,
+                    rule=rule
+                ))
+        
+        return self._tool_results(targets, returncode, issues_by_name)
+    
+    def _parse_ruff(self, targets: Dict[str, Path], returncode: int, stdout: str) -> ToolResults:
+        """Parse ruff JSON output"""
+        issues_by_name: Dict[str, List[ValidationIssue]] = defaultdict(list)
+        if returncode != 0:
+            rel_paths = self._relative_paths(targets)
             try:
-                os.unlink(temp_path)
-            except Exception:
-                pass
+                ruff_output = _json.loads(stdout)
+                for violation in ruff_output:
+                    name = os.path.basename(violation.get('filename', ''))
+                    if name not in rel_paths:
+                        continue
+                    
+                    # Same code-based severity as flake8; no code means a syntax error
+                    rule = violation.get('code')
+                    if not rule or rule.startswith('E'):
+                        severity = ValidationSeverity.ERROR
+                    else:
+                        severity = ValidationSeverity.WARNING
+                    
+                    location = violation.get('location') or {}
+                    issues_by_name[name].append(ValidationIssue(
+                        severity=severity,
+                        file_path=rel_paths[name],
+                        line_number=location.get('row', 0),
+                        column=location.get('column'),
+                        message=violation.get('message', ''),
+                        rule=rule or "ruff"
+                    ))
+            except (ValueError, AttributeError):
+                issues_by_name.clear()
         
-        return passed, issues
+        return self._tool_results(targets, returncode, issues_by_name)
     
-    def _lint_javascript(self, file_path: Path, content: str) -> Tuple[Optional[bool], List[ValidationIssue]]:
+    def _javascript_lint_run(self, targets: Dict[str, Path], content: Optional[str]) -> Optional[ToolRun]:
         """Lint JavaScript/TypeScript code using ESLint"""
-        issues = []
-        
-        # Check if eslint is available
-        try:
-            result = subprocess.run(
-                ['eslint', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return None, issues  # eslint not available
+        # Prefer the eslint_d daemon (same CLI); probes are cached per process
+        eslint_path = _tool_path('eslint_d') or _tool_path('eslint')
+        if eslint_path is None:
+            return None
         
-        # Write content to temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix=file_path.suffix, delete=False) as f:
-            f.write(content)
-            temp_path = f.name
-        
-        try:
-            # Run eslint
-            result = subprocess.run(
-                ['eslint', '--format=json', temp_path],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                cwd=str(self.workspace_path)
-            )
-            
-            # Parse eslint JSON output
-            if result.returncode != 0:
-                try:
-                    import json
-                    eslint_output = json.loads(result.stdout)
-                    for file_result in eslint_output:
-                        for message in file_result.get('messages', []):
-                            severity_map = {1: ValidationSeverity.WARNING, 2: ValidationSeverity.ERROR}
-                            severity = severity_map.get(message.get('severity', 1), ValidationSeverity.WARNING)
-                            
-                            issues.append(ValidationIssue(
-                                severity=severity,
-                                file_path=str(file_path.relative_to(self.workspace_path)),
-                                line_number=message.get('line', 0),
-                                column=message.get('column', None),
-                                message=message.get('message', ''),
-                                rule=message.get('ruleId')
-                            ))
-                except (json.JSONDecodeError, KeyError):
-                    # Fallback to text parsing
-                    for line in result.stdout.split('\n'):
-                        if ':' in line and ('error' in line.lower() or 'warning' in line.lower()):
-                            parts = line.split(':')
-                            if len(parts) >= 3:
-                                try:
-                                    line_num = int(parts[1])
-                                    msg = ':'.join(parts[2:]).strip()
-                                    
-                                    severity = ValidationSeverity.ERROR if 'error' in line.lower() else ValidationSeverity.WARNING
-                                    
-                                    issues.append(ValidationIssue(
-                                        severity=severity,
-                                        file_path=str(file_path.relative_to(self.workspace_path)),
-                                        line_number=line_num,
-                                        column=None,
-                                        message=msg,
-                                        rule="eslint"
-                                    ))
-                                except (ValueError, IndexError):
-                                    continue
-            
-            passed = result.returncode == 0
-        finally:
-            # Clean up temp file
+        if content is None:
+            args = list(targets)
+        else:
+            args = ['--stdin', '--stdin-filename', next(iter(targets))]
+        return ToolRun(
+            args=[eslint_path, '--format=json', *args],
+            parse=partial(self._parse_eslint, targets),
+            stdin=content,
+            # Started on the first lint; an eslint_d that was already up is reused as-is
+            prepare=partial(_ensure_eslint_d, str(self.workspace_path)) if eslint_path == _tool_path('eslint_d') else None
+        )
+    
+    def _parse_eslint(self, targets: Dict[str, Path], returncode: int, stdout: str) -> ToolResults:
+        """Parse eslint JSON output"""
+        issues_by_name: Dict[str, List[ValidationIssue]] = defaultdict(list)
+        if returncode != 0:
+            rel_paths = self._relative_paths(targets)
             try:
-                os.unlink(temp_path)
-            except Exception:
-                pass
+                eslint_output = _json.loads(stdout)
+                for file_result in eslint_output:
+                    name = os.path.basename(file_result.get('filePath', ''))
+                    if name not in rel_paths:
+                        continue
+                    for message in file_result.get('messages', []):
+                        severity_map = {1: ValidationSeverity.WARNING, 2: ValidationSeverity.ERROR}
+                        severity = severity_map.get(message.get('severity', 1), ValidationSeverity.WARNING)
+                        
+                        issues_by_name[name].append(ValidationIssue(
+                            severity=severity,
+                            file_path=rel_paths[name],
+                            line_number=message.get('line', 0),
+                            column=message.get('column', None),
+                            message=message.get('message', ''),
+                            rule=message.get('ruleId')
+                        ))
+            except (ValueError, KeyError):
+                # Fallback to text parsing
+                issues_by_name.clear()
+                for match in ESLINT_LINE_RE.finditer(stdout):
+                    path, line_num, col_num, msg = match.groups()
+                    name = os.path.basename(path)
+                    if name not in rel_paths:
+                        continue
+                    lowered = match.group(0).lower()
+                    if 'error' in lowered:
+                        severity = ValidationSeverity.ERROR
+                    elif 'warning' in lowered:
+                        severity = ValidationSeverity.WARNING
+                    else:
+                        continue
+                    
+                    issues_by_name[name].append(ValidationIssue(
+                        severity=severity,
+                        file_path=rel_paths[name],
+                        line_number=int(line_num),
+                        column=int(col_num) if col_num else None,
+                        message=msg.strip(),
+                        rule="eslint"
+                    ))
         
-        return passed, issues
+        return self._tool_results(targets, returncode, issues_by_name)
@@ -3,18 +3,50 @@ FastAPI backend for AI Coding Assistant Web UI
 Provides REST API and WebSocket for real-time communication
 """
 import os
+import re
 import sys
+import logging
+import logging.handlers
+import queue
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse, ORJSONResponse, Response, FileResponse
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ConfigDict, ValidationError
 import json
 import json as json_lib  # For debug logging
 import asyncio
+import gzip
+import hashlib
+import mimetypes
+import threading
 import time
+import uuid
+import weakref
 from contextlib import asynccontextmanager
+from functools import lru_cache
+
+try:
+    import orjson  # 3-10x faster serialization of responses and debug log entries
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # Binary framing for /ws/chat clients that opt in
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli  # Precompressed static assets (gzip is used without it)
+except ImportError:
+    brotli = None
+
+# Response class for every endpoint; large payloads return it directly to skip
+# FastAPI's jsonable_encoder pass
+FastJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
 
 # Add parent directory to path to import assistant
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -22,26 +54,292 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from assistant import CodingAssistant
 from tools.code_completion import CodeCompletionEngine
 from tools.git_integration import GitService
+from tools.terminal import Terminal
 from tools.auth import get_auth_manager, get_current_user, User, UserCreate, UserLogin, TokenResponse, JWT_EXPIRATION_HOURS
 from tools.rate_limiter import get_rate_limiter, rate_limit
 from tools.security import get_cors_origins, sanitize_file_path, sanitize_input
+from tools.response_cache import SemanticResponseCache
+from tools.diff_editor import FileDiff
+from tools.llm_provider import close_http_client
+from tools.conversation_summarizer import condense_history
 from config import Config
 
+# Status messages go through a QueueHandler; a QueueListener thread (running for
+# the app's lifespan) formats and writes them, keeping stream I/O off the event loop
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler(sys.stdout)
+_log_stream_handler.setFormatter(logging.Formatter("%(message)s"))
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+
 # Global assistant instance
 assistant: Optional[CodingAssistant] = None
 completion_engine: Optional[CodeCompletionEngine] = None
 git_service: Optional[GitService] = None
-active_connections: List[WebSocket] = []
+response_cache: Optional[SemanticResponseCache] = None
+# Optional assistant components, detected once at startup (see detect_capabilities)
+assistant_caps: Dict[str, bool] = {"rules_engine": False, "get_system_prompt": False, "performance_monitor": False}
+# Open chat sockets; entries drop out on disconnect (or once the socket is collected).
+# Iterate over list(active_connections) so connects/disconnects can't race a scan
+active_connections: "weakref.WeakSet[WebSocket]" = weakref.WeakSet()
+
+# RAG indexing runs on a single background worker; at most one run waits behind
+# the current one, so repeated requests coalesce instead of piling up
+index_queue: Optional[asyncio.Queue] = None
+index_worker_task: Optional[asyncio.Task] = None
+index_progress: Dict[str, Any] = {"status": "idle"}
+index_progress_changed: Optional[asyncio.Event] = None
+
+# Last rendered (key, body, etag) for /api/rules (keyed on the rules file's stat)
+# and /api/git/history (keyed on HEAD and limit)
+rules_response_cache: Optional[Tuple[Any, bytes, str]] = None
+history_response_cache: Optional[Tuple[Any, bytes, str]] = None
+
+# Pre-rendered /api/health body, re-serialized on state changes and by a periodic
+# refresher rather than on every probe
+health_bytes: bytes = b""
+health_refresh_task: Optional[asyncio.Task] = None
+HEALTH_REFRESH_INTERVAL = 0.5  # seconds
+
+
+def json_body(payload: Any) -> bytes:
+    """Serialize a response payload to JSON bytes (same options as ORJSONResponse)"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json_lib.dumps(payload).encode("utf-8")
+
+
+def conditional_response(request: Request, body: bytes, etag: Optional[str] = None) -> Response:
+    """
+    JSON response with a weak ETag; 304 Not Modified if the client already has it.
+    
+    Args:
+        request: Incoming request (for If-None-Match)
+        body: Serialized JSON body
+        etag: Precomputed ETag (hashed from body if omitted)
+    """
+    etag = etag or f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def ws_dumps(frame: Dict[str, Any]) -> str:
+    """Encode a WebSocket frame as JSON text"""
+    if orjson is not None:
+        return orjson.dumps(frame).decode("utf-8")
+    return json.dumps(frame)
+
+
+def ws_loads(data: str) -> Any:
+    """Decode a JSON WebSocket frame (raises json.JSONDecodeError)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Fixed control/error frames for the completion and terminal sockets, encoded once
+ERR_INVALID_JSON = ws_dumps({"type": "error", "message": "Invalid JSON"})
+ERR_NO_COMPLETION_ENGINE = ws_dumps({"type": "error", "message": "Completion engine not initialized"})
+ERR_CONTENT_RESYNC = ws_dumps({"type": "resync", "message": "base_version does not match; send full file_content"})
+PROMPT_FRAME = ws_dumps({"type": "output", "data": "\r\n$ "})
+
+# Wait this long before running a completion so a faster follow-up keystroke supersedes it
+COMPLETION_DEBOUNCE_SECONDS = 0.05
+
+# Per-socket inbound frame caps (completion frames may carry a whole file).
+# receive_frame() checks them after a frame is buffered; launchers must also pass
+# MAX_WS_FRAME_BYTES as uvicorn's ws_max_size (--ws-max-size, as __main__ and the
+# Dockerfile do) so bigger frames are refused before buffering. uvicorn's own
+# default is 16 MiB
+MAX_CHAT_FRAME_BYTES = 1024 * 1024
+MAX_COMPLETION_FRAME_BYTES = 4 * 1024 * 1024
+MAX_TERMINAL_FRAME_BYTES = 1024 * 1024
+MAX_WS_FRAME_BYTES = max(MAX_CHAT_FRAME_BYTES, MAX_COMPLETION_FRAME_BYTES, MAX_TERMINAL_FRAME_BYTES)
+# Open chat sockets allowed per worker
+MAX_WS_CONNECTIONS = int(os.getenv("MAX_WS_CONNECTIONS", 200))
+# Frames queued per chat socket; a client that leaves its queue full for
+# WS_SEND_TIMEOUT_SECONDS has stopped reading and is closed (1013 Try Again Later)
+MAX_WS_OUTGOING_FRAMES = 256
+WS_SEND_TIMEOUT_SECONDS = 10.0
+
+
+class SlowClientError(Exception):
+    """A chat socket's outgoing queue stayed full past WS_SEND_TIMEOUT_SECONDS"""
+
+
+async def receive_frame(websocket: WebSocket, max_bytes: int) -> Optional[str]:
+    """
+    Receive a text frame, closing the socket (1009 Message Too Big) if it exceeds max_bytes.
+    
+    Returns:
+        The frame, or None once the socket has been closed
+    """
+    data = await websocket.receive_text()
+    # Only long frames can be over the cap (UTF-8 is at most 4 bytes per char)
+    if len(data) * 4 > max_bytes and len(data.encode("utf-8")) > max_bytes:
+        await websocket.close(code=1009)
+        return None
+    return data
+
+
+async def broadcast(frame: Dict[str, Any], batch_size: int = 50):
+    """
+    Queue a frame on every open chat socket.
+    
+    The frame is encoded once per wire format and the same payload is shared by
+    all connections. Each socket's own writer task sends it, so a slow or dead
+    client never blocks the others. The event loop is yielded between batches.
+    
+    Args:
+        frame: Frame to send
+        batch_size: Connections handled between yields
+    """
+    encoded: Dict[str, Any] = {}
+    connections = list(active_connections)
+    for start in range(0, len(connections), batch_size):
+        for websocket in connections[start:start + batch_size]:
+            state = websocket.state
+            if state.frame_format not in encoded:
+                encoded[state.frame_format] = state.encode_frame(frame)
+            try:
+                state.outgoing.put_nowait(encoded[state.frame_format])
+            except asyncio.QueueFull:
+                # Too far behind to buffer more: drop the client (1013 Try Again Later)
+                active_connections.discard(websocket)
+                state.close_task = asyncio.create_task(websocket.close(code=1013))
+        await asyncio.sleep(0)
+
+
+class DebugLogger:
+    """
+    Batched debug log writer.
+    
+    Entries are queued and a background task hands them to a worker thread, which
+    appends them to a single kept-open file descriptor, up to BATCH_SIZE entries or
+    FLUSH_INTERVAL seconds per write.
+    """
+    
+    BATCH_SIZE = 64
+    FLUSH_INTERVAL = 0.05  # seconds
+    
+    def __init__(self, path: Path, max_queue_size: int = 10_000):
+        self.path = path
+        self.max_queue_size = max_queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush: Optional[asyncio.Future] = None  # In-flight write on a worker thread
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fd: Optional[int] = None
+    
+    def start(self):
+        """Start the writer task on the running event loop"""
+        self._loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the writer, flushing whatever is still queued"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        if self._flush is not None:
+            # Let the cancelled writer's last batch land before the final flush and close
+            await self._flush
+            self._flush = None
+        
+        if self.queue:
+            pending = []
+            while not self.queue.empty():
+                pending.append(self.queue.get_nowait())
+            await asyncio.to_thread(self._write, pending)
+        
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
+    def log(self, entry: Dict[str, Any]):
+        """Queue an entry (dropped if the queue is full)"""
+        if self._task is None:
+            # Writer not running (e.g. outside the app lifespan) - write directly
+            self._write([entry])
+            return
+        
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        
+        if running_loop is self._loop:
+            self._enqueue(entry)
+        else:
+            # asyncio.Queue is not thread-safe; hand off to the loop thread
+            self._loop.call_soon_threadsafe(self._enqueue, entry)
+    
+    def _enqueue(self, entry: Dict[str, Any]):
+        try:
+            self.queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            pass
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.FLUSH_INTERVAL
+            while len(batch) < self.BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Write on a worker thread so a slow disk never stalls the event loop.
+            # Shielded: cancelling the writer doesn't cut a write short
+            self._flush = asyncio.ensure_future(asyncio.to_thread(self._write, batch))
+            await asyncio.shield(self._flush)
+    
+    def _write(self, entries: List[Dict[str, Any]]):
+        """Append entries as JSON lines in a single write"""
+        lines = []
+        for entry in entries:
+            try:
+                if orjson is not None:
+                    lines.append(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
+                else:
+                    lines.append((json_lib.dumps(entry) + "\n").encode("utf-8"))
+            except Exception:
+                continue
+        
+        if not lines:
+            return
+        try:
+            if self._fd is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_APPEND | os.O_WRONLY | os.O_CREAT, 0o644)
+            os.write(self._fd, b"".join(lines))
+        except Exception:
+            # Silently fail - don't break the app if logging fails
+            pass
+
+
+debug_logger = DebugLogger(Path(__file__).parent.parent.parent / ".cursor" / "debug.log")
 
 
 def safe_debug_log(location: str, message: str, data: Optional[Dict] = None):
-    """Safely write debug log without failing if directory doesn't exist"""
+    """Queue a debug log entry; never fails"""
     try:
-        log_dir = Path(__file__).parent.parent.parent / ".cursor"
-        log_dir.mkdir(parents=True, exist_ok=True)
-        log_file_path = log_dir / "debug.log"
-        
-        log_entry = {
+        debug_logger.log({
             "sessionId": "debug-session",
             "runId": "run1",
             "hypothesisId": "B",
@@ -49,93 +347,238 @@ def safe_debug_log(location: str, message: str, data: Optional[Dict] = None):
             "message": message,
             "data": data or {},
             "timestamp": int(time.time() * 1000)
-        }
-        
-        with open(log_file_path, "a", encoding="utf-8") as log_file:
-            log_file.write(json_lib.dumps(log_entry) + "\n")
+        })
     except Exception:
         # Silently fail - don't break the app if logging fails
         pass
 
 
+def set_index_progress(status: str, **details):
+    """Update indexing progress and wake everyone waiting on /api/index/progress"""
+    global index_progress, index_progress_changed
+    index_progress = {"status": status, "timestamp": time.time(), **details}
+    # Swap in a fresh event before setting the old one, so each waiter sees every change
+    changed, index_progress_changed = index_progress_changed, asyncio.Event()
+    if changed:
+        changed.set()
+    refresh_health()
+
+
+def invalidate_response_cache():
+    """Drop cached chat/composer answers after the workspace changes"""
+    if response_cache:
+        response_cache.invalidate()
+
+
+# @file / @symbol references in a message; each pulls different context into the prompt
+MENTION_PATTERN = re.compile(r"@[\w./:-]+")
+
+
+def response_cache_partition(kind: str, model: str, query: str, *context: Optional[str]) -> str:
+    """
+    Model key for response_cache: entries only match, exactly or semantically,
+    within the same endpoint, effective model and context inputs.
+    
+    Args:
+        kind: Endpoint ("chat" or "composer")
+        model: Model that will generate the answer
+        query: Query text (its @-mentions are part of the context)
+        context: Other inputs that change the prompt (session, files, ...)
+    """
+    inputs = [*(item or "" for item in context), *sorted(set(MENTION_PATTERN.findall(query)))]
+    digest = hashlib.sha256("\x00".join(inputs).encode("utf-8")).hexdigest()[:16]
+    return f"{kind}:{model}:{digest}"
+
+
+async def index_worker():
+    """Consume index requests one at a time"""
+    while True:
+        force = await index_queue.get()
+        set_index_progress("indexing", force=force)
+        try:
+            result = await asyncio.to_thread(assistant.rag_system.index_codebase, force_reindex=force)
+            invalidate_response_cache()
+            set_index_progress("completed", result=result)
+            logger.info("[OK] RAG indexing completed")
+        except Exception as e:
+            set_index_progress("failed", error=str(e))
+            logger.warning("[WARN] RAG indexing failed: %s", e)
+        finally:
+            index_queue.task_done()
+
+
+def request_index(force: bool = False) -> bool:
+    """Queue an index run; False if one is already waiting (the request is coalesced)"""
+    try:
+        index_queue.put_nowait(force)
+    except asyncio.QueueFull:
+        return False
+    if index_progress["status"] != "indexing":
+        set_index_progress("queued", force=force)
+    return True
+
+
+# Built frontend (react-scripts build); its static/ files are served from memory
+FRONTEND_BUILD_DIR = Path(os.getenv("FRONTEND_BUILD_DIR", Path(__file__).parent.parent / "frontend" / "build"))
+STATIC_PRECOMPRESS_MAX_SIZE = 1024 * 1024
+STATIC_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+# path -> (identity, gzip, brotli or None, etag, media type)
+static_assets: Dict[str, Tuple[bytes, bytes, Optional[bytes], str, str]] = {}
+
+
+def load_static_assets() -> Dict[str, Tuple[bytes, bytes, Optional[bytes], str, str]]:
+    """Read and precompress the built frontend's static/ files once at startup"""
+    assets = {}
+    static_dir = FRONTEND_BUILD_DIR / "static"
+    if not static_dir.is_dir():
+        return assets
+    
+    for file_path in static_dir.rglob("*"):
+        if not file_path.is_file() or file_path.stat().st_size > STATIC_PRECOMPRESS_MAX_SIZE:
+            continue  # Large files are streamed from disk instead
+        data = file_path.read_bytes()
+        media_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        if media_type.startswith(STATIC_COMPRESSIBLE_TYPES):
+            gzipped = gzip.compress(data, 9)
+            brotlied = brotli.compress(data, quality=11) if brotli is not None else None
+        else:
+            gzipped, brotlied = data, None  # Already compressed (images, fonts)
+        etag = f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"'
+        assets[file_path.relative_to(static_dir).as_posix()] = (data, gzipped, brotlied, etag, media_type)
+    return assets
+
+
+def detect_capabilities(instance: Optional[CodingAssistant]) -> Dict[str, bool]:
+    """Which optional assistant components exist, so request handlers test a flag instead of probing attributes"""
+    return {
+        "rules_engine": getattr(instance, "rules_engine", None) is not None,
+        "get_system_prompt": callable(getattr(instance, "_get_system_prompt", None)),
+        "performance_monitor": getattr(instance, "performance_monitor", None) is not None
+    }
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize and cleanup"""
-    global assistant, completion_engine, git_service
-    # Initialize assistant
+    global assistant, assistant_caps, completion_engine, git_service, response_cache
+    global index_queue, index_worker_task, index_progress_changed, health_refresh_task, static_assets
+    log_listener.start()
+    debug_logger.start()
+    
     workspace_path = os.getenv("WORKSPACE_PATH", ".")
-    print("[INFO] Initializing assistant...")
-    try:
-        assistant = CodingAssistant(workspace_path=workspace_path)
-        print("[OK] Assistant initialization started")
-    except Exception as e:
-        print(f"[ERROR] Assistant initialization failed: {e}")
-        import traceback
-        traceback.print_exc()
-        raise
+    
+    def init_assistant() -> CodingAssistant:
+        logger.info("[INFO] Initializing assistant...")
+        try:
+            instance = CodingAssistant(workspace_path=workspace_path)
+            logger.info("[OK] Assistant initialization started")
+            return instance
+        except Exception as e:
+            logger.exception("[ERROR] Assistant initialization failed: %s", e)
+            raise
+    
+    def init_git() -> Optional[GitService]:
+        try:
+            service = GitService(workspace_path=workspace_path)
+            if service.is_repo:
+                logger.info("[OK] Git service initialized (repo: %s)", service.get_current_branch())
+            else:
+                logger.warning("[WARN] Git service initialized (not a git repository)")
+            return service
+        except Exception as e:
+            logger.warning("[WARN] Git service initialization failed: %s", e)
+            return None
+    
+    def init_completion() -> Optional[CodeCompletionEngine]:
+        try:
+            engine = CodeCompletionEngine(
+                rag_system=assistant.rag_system,
+                workspace_path=workspace_path
+            )
+            logger.info("[OK] Completion engine initialized")
+            return engine
+        except Exception as e:
+            logger.warning("[WARN] Completion engine initialization failed: %s", e)
+            return None
+    
+    # Independent constructors run concurrently in threads; the completion engine
+    # needs assistant.rag_system, so it starts in a second wave
+    assistant, git_service = await asyncio.gather(
+        asyncio.to_thread(init_assistant),
+        asyncio.to_thread(init_git)
+    )
+    assistant_caps = detect_capabilities(assistant)
+    completion_task = asyncio.create_task(asyncio.to_thread(init_completion))
+    static_task = asyncio.create_task(asyncio.to_thread(load_static_assets))
     
     # Auto-index RAG if not already indexed
     if assistant.rag_system:
+        index_queue = asyncio.Queue(maxsize=1)
+        index_progress_changed = asyncio.Event()
+        index_worker_task = asyncio.create_task(index_worker())
         try:
             rag_stats = assistant.rag_system.get_index_stats()
             if not rag_stats.get("indexed", False):
-                print("[INFO] RAG not indexed. Starting automatic indexing...")
-                # Start indexing in background (non-blocking)
-                import threading
-                def index_background():
-                    try:
-                        assistant.rag_system.index_codebase(force_reindex=False)
-                        print("[OK] RAG indexing completed")
-                    except Exception as e:
-                        print(f"[WARN] RAG indexing failed: {e}")
-                
-                index_thread = threading.Thread(target=index_background, daemon=True)
-                index_thread.start()
+                logger.info("[INFO] RAG not indexed. Starting automatic indexing...")
+                # Indexing runs on the background worker (non-blocking)
+                request_index(force=False)
         except Exception as e:
-            print(f"[WARN] Could not check RAG status: {e}")
-    
-    # Initialize completion engine
-    try:
-        completion_engine = CodeCompletionEngine(
-            rag_system=assistant.rag_system,
-            workspace_path=workspace_path
+            logger.warning("[WARN] Could not check RAG status: %s", e)
+    
+    # Initialize response cache (semantic matching needs RAG embeddings)
+    if Config.ENABLE_RESPONSE_CACHE:
+        response_cache = SemanticResponseCache(
+            max_entries=Config.RESPONSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=Config.RESPONSE_CACHE_TTL,
+            similarity_threshold=Config.RESPONSE_CACHE_SIMILARITY,
+            embed_fn=assistant.rag_system._get_embedding_with_retry if assistant.rag_system else None
         )
-        print(f"[OK] Completion engine initialized")
-    except Exception as e:
-        print(f"[WARN] Completion engine initialization failed: {e}")
-        completion_engine = None
     
-    # Initialize git service
+    completion_engine = await completion_task
     try:
-        git_service = GitService(workspace_path=workspace_path)
-        if git_service.is_repo:
-            print(f"[OK] Git service initialized (repo: {git_service.get_current_branch()})")
-        else:
-            print(f"[WARN] Git service initialized (not a git repository)")
+        static_assets = await static_task
+        if static_assets:
+            logger.info("[OK] Loaded %d static assets from %s", len(static_assets), FRONTEND_BUILD_DIR)
     except Exception as e:
-        print(f"[WARN] Git service initialization failed: {e}")
-        git_service = None
+        logger.warning("[WARN] Could not load static assets: %s", e)
     
-    print(f"[OK] Assistant initialized for workspace: {workspace_path}")
+    logger.info("[OK] Assistant initialized for workspace: %s", workspace_path)
+    refresh_health()
+    health_refresh_task = asyncio.create_task(health_refresher())
     yield
     # Cleanup
+    if index_worker_task:
+        index_worker_task.cancel()
+        index_worker_task = None
+    if health_refresh_task:
+        health_refresh_task.cancel()
+        health_refresh_task = None
     assistant = None
+    assistant_caps = detect_capabilities(None)
     completion_engine = None
     git_service = None
+    response_cache = None
+    static_assets = {}
+    close_http_client()
+    refresh_health()
+    await debug_logger.stop()
+    log_listener.stop()
 
 
 app = FastAPI(
     title="AI Coding Assistant API",
     description="Web API for AI Coding Assistant",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware - use environment-based origins
 cors_origins = get_cors_origins()
 if not cors_origins and os.getenv("ENVIRONMENT", "development") == "production":
     # Production must have explicit CORS origins
-    print("[WARN] CORS_ORIGINS not set in production! Defaulting to empty list.")
+    logger.warning("[WARN] CORS_ORIGINS not set in production! Defaulting to empty list.")
     cors_origins = []
 
 app.add_middleware(
@@ -146,42 +589,75 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that passes some paths through untouched.
+    
+    Older Starlette releases buffer text/event-stream responses and re-encode
+    bodies that already carry a Content-Encoding, so event streams and the
+    precompressed static assets are excluded by path.
+    """
+    
+    def __init__(self, app, excluded_prefixes: Tuple[str, ...] = (), **kwargs):
+        super().__init__(app, **kwargs)
+        self.excluded_prefixes = excluded_prefixes
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Compress JSON bodies over 1 KB (performance history, rules preview, file reads)
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    excluded_prefixes=("/api/index/progress", "/static/"),
+    minimum_size=1024,
+    compresslevel=5
+)
+
 
 # Pydantic models
-class ChatMessage(BaseModel):
+class RequestModel(BaseModel):
+    """Base for request bodies: immutable once parsed, no assignment validation"""
+    model_config = ConfigDict(frozen=True, validate_assignment=False, str_strip_whitespace=False)
+
+
+class ChatMessage(RequestModel):
     message: str
     conversation_id: Optional[str] = None
 
 
-class FileReadRequest(BaseModel):
+class FileReadRequest(RequestModel):
     file_path: str
     offset: Optional[int] = None
     limit: Optional[int] = None
 
 
-class FileWriteRequest(BaseModel):
+class FileWriteRequest(RequestModel):
     file_path: str
     contents: str
 
 
-class FileEditRequest(BaseModel):
+class FileEditRequest(RequestModel):
     file_path: str
     old_string: str
     new_string: str
     replace_all: bool = False
 
 
-class DiffRequest(BaseModel):
+class DiffRequest(RequestModel):
     diff_text: str
     dry_run: bool = False
 
 
-class ValidateDiffRequest(BaseModel):
+class ValidateDiffRequest(RequestModel):
     diff_text: str
     file_path: Optional[str] = None
 
 
-class CompletionRequest(BaseModel):
+class CompletionRequest(RequestModel):
     file_path: str
     file_content: str
     cursor_line: int
@@ -189,7 +665,97 @@ class CompletionRequest(BaseModel):
     language: str = "python"
 
 
-class ComposerRequest(BaseModel):
+class ContentPatch(RequestModel):
+    """Replace file_content[start:end] with text (insert: end == start, delete: text == "")"""
+    start: int
+    end: int
+    text: str = ""
+
+
+class CompletionFrame(RequestModel):
+    """
+    /ws/completion message; every field is optional there.
+    
+    Frames may carry a client-chosen buffer version. Instead of file_content, a
+    client may then send patch plus base_version (the version the patch applies
+    to). Patches apply in order, each with offsets in UTF-16 code units (editor
+    and JS string offsets) into the buffer as the previous patch left it.
+    """
+    file_path: str = ""
+    file_content: str = ""
+    cursor_line: int = 0
+    cursor_column: int = 0
+    language: str = "python"
+    version: Optional[int] = None
+    base_version: Optional[int] = None
+    patch: Optional[List[ContentPatch]] = None
+
+
+def has_astral(text: str) -> bool:
+    """Whether text has characters outside the BMP (two UTF-16 code units each)"""
+    return not text.isascii() and len(text.encode("utf-16-le")) != 2 * len(text)
+
+
+def _utf16_index(content: str, offset: int) -> int:
+    """Code point index of a UTF-16 code unit offset (ValueError mid-pair or out of range)"""
+    units = content.encode("utf-16-le")
+    if not 0 <= offset * 2 <= len(units):
+        raise ValueError(f"Patch offset {offset} outside content of {len(units) // 2} UTF-16 units")
+    return len(units[:offset * 2].decode("utf-16-le"))
+
+
+def apply_content_patch(content: str, patch: List[ContentPatch], astral: Optional[bool] = None) -> str:
+    """
+    Apply CompletionFrame patches to content.
+    
+    Args:
+        content: Buffer the patches apply to
+        patch: Replacements, offsets in UTF-16 code units
+        astral: has_astral(content) if already known; without astral
+            characters UTF-16 offsets are plain string indices
+    
+    Raises:
+        ValueError: If a patch range falls outside the buffer or splits a surrogate pair
+    """
+    if astral is None:
+        astral = has_astral(content)
+    for op in patch:
+        if astral:
+            start, end = _utf16_index(content, op.start), _utf16_index(content, op.end)
+        else:
+            start, end = op.start, op.end
+        if not 0 <= start <= end <= len(content):
+            raise ValueError(f"Patch range {op.start}:{op.end} outside content of length {len(content)}")
+        content = content[:start] + op.text + content[end:]
+        astral = astral or has_astral(op.text)
+    return content
+
+
+def validate_body(model: type, body: bytes):
+    """
+    Parse and validate a raw JSON body in one pydantic-core pass, skipping
+    FastAPI's per-request body/field resolution.
+    
+    Raises:
+        RequestValidationError: Same 422 shape FastAPI produces for declared bodies
+    """
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors()])
+
+
+def body_schema(model: type) -> Dict[str, Any]:
+    """openapi_extra documenting a request body that is validated by validate_body"""
+    return {
+        "requestBody": {
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+            "required": True
+        }
+    }
+
+
+class ComposerRequest(RequestModel):
     """Request for multi-file editing via Composer"""
     query: str
     files: Optional[List[str]] = None  # Specific files to edit, None = all relevant
@@ -197,26 +763,26 @@ class ComposerRequest(BaseModel):
     model: Optional[str] = None  # Model override
 
 
-class GitStageRequest(BaseModel):
+class GitStageRequest(RequestModel):
     files: List[str]
 
 
-class GitUnstageRequest(BaseModel):
+class GitUnstageRequest(RequestModel):
     files: List[str]
 
 
-class GitCommitRequest(BaseModel):
+class GitCommitRequest(RequestModel):
     message: str
     files: Optional[List[str]] = None
     generate_message: bool = False
 
 
-class GitBranchRequest(BaseModel):
+class GitBranchRequest(RequestModel):
     branch: str
     create: bool = False
 
 
-class RulesSaveRequest(BaseModel):
+class RulesSaveRequest(RequestModel):
     content: str
 
 
@@ -278,9 +844,63 @@ async def root():
     }
 
 
+@app.get("/static/{path:path}", include_in_schema=False)
+async def get_static_asset(path: str, request: Request):
+    """Serve a built frontend asset, precompressed when the client accepts it"""
+    asset = static_assets.get(path)
+    if asset is None:
+        # Not preloaded (large file, or built after startup): serve from disk
+        static_dir = (FRONTEND_BUILD_DIR / "static").resolve()
+        file_path = (static_dir / path).resolve()
+        if static_dir not in file_path.parents or not file_path.is_file():
+            raise HTTPException(status_code=404, detail="Not found")
+        return FileResponse(file_path)
+    
+    data, gzipped, brotlied, etag, media_type = asset
+    # Hashed build filenames never change content, so clients may cache forever
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Vary": "Accept-Encoding"
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    accepted = {part.split(";")[0].strip() for part in request.headers.get("accept-encoding", "").split(",")}
+    if brotlied is not None and "br" in accepted:
+        headers["Content-Encoding"] = "br"
+        body = brotlied
+    elif gzipped is not data and "gzip" in accepted:
+        headers["Content-Encoding"] = "gzip"
+        body = gzipped
+    else:
+        body = data
+    return Response(body, media_type=media_type, headers=headers)
+
+
 @app.get("/api/health")
 async def get_health():
     """Quick health check endpoint that responds immediately"""
+    if not health_bytes:
+        refresh_health()
+    return Response(health_bytes, media_type="application/json")
+
+
+def refresh_health():
+    """Re-render the cached /api/health body"""
+    global health_bytes
+    health_bytes = json_body(_health_snapshot())
+
+
+async def health_refresher():
+    """Keep the cached health body current (timestamp and RAG status)"""
+    while True:
+        await asyncio.sleep(HEALTH_REFRESH_INTERVAL)
+        refresh_health()
+
+
+def _health_snapshot() -> Dict[str, Any]:
+    """Health payload for the current state"""
     try:
         # Check if assistant is initialized
         assistant_ready = assistant is not None
@@ -292,7 +912,7 @@ async def get_health():
                 rag_stats = assistant.rag_system.get_index_stats()
                 if rag_stats.get("indexed", False):
                     rag_status = "indexed"
-                elif hasattr(assistant.rag_system, '_index_lock') and assistant.rag_system._index_lock.locked():
+                elif index_progress["status"] == "indexing" or assistant.rag_system._index_lock.locked():
                     rag_status = "indexing"
             except Exception:
                 pass
@@ -300,8 +920,8 @@ async def get_health():
         # Check service availability
         services = {
             "git": git_service is not None and (git_service.is_repo if git_service else False),
-            "rules": assistant is not None and hasattr(assistant, 'rules_engine') and assistant.rules_engine is not None,
-            "performance": assistant is not None and hasattr(assistant, 'performance_monitor') and assistant.performance_monitor is not None
+            "rules": assistant is not None and assistant_caps["rules_engine"],
+            "performance": assistant is not None and assistant_caps["performance_monitor"]
         }
         
         return {
@@ -390,81 +1010,134 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 
 
 @app.get("/api/status")
-async def get_status():
+async def get_status(request: Request):
     """Get system status"""
     if not assistant:
         raise HTTPException(status_code=503, detail="Assistant not initialized")
     
+    stats = {
+        "assistant_ready": assistant is not None,
+        "rag_enabled": assistant.rag_system is not None if assistant else False,
+        "rag_indexed": False,
+        **_model_status(assistant)
+    }
+    
+    if assistant and assistant.rag_system:
+        try:
+            rag_stats = assistant.rag_system.get_index_stats()
+            stats["rag_indexed"] = rag_stats.get("indexed", False)
+            stats["rag_chunks"] = rag_stats.get("total_chunks", 0)
+        except Exception as e:
+            safe_debug_log("app.py:get_status", "Silent exception in get_status", {
+                "error_type": type(e).__name__,
+                "error_message": str(e)
+            })
+            pass
+    
+    return conditional_response(request, json_body(stats))
+
+
+def _model_status(current: CodingAssistant) -> Dict[str, Any]:
+    """Model/provider part of /api/status; fixed for the lifetime of an assistant"""
+    # Memoized on the assistant itself so a replaced assistant isn't kept alive
+    status = getattr(current, "_api_model_status", None)
+    if status is None:
+        status = _build_model_status(current)
+        current._api_model_status = status
+    return status
+
+
+def _build_model_status(current: CodingAssistant) -> Dict[str, Any]:
+    """Compute the model/provider status for an assistant"""
     # Determine active model based on configuration
     if Config.USE_HYBRID_MODELS:
         # Hybrid mode - show available models
         available_models = []
-        if assistant.deepseek_provider:
+        if current.deepseek_provider:
             available_models.append(Config.DEEPSEEK_MODEL)
-        if assistant.anthropic_provider:
+        if current.anthropic_provider:
             available_models.append(Config.ANTHROPIC_MODEL)
-        if assistant.openai_provider:
+        if current.openai_provider:
             available_models.append(Config.OPENAI_MODEL)
         
         model_info = f"Hybrid Mode: {', '.join(available_models) if available_models else 'None configured'}"
-        default_model = Config.DEEPSEEK_MODEL if assistant.deepseek_provider else (Config.ANTHROPIC_MODEL if assistant.anthropic_provider else Config.OPENAI_MODEL)
+        default_model = Config.DEEPSEEK_MODEL if current.deepseek_provider else (Config.ANTHROPIC_MODEL if current.anthropic_provider else Config.OPENAI_MODEL)
     else:
         # Single model mode
-        if Config.DEFAULT_PROVIDER == "deepseek" and assistant.deepseek_provider:
+        if Config.DEFAULT_PROVIDER == "deepseek" and current.deepseek_provider:
             default_model = Config.DEEPSEEK_MODEL
-        elif Config.DEFAULT_PROVIDER == "anthropic" and assistant.anthropic_provider:
+        elif Config.DEFAULT_PROVIDER == "anthropic" and current.anthropic_provider:
             default_model = Config.ANTHROPIC_MODEL
         else:
             default_model = Config.OPENAI_MODEL
         model_info = default_model
     
-    stats = {
-        "assistant_ready": assistant is not None,
-        "rag_enabled": assistant.rag_system is not None if assistant else False,
-        "rag_indexed": False,
+    return {
         "model": default_model,
         "model_info": model_info,
         "hybrid_mode": Config.USE_HYBRID_MODELS,
         "available_providers": {
-            "deepseek": assistant.deepseek_provider is not None,
-            "anthropic": assistant.anthropic_provider is not None,
-            "openai": assistant.openai_provider is not None
+            "deepseek": current.deepseek_provider is not None,
+            "anthropic": current.anthropic_provider is not None,
+            "openai": current.openai_provider is not None
         }
     }
-    
-    if assistant and assistant.rag_system:
-        try:
-            rag_stats = assistant.rag_system.get_index_stats()
-            stats["rag_indexed"] = rag_stats.get("indexed", False)
-            stats["rag_chunks"] = rag_stats.get("total_chunks", 0)
-        except Exception as e:
-            safe_debug_log("app.py:get_status", "Silent exception in get_status", {
-                "error_type": type(e).__name__,
-                "error_message": str(e)
-            })
-            pass
-    
-    return stats
 
 
-@app.post("/api/chat")
-async def chat(message: ChatMessage):
+@app.post("/api/chat", openapi_extra=body_schema(ChatMessage))
+async def chat(request: Request):
     """Process chat message (synchronous)"""
+    message = validate_body(ChatMessage, await request.body())
+    
     if not assistant:
         raise HTTPException(status_code=503, detail="Assistant not initialized")
     
     try:
-        response = assistant.process_message(message.message)
-        return {
+        # Serve repeated/near-duplicate questions without re-running the LLM
+        # (a semantic lookup embeds the query, so it runs on the thread pool too)
+        query_vector, cache_model = None, None
+        if response_cache:
+            try:
+                cache_model = response_cache_partition(
+                    "chat", assistant.effective_model(message.message), message.message,
+                    getattr(assistant, "_session_id", None), message.conversation_id
+                )
+            except RuntimeError:
+                pass  # No provider: process_message reports it
+        if cache_model:
+            cached, query_vector = await asyncio.to_thread(response_cache.lookup, message.message, cache_model)
+            if cached is not None:
+                return FastJSONResponse({
+                    "response": cached["response"],
+                    "success": True,
+                    "cached": True
+                })
+        
+        def run_chat() -> Tuple[str, bool, bool]:
+            # The turn outcome is tracked per thread, so read it on the same worker
+            response = assistant.process_message(message.message)
+            return response, assistant.last_turn_cacheable, assistant.last_turn_side_effects
+        
+        response, cacheable, side_effects = await asyncio.to_thread(run_chat)
+        if side_effects:
+            # Files changed: cached answers may describe the old code
+            invalidate_response_cache()
+        elif cache_model and cacheable:
+            # Only plain answers are stored; replaying a turn that applied diffs
+            # or ran tools would claim edits that never happen
+            await asyncio.to_thread(
+                response_cache.set, message.message, cache_model, {"response": response}, query_vector
+            )
+        return FastJSONResponse({
             "response": response,
             "success": True
-        }
+        })
     except Exception as e:
-        return {
+        return FastJSONResponse({
             "response": f"Error: {str(e)}",
             "success": False,
             "error": str(e)
-        }
+        })
 
 
 @app.get("/api/files")
@@ -474,7 +1147,7 @@ async def list_files(directory: str = "."):
         raise HTTPException(status_code=503, detail="Assistant not initialized")
     
     try:
-        result = assistant.file_ops.list_directory(directory)
+        result = await asyncio.to_thread(assistant.file_ops.list_directory, directory)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -487,7 +1160,10 @@ async def read_file(request: FileReadRequest):
         raise HTTPException(status_code=503, detail="Assistant not initialized")
     
     try:
-        result = assistant.file_ops.read_file(
+        # File I/O runs on the thread pool so bursts (e.g. opening many files)
+        # proceed in parallel instead of blocking the event loop one by one
+        result = await asyncio.to_thread(
+            assistant.file_ops.read_file,
             request.file_path,
             offset=request.offset,
             limit=request.limit
@@ -504,7 +1180,8 @@ async def write_file(request: FileWriteRequest):
         raise HTTPException(status_code=503, detail="Assistant not initialized")
     
     try:
-        result = assistant.file_ops.write_file(request.file_path, request.contents)
+        result = await asyncio.to_thread(assistant.file_ops.write_file, request.file_path, request.contents)
+        invalidate_response_cache()
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -517,12 +1194,14 @@ async def edit_file(request: FileEditRequest):
         raise HTTPException(status_code=503, detail="Assistant not initialized")
     
     try:
-        result = assistant.file_ops.search_replace(
+        result = await asyncio.to_thread(
+            assistant.file_ops.search_replace,
             request.file_path,
             request.old_string,
             request.new_string,
             replace_all=request.replace_all
         )
+        invalidate_response_cache()
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -552,6 +1231,8 @@ async def apply_diff(request: DiffRequest):
         file_diffs = assistant.diff_editor.parse_diff(request.diff_text)
         # Apply the parsed diffs
         result = assistant.diff_editor.apply_diffs(file_diffs, dry_run=request.dry_run)
+        if not request.dry_run:
+            invalidate_response_cache()
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -604,6 +1285,8 @@ async def debug_codebase(
             file_pattern=file_pattern,
             max_files=max_files
         )
+        if auto_fix:
+            invalidate_response_cache()
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -629,12 +1312,14 @@ async def debug_file(
     
     try:
         results = assistant.debug_mode.debug_file(file_path, auto_fix=auto_fix)
+        if auto_fix:
+            invalidate_response_cache()
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-class InteractiveDebugRequest(BaseModel):
+class InteractiveDebugRequest(RequestModel):
     """Request for interactive debugging"""
     bug_description: str
     error_text: Optional[str] = None
@@ -669,6 +1354,140 @@ async def interactive_debug(request: InteractiveDebugRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+COMPOSER_SUFFIX = """
+        
+You are now in Composer mode for multi-file editing. When the user requests changes across multiple files:
+1. Generate unified diffs for ALL affected files
+2. Use the format: ```diff\n<unified diff>\n```
+3. Include file headers (--- a/path, +++ b/path) for each file
+4. Be comprehensive - show all changes needed
+5. Do NOT ask for confirmation - just generate the diffs
+"""
+
+
+@lru_cache(maxsize=4)
+def _composer_system_prompt(base_prompt: str) -> str:
+    """Composer system prompt, built once per base prompt (it changes when rules are saved)"""
+    return base_prompt + COMPOSER_SUFFIX
+
+
+def _preview_composer_diffs(diffs: List[str]) -> Tuple[List[FileDiff], List[Dict[str, Any]]]:
+    """
+    Parse diffs and dry-run each file diff against the workspace (blocking).
+    
+    Returns:
+        (file_diffs, preview results)
+    """
+    # Parse diffs to get file list
+    file_diffs = []
+    for diff_text in diffs:
+        file_diffs.extend(assistant.diff_editor.parse_diff(diff_text))
+    
+    # Preview diffs (dry run)
+    preview_results = []
+    for file_diff in file_diffs:
+        preview = assistant.diff_editor.apply_diff(file_diff, dry_run=True)
+        preview_results.append({
+            "file": file_diff.new_path,
+            "old_path": file_diff.old_path,
+            "hunks": len(file_diff.hunks),
+            "preview": preview
+        })
+    
+    return file_diffs, preview_results
+
+
+def _composer_provider(full_query: str) -> Tuple[Any, str]:
+    """Pick the LLM provider and model for a Composer query"""
+    # Determine which LLM provider to use
+    provider = assistant.openai_provider
+    model_name = Config.OPENAI_MODEL
+    
+    if Config.USE_HYBRID_MODELS:
+        task_info = assistant.task_classifier.classify(full_query, [])
+        provider_name = task_info["provider"]
+        model_name = task_info["model"]
+        
+        if provider_name == "deepseek" and assistant.deepseek_provider:
+            provider = assistant.deepseek_provider
+        elif provider_name == "anthropic" and assistant.anthropic_provider:
+            provider = assistant.anthropic_provider
+        # If provider is still None, fall back to available providers
+        if not provider:
+            if assistant.deepseek_provider:
+                provider = assistant.deepseek_provider
+                model_name = Config.DEEPSEEK_MODEL
+            elif assistant.anthropic_provider:
+                provider = assistant.anthropic_provider
+                model_name = Config.ANTHROPIC_MODEL
+            elif assistant.openai_provider:
+                provider = assistant.openai_provider
+                model_name = Config.OPENAI_MODEL
+    
+    # Validate provider is available
+    if not provider:
+        raise HTTPException(status_code=503, detail="No LLM provider available. Please configure at least one API key.")
+    
+    # Validate model_name
+    if not model_name:
+        model_name = Config.OPENAI_MODEL
+        logger.warning("[WARN] model_name was None in composer, using default: %s", model_name)
+    
+    return provider, model_name
+
+
+def _generate_composer_response(request: ComposerRequest, full_query: str) -> str:
+    """Run RAG retrieval and the LLM call for a Composer query, returning the raw response"""
+    # Process the query through assistant
+    conversation_history = []  # Could be enhanced with session management
+    
+    # Get RAG context if available
+    rag_context = ""
+    if assistant.rag_system and assistant.rag_system.is_indexed:
+        try:
+            rag_context = assistant.rag_system.get_context_for_query(
+                request.query,
+                use_hybrid=True
+            )
+        except Exception as e:
+            logger.warning("[WARN] RAG retrieval error: %s", e)
+    
+    provider, model_name = _composer_provider(full_query)
+    
+    # Build system prompt for multi-file editing
+    system_prompt = _composer_system_prompt(assistant.system_prompt)
+    # rag_context is passed separately: the context manager adds it as its own
+    # message after this static prompt, keeping the prompt prefix identical
+    # across requests so providers can serve it from their prefix cache
+    
+    # Use context manager
+    session_id = getattr(assistant, '_session_id', None)
+    context_result = assistant.context_manager.assemble_context(
+        user_message=full_query,
+        conversation_history=conversation_history,
+        rag_context=rag_context,
+        system_prompt=system_prompt,
+        model=model_name,
+        session_id=session_id
+    )
+    
+    messages = context_result["messages"]
+    
+    # Call LLM
+    response = provider.chat_completion(
+        messages=messages,
+        model=model_name,
+        temperature=Config.OPENAI_TEMPERATURE,
+        max_tokens=Config.MAX_TOKENS * 2  # More tokens for multi-file edits
+    )
+    
+    # Validate response
+    if not response or not hasattr(response, 'content') or response.content is None:
+        raise HTTPException(status_code=500, detail="LLM response is empty or invalid")
+    
+    return response.content
+
+
 @app.post("/api/composer")
 async def composer_edit(request: ComposerRequest):
     """
@@ -687,123 +1506,41 @@ async def composer_edit(request: ComposerRequest):
         if request.files:
             full_query += f"\n\nFiles to edit: {', '.join(request.files)}"
         
-        # Process the query through assistant
-        conversation_history = []  # Could be enhanced with session management
-        
-        # Get RAG context if available
-        rag_context = ""
-        if assistant.rag_system and assistant.rag_system.is_indexed:
-            try:
-                rag_context = assistant.rag_system.get_context_for_query(
-                    request.query,
-                    use_hybrid=True
-                )
-            except Exception as e:
-                print(f"[WARN] RAG retrieval error: {e}")
-        
-        # Determine which LLM provider to use
-        provider = assistant.openai_provider
-        model_name = Config.OPENAI_MODEL
-        
-        if Config.USE_HYBRID_MODELS:
-            task_info = assistant.task_classifier.classify(full_query, conversation_history)
-            provider_name = task_info["provider"]
-            model_name = task_info["model"]
-            
-            if provider_name == "deepseek" and assistant.deepseek_provider:
-                provider = assistant.deepseek_provider
-            elif provider_name == "anthropic" and assistant.anthropic_provider:
-                provider = assistant.anthropic_provider
-            # If provider is still None, fall back to available providers
-            if not provider:
-                if assistant.deepseek_provider:
-                    provider = assistant.deepseek_provider
-                    model_name = Config.DEEPSEEK_MODEL
-                elif assistant.anthropic_provider:
-                    provider = assistant.anthropic_provider
-                    model_name = Config.ANTHROPIC_MODEL
-                elif assistant.openai_provider:
-                    provider = assistant.openai_provider
-                    model_name = Config.OPENAI_MODEL
-        
-        # Validate provider is available
-        if not provider:
-            raise HTTPException(status_code=503, detail="No LLM provider available. Please configure at least one API key.")
-        
-        # Build system prompt for multi-file editing
-        system_prompt = assistant.system_prompt + """
-        
-You are now in Composer mode for multi-file editing. When the user requests changes across multiple files:
-1. Generate unified diffs for ALL affected files
-2. Use the format: ```diff\n<unified diff>\n```
-3. Include file headers (--- a/path, +++ b/path) for each file
-4. Be comprehensive - show all changes needed
-5. Do NOT ask for confirmation - just generate the diffs
-"""
-        
-        if rag_context:
-            system_prompt += f"\n\n<codebase_context>\n{rag_context}\n</codebase_context>"
-        
-        # Validate model_name
-        if not model_name:
-            model_name = Config.OPENAI_MODEL
-            print(f"[WARN] model_name was None in composer, using default: {model_name}")
-        
-        # Use context manager
-        session_id = getattr(assistant, '_session_id', None)
-        context_result = assistant.context_manager.assemble_context(
-            user_message=full_query,
-            conversation_history=conversation_history,
-            rag_context=rag_context,
-            system_prompt=system_prompt,
-            model=model_name,
-            session_id=session_id
-        )
-        
-        messages = context_result["messages"]
-        
-        # Call LLM
-        response = provider.chat_completion(
-            messages=messages,
-            model=model_name,
-            temperature=Config.OPENAI_TEMPERATURE,
-            max_tokens=Config.MAX_TOKENS * 2  # More tokens for multi-file edits
-        )
-        
-        # Validate response
-        if not response or not hasattr(response, 'content') or response.content is None:
-            raise HTTPException(status_code=500, detail="LLM response is empty or invalid")
-        
-        assistant_message = response.content
+        # RAG + LLM are skipped for repeated/near-duplicate queries; diffs are
+        # still re-parsed and previewed against the current files
+        cached, query_vector = None, None
+        if response_cache:
+            # request.model isn't used for generation; the model that is comes from full_query
+            cache_model = response_cache_partition(
+                "composer", _composer_provider(full_query)[1], full_query,
+                getattr(assistant, "_session_id", None), request.context, "\n".join(request.files or [])
+            )
+            cached, query_vector = await asyncio.to_thread(response_cache.lookup, full_query, cache_model)
+        if cached is not None:
+            assistant_message = cached["assistant_message"]
+        else:
+            assistant_message = await asyncio.to_thread(_generate_composer_response, request, full_query)
         
         # Extract diffs from response
         diffs = assistant.diff_extractor.extract_diffs(assistant_message)
         
         if not diffs:
-            return {
+            return FastJSONResponse({
                 "success": False,
                 "error": "No diffs found in response",
                 "response": assistant_message
-            }
+            })
         
-        # Parse diffs to get file list
-        file_diffs = []
-        for diff_text in diffs:
-            parsed = assistant.diff_editor.parse_diff(diff_text)
-            file_diffs.extend(parsed)
+        if response_cache and cached is None:
+            await asyncio.to_thread(
+                response_cache.set, full_query, cache_model, {"assistant_message": assistant_message}, query_vector
+            )
         
-        # Preview diffs (dry run)
-        preview_results = []
-        for file_diff in file_diffs:
-            preview = assistant.diff_editor.apply_diff(file_diff, dry_run=True)
-            preview_results.append({
-                "file": file_diff.new_path,
-                "old_path": file_diff.old_path,
-                "hunks": len(file_diff.hunks),
-                "preview": preview
-            })
+        # Parse and preview in one thread hop so file reads and hunk splicing
+        # don't block the event loop
+        file_diffs, preview_results = await asyncio.to_thread(_preview_composer_diffs, diffs)
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "diffs": diffs,
             "files": [fd.new_path for fd in file_diffs],
@@ -817,13 +1554,13 @@ You are now in Composer mode for multi-file editing. When the user requests chan
             ],
             "preview": preview_results,
             "response": assistant_message
-        }
+        })
     
     except Exception as e:
-        return {
+        return FastJSONResponse({
             "success": False,
             "error": str(e)
-        }
+        })
 
 
 @app.post("/api/search")
@@ -852,27 +1589,13 @@ async def index_codebase(force: bool = False):
         raise HTTPException(status_code=503, detail="RAG system not available")
     
     try:
-        # Check if already indexing
-        if hasattr(assistant.rag_system, '_index_lock'):
-            if assistant.rag_system._index_lock.locked():
-                return {
-                    "status": "already_indexing",
-                    "message": "Indexing is already in progress"
-                }
-        
-        # Run indexing in background thread (non-blocking)
-        import threading
-        def index_background():
-            try:
-                assistant.rag_system.index_codebase(force_reindex=force)
-                print("[OK] RAG indexing completed")
-            except Exception as e:
-                print(f"[WARN] Background indexing failed: {e}")
-        
-        index_thread = threading.Thread(target=index_background, daemon=True)
-        index_thread.start()
+        # Hand off to the indexing worker and return immediately
+        if not request_index(force=force):
+            return {
+                "status": "already_indexing",
+                "message": "Indexing is already in progress"
+            }
         
-        # Return immediately
         return {
             "status": "started",
             "message": "Indexing started in background"
@@ -881,6 +1604,29 @@ async def index_codebase(force: bool = False):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/index/progress")
+async def index_progress_stream(request: Request):
+    """Stream indexing progress as server-sent events until the run finishes"""
+    if not assistant or not assistant.rag_system:
+        raise HTTPException(status_code=503, detail="RAG system not available")
+    
+    async def events():
+        while True:
+            changed = index_progress_changed
+            yield f"data: {json.dumps(index_progress)}\n\n"
+            if index_progress["status"] in ("idle", "completed", "failed"):
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=15.0)
+            except asyncio.TimeoutError:
+                # Keep-alive comment so proxies don't drop the idle stream
+                yield ": keep-alive\n\n"
+            if await request.is_disconnected():
+                return
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @app.get("/api/stats")
 async def get_stats():
     """Get usage statistics"""
@@ -908,7 +1654,10 @@ async def get_stats():
         try:
             stats["performance"] = assistant.performance_monitor.get_current_stats()
         except Exception as e:
-            print(f"[WARN] Error getting performance stats: {e}")
+            logger.warning("[WARN] Error getting performance stats: %s", e)
+    
+    if response_cache:
+        stats["response_cache"] = response_cache.get_stats()
     
     return stats
 
@@ -1012,6 +1761,8 @@ async def switch_branch(request: GitBranchRequest):
             result = git_service.create_branch(request.branch)
         else:
             result = git_service.switch_branch(request.branch)
+            # Checking out another branch rewrites the working tree
+            invalidate_response_cache()
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1031,14 +1782,25 @@ async def get_git_diff(file_path: Optional[str] = None, staged: bool = False):
 
 
 @app.get("/api/git/history")
-async def get_commit_history(limit: int = 10):
+async def get_commit_history(request: Request, limit: int = 10):
     """Get recent commit history"""
+    global history_response_cache
     if not git_service:
         raise HTTPException(status_code=503, detail="Git service not initialized")
     
     try:
+        # History only changes when HEAD moves
+        head = git_service.get_head_oid()
+        key = (git_service, head, limit)
+        if head is not None and history_response_cache and history_response_cache[0] == key:
+            _, body, etag = history_response_cache
+            return conditional_response(request, body, etag)
+        
         history = git_service.get_commit_history(limit)
-        return {"commits": history}
+        body = json_body({"commits": history})
+        response = conditional_response(request, body)
+        history_response_cache = (key, body, response.headers["ETag"])
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1046,19 +1808,31 @@ async def get_commit_history(limit: int = 10):
 # Rules API Endpoints
 
 @app.get("/api/rules")
-async def get_rules():
+async def get_rules(request: Request):
     """Get current rules content"""
+    global rules_response_cache
     if not assistant:
         raise HTTPException(status_code=503, detail="Assistant not initialized")
     
     try:
-        if not hasattr(assistant, 'rules_engine') or not assistant.rules_engine:
+        if not assistant_caps["rules_engine"]:
             return {"exists": False, "content": "", "info": {}}
         
         rules_engine = assistant.rules_engine
         
+        # Reuse the rendered body while the rules file is unchanged
+        try:
+            stat = os.stat(rules_engine.rules_file)
+            key = (rules_engine, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = (rules_engine, None, None)
+        if rules_response_cache and rules_response_cache[0] == key:
+            _, body, etag = rules_response_cache
+            return conditional_response(request, body, etag)
+        
         # Use asyncio timeout to prevent hanging
         def get_rules_data():
+            rules_engine.load_rules()  # Picks up the changed file
             content = rules_engine.get_rules()
             info = rules_engine.get_rules_info()
             return content, info
@@ -1068,17 +1842,41 @@ async def get_rules():
             timeout=3.0
         )
         
-        return {
+        body = json_body({
             "exists": info["exists"],
             "content": content or "",
             "info": info
-        }
+        })
+        response = conditional_response(request, body)
+        rules_response_cache = (key, body, response.headers["ETag"])
+        return response
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Rules retrieval timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# assistant._get_system_prompt() result, keyed on the rules file's stat and load state
+system_prompt_cache: Dict[str, Any] = {"key": None, "value": None}
+
+
+def cached_system_prompt() -> str:
+    """assistant._get_system_prompt(), recomputed only when the rules change"""
+    rules_engine = assistant.rules_engine if assistant_caps["rules_engine"] else None
+    try:
+        stat = os.stat(rules_engine.rules_file)
+        rules_stat = (stat.st_mtime_ns, stat.st_size)
+    except (AttributeError, OSError):
+        rules_stat = None
+    key = (id(assistant), rules_stat, bool(rules_engine and rules_engine.rules_loaded))
+    if system_prompt_cache["key"] != key:
+        if rules_engine:
+            rules_engine.load_rules()  # Picks up a changed file (mtime-checked)
+        system_prompt_cache["value"] = assistant._get_system_prompt()
+        system_prompt_cache["key"] = key
+    return system_prompt_cache["value"]
+
+
 @app.post("/api/rules")
 async def save_rules(request: RulesSaveRequest):
     """Save rules to .cursorrules file"""
@@ -1086,14 +1884,18 @@ async def save_rules(request: RulesSaveRequest):
         raise HTTPException(status_code=503, detail="Assistant not initialized")
     
     try:
-        if not hasattr(assistant, 'rules_engine') or not assistant.rules_engine:
+        if not assistant_caps["rules_engine"]:
             raise HTTPException(status_code=503, detail="Rules engine not initialized")
         
         result = assistant.rules_engine.save_rules(request.content)
         
         # Reload system prompt with new rules
-        if hasattr(assistant, '_get_system_prompt'):
-            assistant.system_prompt = assistant._get_system_prompt()
+        system_prompt_cache["key"] = None
+        if assistant_caps["get_system_prompt"]:
+            assistant.system_prompt = cached_system_prompt()
+        
+        # Let open chat sessions know the rules changed
+        await broadcast({"type": "rules_updated"})
         
         return result
     except Exception as e:
@@ -1107,7 +1909,7 @@ async def validate_rules(request: RulesSaveRequest):
         raise HTTPException(status_code=503, detail="Assistant not initialized")
     
     try:
-        if not hasattr(assistant, 'rules_engine') or not assistant.rules_engine:
+        if not assistant_caps["rules_engine"]:
             raise HTTPException(status_code=503, detail="Rules engine not initialized")
         
         validation = assistant.rules_engine.validate_rules(request.content)
@@ -1116,33 +1918,46 @@ async def validate_rules(request: RulesSaveRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Last rendered (key, body, etag) for /api/rules/preview
+rules_preview_cache: Optional[Tuple[Any, bytes, str]] = None
+
+
 @app.get("/api/rules/preview")
-async def preview_rules():
+async def preview_rules(request: Request):
     """Get preview of merged prompt with rules"""
+    global rules_preview_cache
     if not assistant:
         raise HTTPException(status_code=503, detail="Assistant not initialized")
     
     try:
         # Get base prompt without rules
-        if hasattr(assistant, '_get_system_prompt'):
-            base_prompt = assistant._get_system_prompt()
+        if assistant_caps["get_system_prompt"]:
+            base_prompt = cached_system_prompt()
         else:
             base_prompt = assistant.system_prompt
+        has_rules = assistant_caps["rules_engine"] and assistant.rules_engine.rules_loaded
+        
+        # While the prompt and rules are unchanged, the rendered preview is reused.
+        # Keyed on the prompt's content: an id() could be reused by a rebuilt prompt
+        prompt_digest = hashlib.sha256(base_prompt.encode("utf-8")).digest()
+        key = (system_prompt_cache["key"], prompt_digest, has_rules)
+        if rules_preview_cache and rules_preview_cache[0] == key:
+            _, body, etag = rules_preview_cache
+            return conditional_response(request, body, etag)
         
         # If rules exist, show merged version
-        if hasattr(assistant, 'rules_engine') and assistant.rules_engine and assistant.rules_engine.rules_loaded:
+        if has_rules:
             merged_prompt = assistant.rules_engine.inject_into_prompt(base_prompt)
-            return {
-                "base_prompt": base_prompt,
-                "merged_prompt": merged_prompt,
-                "has_rules": True
-            }
         else:
-            return {
-                "base_prompt": base_prompt,
-                "merged_prompt": base_prompt,
-                "has_rules": False
-            }
+            merged_prompt = base_prompt
+        body = json_body({
+            "base_prompt": base_prompt,
+            "merged_prompt": merged_prompt,
+            "has_rules": has_rules
+        })
+        response = conditional_response(request, body)
+        rules_preview_cache = (key, body, response.headers["ETag"])
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1154,18 +1969,30 @@ async def get_performance():
         raise HTTPException(status_code=503, detail="Performance monitor not available")
     
     try:
-        # Use asyncio timeout to prevent hanging
-        summary = await asyncio.wait_for(
-            asyncio.to_thread(assistant.performance_monitor.get_summary),
-            timeout=5.0
-        )
-        return summary
+        # A fresh cached summary is a plain read, so serve it inline; anything
+        # that has to compute (and take the monitor lock) goes to a thread
+        summary = assistant.performance_monitor.cached_summary()
+        if summary is None:
+            # Use asyncio timeout to prevent hanging
+            summary = await asyncio.wait_for(
+                asyncio.to_thread(assistant.performance_monitor.get_summary),
+                timeout=5.0
+            )
+        return FastJSONResponse(summary)
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Performance data retrieval timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Rendered /api/performance/history bodies: (metric_type, hours) -> (expires_at, body).
+# A few seconds of staleness is invisible to a polling dashboard, and every
+# poller within the window shares one computation
+performance_history_cache: Dict[Tuple[Optional[str], int], Tuple[float, bytes]] = {}
+PERFORMANCE_HISTORY_TTL = 5.0
+PERFORMANCE_HISTORY_CACHE_SIZE = 64
+
+
 @app.get("/api/performance/history")
 async def get_performance_history(metric_type: Optional[str] = None, hours: int = 24):
     """Get historical performance metrics"""
@@ -1173,10 +2000,24 @@ async def get_performance_history(metric_type: Optional[str] = None, hours: int
         raise HTTPException(status_code=503, detail="Performance monitor not available")
     
     try:
-        return assistant.performance_monitor.get_historical_stats(
+        key = (metric_type, hours)
+        now = time.monotonic()
+        cached = performance_history_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return Response(content=cached[1], media_type="application/json")
+        
+        body = json_body(assistant.performance_monitor.get_historical_stats(
             metric_type=metric_type,
             hours=hours
-        )
+        ))
+        if len(performance_history_cache) >= PERFORMANCE_HISTORY_CACHE_SIZE:
+            # Drop expired entries, then the oldest if still full
+            for stale in [k for k, (expires_at, _) in performance_history_cache.items() if expires_at <= now]:
+                del performance_history_cache[stale]
+            if len(performance_history_cache) >= PERFORMANCE_HISTORY_CACHE_SIZE:
+                del performance_history_cache[next(iter(performance_history_cache))]
+        performance_history_cache[key] = (now + PERFORMANCE_HISTORY_TTL, body)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1188,19 +2029,22 @@ async def get_indexing_history():
         raise HTTPException(status_code=503, detail="Performance monitor not available")
     
     try:
-        return assistant.performance_monitor.get_indexing_history()
+        return FastJSONResponse(assistant.performance_monitor.get_indexing_history())
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/completion")
-async def get_completions(request: CompletionRequest):
+@app.post("/api/completion", openapi_extra=body_schema(CompletionRequest))
+async def get_completions(raw_request: Request):
     """Get code completions for cursor position"""
+    # file_content can be hundreds of KB; parse and validate it in one pass
+    request = validate_body(CompletionRequest, await raw_request.body())
     if not completion_engine:
         raise HTTPException(status_code=503, detail="Completion engine not initialized")
     
     try:
-        completions = completion_engine.get_completions(
+        completions = await asyncio.to_thread(
+            completion_engine.get_completions,
             file_path=request.file_path,
             file_content=request.file_content,
             cursor_line=request.cursor_line,
@@ -1243,10 +2087,12 @@ async def websocket_chat(websocket: WebSocket):
     })
     # #endregion
     await websocket.accept()
-    active_connections.append(websocket)
+    if len(active_connections) >= MAX_WS_CONNECTIONS:
+        # 1013 Try Again Later
+        await websocket.close(code=1013)
+        return
     
     # Generate session ID for memory management
-    import uuid
     session_id = str(uuid.uuid4())
     
     # Set session ID on assistant for memory management
@@ -1256,13 +2102,53 @@ async def websocket_chat(websocket: WebSocket):
     # Maintain conversation history per WebSocket connection
     conversation_history = []
     
+    # Frames go out through a per-connection queue drained by a writer task, so
+    # token production (on a worker thread) is decoupled from socket flushes. The
+    # queue is bounded: producers wait for the writer, up to WS_SEND_TIMEOUT_SECONDS
+    outgoing: asyncio.Queue = asyncio.Queue(maxsize=MAX_WS_OUTGOING_FRAMES)
+    loop = asyncio.get_running_loop()
+    
+    async def send(frame: Dict[str, Any]):
+        try:
+            await asyncio.wait_for(outgoing.put(frame), WS_SEND_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            raise SlowClientError() from None
+    
+    # Clients connecting with ?encoding=msgpack get binary msgpack frames; the
+    # per-connection Packer reuses its internal buffer across sends. Everyone else
+    # gets orjson-encoded text frames
+    if msgpack is not None and websocket.query_params.get("encoding") == "msgpack":
+        frame_format = "msgpack"
+        encode_frame = msgpack.Packer(use_bin_type=True).pack
+        send_encoded = websocket.send_bytes
+    else:
+        frame_format = "json"
+        encode_frame = ws_dumps
+        send_encoded = websocket.send_text
+    
+    async def writer():
+        while True:
+            frame = await outgoing.get()
+            # Broadcast frames arrive pre-encoded
+            await send_encoded(frame if isinstance(frame, (str, bytes)) else encode_frame(frame))
+    
+    writer_task = asyncio.create_task(writer())
+    
+    # Expose the queue and encoder to broadcast()
+    websocket.state.outgoing = outgoing
+    websocket.state.frame_format = frame_format
+    websocket.state.encode_frame = encode_frame
+    active_connections.add(websocket)
+    
     try:
         while True:
-            data = await websocket.receive_text()
+            data = await receive_frame(websocket, MAX_CHAT_FRAME_BYTES)
+            if data is None:
+                break
             try:
-                message_data = json.loads(data)
+                message_data = ws_loads(data)
             except json.JSONDecodeError as e:
-                await websocket.send_json({
+                await send({
                     "type": "error",
                     "message": f"Invalid JSON: {str(e)}"
                 })
@@ -1272,69 +2158,84 @@ async def websocket_chat(websocket: WebSocket):
             model_override = message_data.get("model")  # Get model selection from client
             
             if not assistant:
-                await websocket.send_json({
+                await send({
                     "type": "error",
                     "message": "Assistant not initialized"
                 })
                 continue
             
-            # Send typing indicator
-            await websocket.send_json({
-                "type": "typing",
-                "status": True
-            })
+            # No typing frames: the client shows typing from send until the first
+            # delta, message or error frame arrives
+            # Determine which model was actually used
+            used_model = model_override if model_override else 'auto'
             
-            try:
-                # Process message with conversation history and optional model override
-                response = assistant.process_message(
-                    user_message, 
+            def run_stream() -> Tuple[str, bool]:
+                # Push each delta as it arrives; the final response is the generator's return value
+                stream = assistant.stream_message(
+                    user_message,
                     conversation_history=conversation_history,
                     model_override=model_override
                 )
+                while True:
+                    try:
+                        delta = next(stream)
+                    except StopIteration as stop:
+                        # The turn outcome is tracked per thread, so read it here
+                        return stop.value, assistant.last_turn_side_effects
+                    # Blocks this thread while the queue is full, so a slow reader
+                    # throttles generation instead of growing the queue
+                    asyncio.run_coroutine_threadsafe(send({
+                        "type": "delta",
+                        "delta": delta,
+                        "model": used_model
+                    }), loop).result()
+            
+            try:
+                # Stream message with conversation history and optional model override
+                response, side_effects = await asyncio.to_thread(run_stream)
+                if side_effects:
+                    invalidate_response_cache()
                 
-                # Determine which model was actually used
-                used_model = model_override if model_override else 'auto'
-                
-                # Update conversation history (context manager will handle truncation/summarization)
+                # Update conversation history; past the character budget, older turns are
+                # folded into a heuristic summary so each prompt stops growing with the session
                 conversation_history.append({"role": "user", "content": user_message})
                 conversation_history.append({"role": "assistant", "content": response})
-                # Note: Context manager handles token limits and summarization automatically
+                conversation_history[:] = condense_history(conversation_history)
                 
-                # Send response with model info
-                await websocket.send_json({
+                # Send the final response (diffs/tool results applied) with model info
+                await send({
                     "type": "message",
                     "response": response,
                     "model": used_model,
                     "success": True
                 })
+            except SlowClientError:
+                raise
             except Exception as e:
                 safe_debug_log("app.py:process_message", "Exception in process_message", {
                     "error_type": type(e).__name__,
                     "error_message": str(e)
                 })
-                await websocket.send_json({
+                await send({
                     "type": "error",
                     "message": str(e),
                     "success": False
                 })
-            finally:
-                # Stop typing indicator
-                await websocket.send_json({
-                    "type": "typing",
-                    "status": False
-                })
     
     except WebSocketDisconnect:
         safe_debug_log("app.py:websocket_chat", "WebSocket disconnected", {})
-        active_connections.remove(websocket)
+    except SlowClientError:
+        safe_debug_log("app.py:websocket_chat", "Closing WebSocket that stopped reading", {})
+        await websocket.close(code=1013)
     except Exception as e:
         safe_debug_log("app.py:websocket_chat", "WebSocket exception", {
             "error_type": type(e).__name__,
             "error_message": str(e)
         })
-        if websocket in active_connections:
-            active_connections.remove(websocket)
-        print(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
+    finally:
+        active_connections.discard(websocket)
+        writer_task.cancel()
 
 
 # WebSocket for real-time completions
@@ -1342,72 +2243,110 @@ async def websocket_chat(websocket: WebSocket):
 async def websocket_completion(websocket: WebSocket):
     """WebSocket endpoint for real-time code completions"""
     await websocket.accept()
+    # Buffer the client last sent (full or patched), its client-assigned version
+    # and whether it has astral characters, so later messages can carry just the edit
+    last_content = None
+    last_version = None
+    last_astral = False
+    # Only the newest request is answered; a request superseded within the
+    # debounce window never reaches the engine
+    current_task = None
+    
+    async def complete(frame: CompletionFrame, file_content: str):
+        try:
+            await asyncio.sleep(COMPLETION_DEBOUNCE_SECONDS)
+            completions = await asyncio.to_thread(
+                completion_engine.get_completions,
+                file_path=frame.file_path,
+                file_content=file_content,
+                cursor_line=frame.cursor_line,
+                cursor_column=frame.cursor_column,
+                language=frame.language,
+                max_completions=10
+            )
+            
+            # Convert to API format
+            result = []
+            for comp in completions:
+                result.append({
+                    "label": comp.label,
+                    "kind": comp.kind,
+                    "detail": comp.detail,
+                    "documentation": comp.documentation,
+                    "insertText": comp.insert_text or comp.text,
+                    "score": comp.score
+                })
+            
+            await websocket.send_text(ws_dumps({
+                "type": "completions",
+                "completions": result,
+                "version": frame.version,
+                "success": True
+            }))
+        except asyncio.CancelledError:
+            # Superseded by a newer request (or the socket closed)
+            pass
+        except Exception as e:
+            await websocket.send_text(ws_dumps({
+                "type": "error",
+                "message": str(e),
+                "success": False
+            }))
     
     try:
         while True:
-            data = await websocket.receive_text()
+            data = await receive_frame(websocket, MAX_COMPLETION_FRAME_BYTES)
+            if data is None:
+                break
             try:
-                message_data = json.loads(data)
-            except json.JSONDecodeError:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Invalid JSON"
-                })
+                # Parse and validate in one pydantic-core pass
+                frame = CompletionFrame.model_validate_json(data)
+            except ValidationError as e:
+                if any(error["type"] == "json_invalid" for error in e.errors()):
+                    await websocket.send_text(ERR_INVALID_JSON)
+                else:
+                    await websocket.send_text(ws_dumps({
+                        "type": "error",
+                        "message": str(e)
+                    }))
                 continue
             
+            if frame.patch is not None:
+                if last_content is None or frame.base_version is None or frame.base_version != last_version:
+                    # Client and server buffers diverged: ask for the full content
+                    await websocket.send_text(ERR_CONTENT_RESYNC)
+                    continue
+                try:
+                    file_content = apply_content_patch(last_content, frame.patch, last_astral)
+                except ValueError as e:
+                    last_content = last_version = None
+                    await websocket.send_text(ws_dumps({
+                        "type": "resync",
+                        "message": str(e)
+                    }))
+                    continue
+                last_astral = last_astral or any(has_astral(op.text) for op in frame.patch)
+            else:
+                file_content = frame.file_content
+                last_astral = has_astral(file_content)
+            last_content = file_content
+            last_version = frame.version
+            
             if not completion_engine:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Completion engine not initialized"
-                })
+                await websocket.send_text(ERR_NO_COMPLETION_ENGINE)
                 continue
             
-            # Extract request data
-            file_path = message_data.get("file_path", "")
-            file_content = message_data.get("file_content", "")
-            cursor_line = message_data.get("cursor_line", 0)
-            cursor_column = message_data.get("cursor_column", 0)
-            language = message_data.get("language", "python")
-            
-            try:
-                # Get completions
-                completions = completion_engine.get_completions(
-                    file_path=file_path,
-                    file_content=file_content,
-                    cursor_line=cursor_line,
-                    cursor_column=cursor_column,
-                    language=language,
-                    max_completions=10
-                )
-                
-                # Convert to API format
-                result = []
-                for comp in completions:
-                    result.append({
-                        "label": comp.label,
-                        "kind": comp.kind,
-                        "detail": comp.detail,
-                        "documentation": comp.documentation,
-                        "insertText": comp.insert_text or comp.text,
-                        "score": comp.score
-                    })
-                
-                await websocket.send_json({
-                    "type": "completions",
-                    "completions": result,
-                    "success": True
-                })
-            except Exception as e:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": str(e),
-                    "success": False
-                })
+            if current_task and not current_task.done():
+                current_task.cancel()
+            current_task = asyncio.create_task(complete(frame, file_content))
     
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        print(f"Completion WebSocket error: {e}")
+        logger.error("Completion WebSocket error: %s", e)
+    finally:
+        if current_task:
+            current_task.cancel()
 
 
 # WebSocket for terminal
@@ -1416,87 +2355,131 @@ async def websocket_terminal(websocket: WebSocket):
     """WebSocket endpoint for terminal"""
     await websocket.accept()
     
-    import uuid
     session_id = None
     workspace_path = os.getenv("WORKSPACE_PATH", ".")
+    # One Terminal per session, replaced on init (which may change the workspace)
+    terminal = Terminal(workspace_path=workspace_path)
+    loop = asyncio.get_running_loop()
+    
+    # Frames are read by a separate task, so a disconnect is noticed (and the
+    # running command killed) even while a command produces no output. None
+    # marks the end of input
+    incoming: asyncio.Queue = asyncio.Queue()
+    disconnected = asyncio.Event()
+    
+    async def reader():
+        try:
+            while True:
+                data = await receive_frame(websocket, MAX_TERMINAL_FRAME_BYTES)
+                if data is None:
+                    break
+                await incoming.put(data)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            disconnected.set()
+            terminal.kill()
+            incoming.put_nowait(None)
+    
+    reader_task = asyncio.create_task(reader())
     
     try:
         while True:
-            data = await websocket.receive_text()
+            data = await incoming.get()
+            if data is None:
+                break
             try:
-                message = json.loads(data)
+                message = ws_loads(data)
             except json.JSONDecodeError:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Invalid JSON"
-                })
+                await websocket.send_text(ERR_INVALID_JSON)
                 continue
             
             if message.get("type") == "init":
                 session_id = message.get("session_id", str(uuid.uuid4()))
                 workspace_path = message.get("workspace_path", workspace_path)
-                await websocket.send_json({
+                terminal = Terminal(workspace_path=workspace_path)
+                await websocket.send_text(ws_dumps({
                     "type": "ready",
                     "session_id": session_id
-                })
+                }))
             
             elif message.get("type") == "command":
                 command = message.get("command", "").strip()
                 if not command:
                     # Empty command, just send prompt
-                    await websocket.send_json({
-                        "type": "output",
-                        "data": "\r\n$ "
-                    })
+                    await websocket.send_text(PROMPT_FRAME)
                     continue
                 
                 # Execute command
                 try:
-                    from tools.terminal import Terminal
-                    terminal = Terminal(workspace_path=workspace_path)
+                    # The command runs on a worker thread; output chunks are forwarded as
+                    # they are read, and None marks the end of the stream
+                    chunks: asyncio.Queue = asyncio.Queue()
+                    stop = threading.Event()
                     
-                    # Execute and get output
-                    result = terminal.execute(command, is_background=False)
+                    def run_command(command: str = command) -> int:
+                        stream = terminal.stream(command)
+                        try:
+                            while not stop.is_set():
+                                try:
+                                    chunk = next(stream)
+                                except StopIteration as done:
+                                    return done.value
+                                loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+                            stream.close()  # Kills the command
+                            return -1
+                        finally:
+                            loop.call_soon_threadsafe(chunks.put_nowait, None)
                     
-                    # Send output (stdout and stderr combined)
-                    output = ""
-                    if result.get("stdout"):
-                        output += result["stdout"]
-                    if result.get("stderr"):
-                        output += result["stderr"]
-                    
-                    if output:
-                        await websocket.send_json({
-                            "type": "output",
-                            "data": output
-                        })
+                    run_task = asyncio.create_task(asyncio.to_thread(run_command))
+                    try:
+                        finished = False
+                        while not finished:
+                            parts = [await chunks.get()]
+                            # Coalesce whatever else is already queued into one frame
+                            while not chunks.empty():
+                                parts.append(chunks.get_nowait())
+                            if parts[-1] is None:
+                                finished = True
+                                parts.pop()
+                            if parts:
+                                await websocket.send_text(ws_dumps({
+                                    "type": "output",
+                                    "data": "".join(parts)
+                                }))
+                    finally:
+                        stop.set()
+                        # On disconnect the worker may be blocked reading a silent
+                        # command; killing it ends the read instead of waiting for output
+                        if not finished:
+                            terminal.kill()
+                    returncode = await run_task
+                    if disconnected.is_set():
+                        break
                     
                     # Send exit code
-                    await websocket.send_json({
+                    await websocket.send_text(ws_dumps({
                         "type": "exit",
-                        "code": result.get("returncode", 0)
-                    })
+                        "code": returncode
+                    }))
                     
                     # Send prompt for next command
-                    await websocket.send_json({
-                        "type": "output",
-                        "data": "\r\n$ "
-                    })
+                    await websocket.send_text(PROMPT_FRAME)
                     
                 except Exception as e:
-                    await websocket.send_json({
+                    await websocket.send_text(ws_dumps({
                         "type": "error",
                         "message": str(e)
-                    })
-                    await websocket.send_json({
-                        "type": "output",
-                        "data": "\r\n$ "
-                    })
+                    }))
+                    await websocket.send_text(PROMPT_FRAME)
     
     except WebSocketDisconnect:
         pass
     except Exception as e:
-        print(f"Terminal WebSocket error: {e}")
+        logger.error("Terminal WebSocket error: %s", e)
+    finally:
+        reader_task.cancel()
+        terminal.kill()
 
 
 if __name__ == "__main__":
@@ -1504,4 +2487,17 @@ if __name__ == "__main__":
     import os
     # Use port from environment or default to 8010
     port = int(os.getenv("PORT", 8010))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvicorn[standard] ships uvloop and httptools; "auto" uses them where they are
+    # available (uvloop has no Windows build). Each worker is a separate process with
+    # its own assistant, caches and chat sockets, so broadcasts reach only its clients
+    uvicorn.run(
+        "app:app",
+        app_dir=str(Path(__file__).parent),
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="auto",
+        ws="websockets",
+        ws_max_size=MAX_WS_FRAME_BYTES,
+        workers=int(os.getenv("WORKERS", 1))
+    )
@@ -20,15 +20,37 @@ function ChatPanel({ onDiffGenerated, onFileRequest }) {
     websocket.onmessage = (event) => {
       const data = JSON.parse(event.data);
       
+      // Any delta, message or error frame ends the typing indicator
       if (data.type === 'typing') {
         setIsTyping(data.status);
+      } else if (data.type === 'delta') {
+        // Append streamed tokens to the in-progress assistant message
+        setMessages(prev => {
+          const last = prev[prev.length - 1];
+          if (last && last.streaming) {
+            return [...prev.slice(0, -1), { ...last, content: last.content + data.delta }];
+          }
+          return [...prev, {
+            role: 'assistant',
+            content: data.delta,
+            timestamp: new Date(),
+            model: data.model || 'auto',
+            streaming: true
+          }];
+        });
+        setIsTyping(false);
       } else if (data.type === 'message') {
-        setMessages(prev => [...prev, {
-          role: 'assistant',
-          content: data.response,
-          timestamp: new Date(),
-          model: data.model || 'auto'
-        }]);
+        // Final response replaces the streamed text (diffs/tool results applied)
+        setMessages(prev => {
+          const last = prev[prev.length - 1];
+          const message = {
+            role: 'assistant',
+            content: data.response,
+            timestamp: new Date(),
+            model: data.model || 'auto'
+          };
+          return last && last.streaming ? [...prev.slice(0, -1), message] : [...prev, message];
+        });
         setIsTyping(false);
         
         // Check if response contains diff
@@ -81,6 +103,9 @@ function ChatPanel({ onDiffGenerated, onFileRequest }) {
       model: selectedModel !== 'auto' ? selectedModel : undefined
     }]);
     
+    // Typing shows until the first reply frame; the server sends no typing frames
+    setIsTyping(true);
+    
     // Send via WebSocket with model selection
     ws.send(JSON.stringify({ 
       message: userMessage,